@@ -0,0 +1,268 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Iterable, List, Set, Tuple
+
+from models import NewsItem, normalize_title
+
+# SQLite caps bound parameters per statement (999 on older builds)
+_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    norm_title TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    source TEXT,
+    category TEXT,
+    published TEXT,
+    score REAL,
+    agent_score REAL,
+    agent_reason TEXT,
+    agent_source TEXT,
+    processed_summary TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_norm_title ON articles(norm_title);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles(last_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_delivered ON articles(delivered_at) WHERE delivered_at IS NOT NULL;
+
+-- Per topic profile deliveries (articles.delivered_at = the single brief's history, without a profiles file)
+CREATE TABLE IF NOT EXISTS deliveries (
+    link TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    delivered_at REAL NOT NULL,
+    PRIMARY KEY (link, profile)
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, summary ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+    INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+"""
+
+UPSERT = """
+INSERT INTO articles (link, norm_title, title, summary, source, category, published,
+                      score, agent_score, agent_reason, agent_source, processed_summary, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(link) DO UPDATE SET
+    first_seen = MIN(articles.first_seen, excluded.first_seen),
+    last_seen = MAX(articles.last_seen, excluded.last_seen),
+    score = MAX(COALESCE(articles.score, 0), COALESCE(excluded.score, 0)),
+    agent_score = COALESCE(excluded.agent_score, articles.agent_score),
+    agent_reason = COALESCE(NULLIF(excluded.agent_reason, ''), articles.agent_reason),
+    agent_source = CASE WHEN excluded.agent_score IS NOT NULL THEN excluded.agent_source ELSE articles.agent_source END,
+    processed_summary = COALESCE(excluded.processed_summary, articles.processed_summary)
+"""
+
+
+def _chunks(values: List, size: int = _CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class NewsArchive:
+    """
+    Local history of every normalized item (+ agent scores / summaries).
+    - SQLite (WAL) with an FTS5 index over title + summary
+    - trigram tokenizer: substring matching works for Korean without a morphological
+      analyzer ('클로드' matches '클로드가', '클로드는') and for English alike
+    - one transaction per run, retention pruning, cross-day dedup and trend queries
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Scheduler jobs run in worker threads: one connection guarded by a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.tokenizer = self._create_fts()
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        # Columns added after the first release
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        if "agent_source" not in columns:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN agent_source TEXT")
+
+    def _create_fts(self) -> str:
+        # trigram needs SQLite >= 3.34; older builds fall back to unicode61 (word-level)
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                    f"title, summary, content='articles', content_rowid='id', tokenize='{tokenizer}')"
+                )
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue
+        raise RuntimeError("SQLite FTS5 is not available")
+
+    def close(self):
+        self.conn.close()
+
+    # --- Writes ---
+
+    def store_run(self, items: Iterable[NewsItem], delivered: Iterable[NewsItem] = (), now: float = None,
+                  profile: str = None, seen_at=None) -> int:
+        """
+        Bulk upsert of one run's items (single transaction). Returns rows written.
+        `delivered` goes to the profile's own history if given, else to the global one (articles.delivered_at).
+        seen_at(item) -> timestamp overrides `now` per item (backfill: the publication time).
+        """
+        now = now or time.time()
+        rows = []
+        for i in items:
+            if i.link and i.title:
+                ts = seen_at(i) if seen_at else now
+                rows.append((i.link, normalize_title(i.title), i.title, i.summary, i.source, i.category, i.published,
+                             i.score, i.agent_score, i.agent_reason, i.agent_source or None, i.processed_summary, ts, ts))
+        delivered_links = [(now, i.link) for i in delivered if i.link]
+        with self._lock, self.conn:
+            self.conn.executemany(UPSERT, rows)
+            if delivered_links and not profile:
+                self.conn.executemany("UPDATE articles SET delivered_at = ? WHERE link = ?", delivered_links)
+            if delivered_links and profile:
+                self.conn.executemany("INSERT OR REPLACE INTO deliveries (link, profile, delivered_at) VALUES (?, ?, ?)",
+                                      [(link, profile, at) for at, link in delivered_links])
+        return len(rows)
+
+    def mark_delivered(self, items: Iterable[NewsItem], now: float = None, profile: str = None):
+        self.store_run([], delivered=items, now=now, profile=profile)
+
+    def prune(self, retention_days: int) -> int:
+        cutoff = time.time() - retention_days * 24 * 3600
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM articles WHERE last_seen < ?", (cutoff,))
+            self.conn.execute("DELETE FROM deliveries WHERE delivered_at < ?", (cutoff,))
+        return cur.rowcount
+
+    # --- Queries ---
+
+    def delivered_keys(self, items: List[NewsItem], days: int, profile: str = None) -> Set[str]:
+        """Links / normalized titles among `items` already delivered (to `profile`, if given) in the last `days` days."""
+        cutoff = time.time() - days * 24 * 3600
+        links = [i.link for i in items if i.link]
+        titles = [normalize_title(i.title) for i in items if i.title]
+        if profile:
+            source = "articles a JOIN deliveries d ON d.link = a.link AND d.profile = ? WHERE d.delivered_at >= ?"
+            args = [profile, cutoff]
+        else:
+            source = "articles a WHERE a.delivered_at >= ?"
+            args = [cutoff]
+        found = set()
+        with self._lock:
+            for chunk in _chunks(links):
+                marks = ",".join("?" * len(chunk))
+                found.update(r[0] for r in self.conn.execute(
+                    f"SELECT a.link FROM {source} AND a.link IN ({marks})", [*args, *chunk]))
+            for chunk in _chunks(titles):
+                marks = ",".join("?" * len(chunk))
+                found.update(r[0] for r in self.conn.execute(
+                    f"SELECT a.norm_title FROM {source} AND a.norm_title IN ({marks})", [*args, *chunk]))
+        return found
+
+    def known_titles(self) -> Set[str]:
+        """Every archived normalized title (backfill dedup across runs and resumes)."""
+        with self._lock:
+            return {r[0] for r in self.conn.execute("SELECT norm_title FROM articles")}
+
+    def filter_undelivered(self, items: List[NewsItem], days: int, profile: str = None) -> List[NewsItem]:
+        """Cross-day dedup: drop items that already went out in a brief (of this profile) this week."""
+        if not items:
+            return items
+        covered = self.delivered_keys(items, days, profile)
+        kept = [i for i in items if i.link not in covered and normalize_title(i.title) not in covered]
+        if len(kept) < len(items):
+            print(f"  [Archive] {len(items) - len(kept)} item(s) already covered in the last {days} days")
+        return kept
+
+    def _match_expr(self, term: str) -> str:
+        # Quote as an FTS phrase so operators / punctuation in the term are literal
+        return '"' + term.replace('"', '""') + '"'
+
+    def _use_like(self, term: str) -> bool:
+        # trigram index can't serve terms shorter than 3 chars (e.g. 'AI', '도입'): those are a LIKE scan
+        # over every row in the time window (only the first_seen range uses an index, not the term)
+        return self.tokenizer == "trigram" and len(term) < 3
+
+    def search(self, term: str, days: int = 7, limit: int = 20) -> List[Tuple]:
+        """Full-text search: (first_seen, source, title, link, agent_score), best match first."""
+        cutoff = time.time() - days * 24 * 3600
+        with self._lock:
+            if self._use_like(term):
+                return self.conn.execute(
+                    "SELECT first_seen, source, title, link, agent_score FROM articles "
+                    "WHERE first_seen >= ? AND (title LIKE ? OR summary LIKE ?) ORDER BY first_seen DESC LIMIT ?",
+                    (cutoff, f"%{term}%", f"%{term}%", limit)).fetchall()
+            return self.conn.execute(
+                "SELECT a.first_seen, a.source, a.title, a.link, a.agent_score "
+                "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? AND a.first_seen >= ? ORDER BY bm25(articles_fts) LIMIT ?",
+                (self._match_expr(term), cutoff, limit)).fetchall()
+
+    def trend(self, term: str, days: int = 14) -> List[Tuple[str, int]]:
+        """Daily mention counts of `term`: [(YYYY-MM-DD, count), ...] oldest first."""
+        cutoff = time.time() - days * 24 * 3600
+        day = "date(a.first_seen, 'unixepoch', 'localtime')"
+        with self._lock:
+            if self._use_like(term):
+                return self.conn.execute(
+                    f"SELECT {day} AS d, COUNT(*) FROM articles a WHERE a.first_seen >= ? "
+                    "AND (a.title LIKE ? OR a.summary LIKE ?) GROUP BY d ORDER BY d",
+                    (cutoff, f"%{term}%", f"%{term}%")).fetchall()
+            return self.conn.execute(
+                f"SELECT {day} AS d, COUNT(*) FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? AND a.first_seen >= ? GROUP BY d ORDER BY d",
+                (self._match_expr(term), cutoff)).fetchall()
+
+    def labeled(self, days: int = None) -> List[Tuple[str, str, float]]:
+        """(title, summary, agent_score) of items the LLM scored: training data for the local model."""
+        cutoff = time.time() - days * 24 * 3600 if days else 0
+        with self._lock:
+            return self.conn.execute(
+                "SELECT title, COALESCE(summary, ''), agent_score FROM articles "
+                "WHERE agent_score IS NOT NULL AND first_seen >= ? AND (agent_source = 'llm' OR "
+                # Rows from before agent_source existed: drop the heuristic / fallback reasons
+                " (agent_source IS NULL AND agent_reason NOT LIKE '%API 대체 평가%' "
+                "  AND agent_reason NOT LIKE '%API 오류%' AND agent_reason NOT LIKE '%Safety Net%')) "
+                "ORDER BY first_seen", (cutoff,)).fetchall()
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+if __name__ == "__main__":
+    # python archive.py search <term> [days] | trend <term> [days]
+    from config import Config
+    archive = NewsArchive(Config.ARCHIVE_PATH)
+    if len(sys.argv) < 3 or sys.argv[1] not in ("search", "trend"):
+        print(f"Usage: python archive.py search|trend <term> [days]  ({archive.count()} articles archived)")
+        sys.exit(1)
+    command, term = sys.argv[1], sys.argv[2]
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else (7 if command == "search" else 14)
+    if command == "search":
+        for first_seen, source, title, link, agent_score in archive.search(term, days):
+            print(f"{time.strftime('%m-%d %H:%M', time.localtime(first_seen))} [{source}] {title} ({agent_score}) {link}")
+    else:
+        for day, count in archive.trend(term, days):
+            print(f"{day} {'#' * count} {count}")
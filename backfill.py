@@ -0,0 +1,288 @@
+"""
+Historical backfill: fill the archive with a past date range, through the same keyword
+scoring and title dedup as the live job (no LLM pass: the agent only sees today's candidates).
+
+    python backfill.py 2026-09-01 2026-09-30 [workers]   # resumes where it stopped if interrupted
+    python backfill.py status
+
+Shards run in parallel under per-host rate limits; each one checkpoints after every page.
+- Naver: one shard per query, paged newest -> oldest (the API has no date filter; ~1,100 results max,
+  a shard that hits the cap before the range start is reported as truncated)
+- Google News: one shard per day (after:/before: search)
+- Other RSS feeds: one shard per feed and day, from that day's Wayback Machine snapshot
+"""
+import datetime
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from config import Config
+from models import NewsItem, normalize_title
+
+NAVER_PAGE = 100
+NAVER_MAX_START = 1000 # Highest 'start' the search API accepts
+GOOGLE_NEWS_QUERY = "인공지능"
+GOOGLE_NEWS_SEARCH = "https://news.google.com/rss/search?q={q}+after:{day}+before:{next_day}&hl=ko&gl=KR&ceid=KR:ko"
+CDX_URL = "https://web.archive.org/cdx/search/cdx"
+SNAPSHOT_URL = "https://web.archive.org/web/{ts}id_/{url}" # id_: the archived bytes, no Wayback toolbar
+SNAPSHOT_MAX_ENTRIES = 200
+
+
+def parse_published(text: str) -> Optional[float]:
+    """RFC 822 (RSS, Naver) or ISO 8601 date -> timestamp. None if unparseable."""
+    if not text:
+        return None
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def days(start: datetime.date, end: datetime.date) -> List[str]:
+    return [(start + datetime.timedelta(d)).isoformat() for d in range((end - start).days + 1)]
+
+
+def plan_shards(start: datetime.date, end: datetime.date, profiles=None, naver: bool = True) -> List[Dict]:
+    """Every unit of work for the range, with a stable id (the checkpoint key)."""
+    from main import INTL_FEEDS, SLOW_DOMESTIC_FEEDS
+    from profiles import load_profiles, shared_naver_queries
+    from scrapers.api_scraper import NAVER_QUERIES
+
+    shards = []
+    if naver:
+        profile_queries, profile_excludes = shared_naver_queries(profiles if profiles is not None else load_profiles())
+        for q in dict.fromkeys(NAVER_QUERIES["tier1"] + NAVER_QUERIES["tier2"]):
+            shards.append({"id": f"naver:{q}", "kind": "naver", "query": q, "excludes": None})
+        for q in profile_queries:
+            if f"naver:{q}" not in {s["id"] for s in shards}:
+                shards.append({"id": f"naver:{q}", "kind": "naver", "query": q,
+                               "excludes": ["-" + t for t in profile_excludes]})
+    feeds = [(f, "international") for f in INTL_FEEDS] + [(f, "domestic") for f in SLOW_DOMESTIC_FEEDS]
+    for day in days(start, end):
+        shards.append({"id": f"gnews:{day}", "kind": "gnews", "day": day})
+        for feed, category in feeds:
+            shards.append({"id": f"wayback:{day}:{feed}", "kind": "wayback", "day": day, "feed": feed,
+                           "category": category})
+    return shards
+
+
+class Checkpoint:
+    """Per-shard progress ({done, cursor, items}) in one JSON file, rewritten atomically on every update."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f).get("shards", {})
+
+    def get(self, shard_id: str) -> Dict:
+        with self._lock:
+            return dict(self.state.get(shard_id, {}))
+
+    def update(self, shard_id: str, items: int = 0, **fields):
+        with self._lock:
+            entry = self.state.setdefault(shard_id, {"done": False, "items": 0})
+            entry["items"] += items
+            entry.update(fields)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"updated": time.time(), "shards": self.state}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+
+def checkpoint_path(start: datetime.date, end: datetime.date) -> str:
+    return os.path.join(Config.STATE_DIR, "backfill", f"{start.isoformat()}_{end.isoformat()}.json")
+
+
+class Backfill:
+    def __init__(self, start: datetime.date, end: datetime.date, archive=None, checkpoint: Checkpoint = None,
+                 session=None):
+        from archive import NewsArchive
+
+        self.start, self.end = start, end
+        self.range_start = datetime.datetime.combine(start, datetime.time()).timestamp()
+        self.range_end = datetime.datetime.combine(end + datetime.timedelta(1), datetime.time()).timestamp()
+        self.archive = archive or NewsArchive(Config.ARCHIVE_PATH)
+        self.checkpoint = checkpoint or Checkpoint(checkpoint_path(start, end))
+        self.session = session
+        self.seen = self.archive.known_titles() # Titles archived by live runs or earlier backfills
+        self._lock = threading.Lock()
+        self.fetched = defaultdict(int)
+        self.stored = defaultdict(int)
+        self.pages = 0
+
+    def in_range(self, item: NewsItem) -> bool:
+        ts = parse_published(item.published)
+        return ts is not None and self.range_start <= ts < self.range_end
+
+    def ingest(self, items: List[NewsItem], source: str) -> int:
+        """In-range items not archived yet -> archive, first/last seen = publication time. Returns rows written."""
+        fresh = []
+        with self._lock:
+            self.fetched[source] += len(items)
+            self.pages += 1
+            for item in items:
+                key = normalize_title(item.title)
+                if key not in self.seen and self.in_range(item):
+                    self.seen.add(key)
+                    fresh.append(item)
+        written = self.archive.store_run(fresh, seen_at=lambda i: parse_published(i.published)) if fresh else 0
+        with self._lock:
+            self.stored[source] += written
+        return written
+
+    # --- Shards ---
+
+    def run_naver(self, shard: Dict):
+        from scrapers.api_scraper import NaverNewsScraper
+
+        scraper = NaverNewsScraper(session=self.session)
+        cursor = self.checkpoint.get(shard["id"]).get("cursor", 1)
+        while cursor <= NAVER_MAX_START:
+            raw = scraper.search_page(shard["query"], cursor, NAVER_PAGE, shard["excludes"])
+            items = [i for i in map(scraper.to_item, raw) if i is not None]
+            stored = self.ingest(items, "naver")
+            stamps = [t for t in (parse_published(r.get("pubDate", "")) for r in raw) if t is not None]
+            cursor += NAVER_PAGE
+            # Sorted by date: once a page reaches back past the range, older pages have nothing for us
+            reached = len(raw) < NAVER_PAGE or bool(stamps and min(stamps) < self.range_start)
+            # The API stops at ~1,000 results: a range older than that is only partly (or not at all) covered
+            truncated = not reached and cursor > NAVER_MAX_START
+            done = reached or truncated
+            self.checkpoint.update(shard["id"], items=stored, cursor=cursor, done=done, truncated=truncated)
+            if done:
+                break
+
+    def _fetch_feed(self, url: str, category: str, max_entries: int) -> List[NewsItem]:
+        from scrapers.rss_scraper import RSSScraper
+
+        scraper = RSSScraper([url], category, session=self.session, full_content=False, max_entries=max_entries)
+        items = scraper.fetch_news()
+        if scraper.last_error:
+            raise RuntimeError(scraper.last_error) # Shard stays pending: retried on the next run
+        return items
+
+    def run_gnews(self, shard: Dict):
+        day = datetime.date.fromisoformat(shard["day"])
+        url = GOOGLE_NEWS_SEARCH.format(q=quote(GOOGLE_NEWS_QUERY), day=day, next_day=day + datetime.timedelta(1))
+        items = self._fetch_feed(url, "domestic", 100)
+        self.checkpoint.update(shard["id"], items=self.ingest(items, "gnews"), done=True)
+
+    def run_wayback(self, shard: Dict):
+        from http_client import get_client
+
+        stamp = shard["day"].replace("-", "")
+        resp = get_client().get(CDX_URL, params={"url": shard["feed"], "from": stamp, "to": stamp, "output": "json",
+                                                 "filter": "statuscode:200", "fl": "timestamp", "limit": "-1"},
+                                timeout=Config.FEED_TIMEOUT)
+        resp.raise_for_status()
+        rows = resp.json() if resp.text.strip() else []
+        stored = 0
+        if len(rows) > 1: # Header row first; no snapshot that day otherwise
+            snapshot = SNAPSHOT_URL.format(ts=rows[-1][0], url=shard["feed"])
+            items = self._fetch_feed(snapshot, shard["category"], SNAPSHOT_MAX_ENTRIES)
+            stored = self.ingest(items, "wayback")
+        self.checkpoint.update(shard["id"], items=stored, done=True)
+
+    # --- Driver ---
+
+    def run(self, workers: int = None, naver: bool = True) -> Dict:
+        from http_client import get_client
+
+        client = get_client()
+        client.limit_rate("openapi.naver.com", Config.BACKFILL_NAVER_RATE)
+        client.limit_rate("web.archive.org", Config.BACKFILL_ARCHIVE_RATE)
+        client.limit_rate("news.google.com", Config.BACKFILL_ARCHIVE_RATE)
+
+        shards = plan_shards(self.start, self.end, naver=naver)
+        pending = [s for s in shards if not self.checkpoint.get(s["id"]).get("done")]
+        resumed = sum(1 for s in pending if self.checkpoint.get(s["id"]))
+        print(f"[Backfill] {self.start} -> {self.end}: {len(shards)} shards, {len(shards) - len(pending)} already done, "
+              f"{resumed} resumed mid-way ({self.checkpoint.path})")
+
+        handlers = {"naver": self.run_naver, "gnews": self.run_gnews, "wayback": self.run_wayback}
+        failed = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers or Config.BACKFILL_WORKERS) as pool:
+            futures = {pool.submit(handlers[s["kind"]], s): s for s in pending}
+            for n, future in enumerate(as_completed(futures), 1):
+                shard = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1 # Not marked done: the next run retries it
+                    print(f"⚠️ [Backfill] {shard['id']}: {e}")
+                if n % 25 == 0 or n == len(pending):
+                    print(f"[Backfill] {n}/{len(pending)} shards, {sum(self.stored.values())} items stored")
+        elapsed = time.perf_counter() - start
+
+        truncated = [s["id"] for s in shards if self.checkpoint.get(s["id"]).get("truncated")]
+        report = {"shards": len(shards), "ran": len(pending), "failed": failed, "pages": self.pages,
+                  "fetched": dict(self.fetched), "stored": dict(self.stored), "seconds": elapsed,
+                  "truncated": truncated}
+        print(format_report(report))
+        return report
+
+
+def format_report(r: Dict) -> str:
+    elapsed = max(r["seconds"], 1e-9)
+    total = sum(r["stored"].values())
+    lines = [f"📚 Backfill: {total} new items in {r['seconds']:.1f}s ({total / elapsed:.1f} items/s), "
+             f"{r['pages']} pages, {r['ran'] - r['failed']}/{r['ran']} shards ok ({r['shards']} planned)"]
+    for source in sorted(r["fetched"]):
+        fetched, stored = r["fetched"][source], r["stored"].get(source, 0)
+        lines.append(f"  {source:8} fetched {fetched:6}  new {stored:6}  ({fetched / elapsed:.1f} fetched/s)")
+    if r.get("truncated"):
+        lines.append(f"  ⚠️ {len(r['truncated'])} Naver shard(s) hit the API's result cap before reaching the "
+                     f"range start (older items missing): {', '.join(r['truncated'])}")
+    return "\n".join(lines)
+
+
+def status():
+    for path in sorted(glob.glob(os.path.join(Config.STATE_DIR, "backfill", "*.json"))):
+        shards = Checkpoint(path).state
+        done = sum(1 for s in shards.values() if s.get("done"))
+        truncated = sum(1 for s in shards.values() if s.get("truncated"))
+        by_kind = defaultdict(int)
+        for shard_id, s in shards.items():
+            by_kind[shard_id.split(":", 1)[0]] += s.get("items", 0)
+        print(f"{os.path.basename(path)[:-5]}: {done}/{len(shards)} touched shards done"
+              f"{f' ({truncated} truncated at the Naver cap)' if truncated else ''}, items {dict(by_kind)}")
+
+
+def main(argv: List[str]):
+    if argv[:1] == ["status"]:
+        return status()
+    if len(argv) < 2:
+        print("Usage: python backfill.py START END [workers] | status   (dates as YYYY-MM-DD)")
+        sys.exit(1)
+    start, end = datetime.date.fromisoformat(argv[0]), datetime.date.fromisoformat(argv[1])
+    if end < start:
+        raise SystemExit("END is before START")
+    oldest_kept = datetime.date.today() - datetime.timedelta(Config.ARCHIVE_RETENTION_DAYS)
+    if start < oldest_kept:
+        print(f"⚠️ Items before {oldest_kept} fall outside ARCHIVE_RETENTION_DAYS={Config.ARCHIVE_RETENTION_DAYS}: "
+              f"the next regular run prunes them. Raise it to keep this history.")
+    naver = bool(Config.NAVER_CLIENT_ID and Config.NAVER_CLIENT_SECRET)
+    if not naver:
+        print("[Backfill] No Naver API keys: skipping Naver shards")
+    Backfill(start, end).run(int(argv[2]) if len(argv) > 2 else None, naver=naver)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
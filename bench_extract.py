@@ -0,0 +1,127 @@
+"""
+Article extraction benchmark on recorded pages.
+
+    python bench_extract.py record [N]    # save up to N article pages from the configured feeds
+    python bench_extract.py [pages_dir]   # pages/sec: old BeautifulSoup path vs lxml engine (inline + pool),
+                                          # then with per-domain rules learned from the first pass
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from config import Config
+from domain_rules import DomainRuleStore
+from extractor import extract_html, is_good
+
+PAGES_DIR = os.path.join(Config.STATE_DIR, "pages")
+
+
+def legacy_extract(html: bytes, encoding: str) -> str:
+    """The pre-engine code path: whole-document html.parser, then a selector-by-selector search."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html.decode(encoding or "utf-8", errors="replace"), "html.parser")
+    article = soup.find('article')
+    if article:
+        return article.get_text(strip=True)
+    for class_name in ['main-content', 'article-body', 'post-content', 'entry-content', 'news_body', 'view_con']:
+        content_div = soup.find('div', class_=class_name)
+        if content_div:
+            return content_div.get_text(strip=True)
+    meta_desc = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
+    if meta_desc and meta_desc.get('content'):
+        return "[Meta] " + meta_desc['content']
+    return ""
+
+
+def _extract_page(page):
+    return extract_html(page[0], page[1])[0]
+
+
+def record(limit: int):
+    import feedparser
+    from http_client import get_client
+    from main import INTL_FEEDS, DOMESTIC_FEEDS
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    client = get_client()
+    index = []
+    for feed_url in INTL_FEEDS + DOMESTIC_FEEDS:
+        try:
+            feed = feedparser.parse(client.get(feed_url).content)
+        except Exception as e:
+            print(f"skip {feed_url}: {e}")
+            continue
+        for entry in feed.entries[:max(1, limit // 4)]:
+            if len(index) >= limit:
+                break
+            link = entry.get("link", "")
+            try:
+                resp = client.get(link)
+            except Exception as e:
+                print(f"skip {link}: {e}")
+                continue
+            if resp.status_code != 200:
+                continue
+            name = f"{len(index):04d}.html"
+            with open(os.path.join(PAGES_DIR, name), "wb") as f:
+                f.write(resp.content)
+            index.append({"file": name, "url": link, "encoding": resp.apparent_encoding})
+            print(f"{name} {len(resp.content) / 1024:>7.1f}KB {link}")
+    with open(os.path.join(PAGES_DIR, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    print(f"Recorded {len(index)} pages into {PAGES_DIR}")
+
+
+def load_pages(pages_dir: str):
+    with open(os.path.join(pages_dir, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    pages = []
+    for row in index:
+        with open(os.path.join(pages_dir, row["file"]), "rb") as f:
+            pages.append((f.read(), row.get("encoding"), row.get("url", "")))
+    return pages
+
+
+def _timed(label: str, pages, fn):
+    start = time.perf_counter()
+    texts = fn(pages)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(pages) / elapsed:>8.1f} pages/s  ({elapsed:.2f}s)")
+    return texts
+
+
+def benchmark(pages_dir: str, rounds: int = 3):
+    pages = load_pages(pages_dir) * rounds
+    size = sum(len(p[0]) for p in pages) / 1024 / 1024
+    print(f"{len(pages)} pages ({size:.1f}MB, {rounds} rounds) from {pages_dir}")
+
+    legacy = _timed("bs4 html.parser (old)", pages, lambda ps: [legacy_extract(h, e) for h, e, _ in ps])
+    inline = _timed("lxml streaming, inline", pages, lambda ps: [_extract_page(p) for p in ps])
+    workers = max(1, Config.EXTRACT_WORKERS)
+    with ProcessPoolExecutor(workers) as pool:
+        list(pool.map(_extract_page, pages[:workers])) # Start the workers outside the timing
+        _timed(f"lxml streaming, {workers} procs", pages, lambda ps: list(pool.map(_extract_page, ps, chunksize=4)))
+
+    same = sum(1 for a, b in zip(legacy, inline) if a[:200] == b[:200])
+    print(f"Same text as the old path: {same}/{len(pages)}")
+
+    # Learn per-host rules from one discovery pass, then parse again with them as hints
+    rules = DomainRuleStore()
+    for html, encoding, url in pages:
+        text, selector = extract_html(html, encoding)
+        rules.record(urlsplit(url).hostname or "", None, selector, is_good({"text": text, "selector": selector}))
+    hinted = [(h, e, rules.hint(urlsplit(u).hostname or "")) for h, e, u in pages]
+    _timed("lxml streaming, with rules", hinted, lambda ps: [extract_html(h, e, hint) for h, e, hint in ps])
+    good = lambda texts: sum(1 for t in texts if len(t) >= 200 and not t.startswith("[Meta]"))
+    print(f"Pages with good text: old {good(legacy)}, rules {good(t for t, _ in (extract_html(*p) for p in hinted))}"
+          f" / {len(pages)}  ({len(rules.rules)} host rules)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record(int(sys.argv[2]) if len(sys.argv) > 2 else 40)
+    else:
+        benchmark(sys.argv[1] if len(sys.argv) > 1 else PAGES_DIR)
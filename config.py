@@ -7,6 +7,9 @@ load_dotenv()
 class Config:
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+    # Extra recipients (chats / channels), comma separated. TELEGRAM_CHAT_ID is always included.
+    TELEGRAM_CHAT_IDS = os.getenv("TELEGRAM_CHAT_IDS", "")
+    TELEGRAM_SEND_CONCURRENCY = int(os.getenv("TELEGRAM_SEND_CONCURRENCY", "8"))
     
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -15,11 +18,101 @@ class Config:
     
     NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
     
+    # Timeouts (seconds). Every outbound call is bounded; the job as a whole has a deadline.
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", "15"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+    # Hedged LLM calls: if Gemini hasn't answered by this percentile of its recent latencies, ask OpenAI
+    # too and take the first valid answer (0 = off; needs both keys)
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
+    LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1")) # Share of calls allowed to hedge
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")) # Gemini calls seen before hedging starts
+    # LLM budget per run and per day (0 = unlimited). As it runs out the agent degrades in order:
+    # local model / heuristic scoring -> no translation -> titles only (no LLM call at all)
+    LLM_RUN_MAX_CALLS = int(os.getenv("LLM_RUN_MAX_CALLS", "150"))
+    LLM_RUN_MAX_TOKENS = int(os.getenv("LLM_RUN_MAX_TOKENS", "300000"))
+    LLM_DAY_MAX_CALLS = int(os.getenv("LLM_DAY_MAX_CALLS", "1000"))
+    LLM_DAY_MAX_TOKENS = int(os.getenv("LLM_DAY_MAX_TOKENS", "2000000"))
+    # Scoring replies are streamed: a score below this ends the call early (0 = always read the full reply).
+    # Items between it and the 7.0 cut keep their full reason (the Safety Net may still show them)
+    LLM_EARLY_REJECT_BELOW = float(os.getenv("LLM_EARLY_REJECT_BELOW", "5"))
+    # Article content allowed into each prompt (estimated tokens): lead + keyword sentences beyond that
+    PROMPT_SCORE_CONTENT_TOKENS = int(os.getenv("PROMPT_SCORE_CONTENT_TOKENS", "400"))
+    PROMPT_TRANSLATE_CONTENT_TOKENS = int(os.getenv("PROMPT_TRANSLATE_CONTENT_TOKENS", "250"))
+    HTTP_MAX_BYTES = int(os.getenv("HTTP_MAX_BYTES", str(5 * 1024 * 1024))) # Cap per response body
+    ARTICLE_MAX_BYTES = int(os.getenv("ARTICLE_MAX_BYTES", str(1536 * 1024))) # Article pages stop downloading here
+    DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+    JOB_DEADLINE_SECONDS = float(os.getenv("JOB_DEADLINE_SECONDS", "1200")) # 20 min, well inside the Actions limit
+    
+    # Article pages are fetched + parsed in worker processes (0 = inline, in the scraper's thread)
+    EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    
+    # Local state (scheduler last runs, candidate pool, ...)
+    STATE_DIR = os.getenv("STATE_DIR", ".state")
+    
+    # Article archive (SQLite + FTS5)
+    ARCHIVE_PATH = os.getenv("ARCHIVE_PATH", os.path.join(STATE_DIR, "archive.db"))
+    ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+    ARCHIVE_DEDUP_DAYS = int(os.getenv("ARCHIVE_DEDUP_DAYS", "7")) # Don't resend what was delivered this week
+    
+    # Local relevance model (python relevance_model.py train): skips the LLM scoring call when confident
+    LOCAL_MODEL_PATH = os.getenv("LOCAL_MODEL_PATH", os.path.join(STATE_DIR, "relevance_model.npz"))
+    LOCAL_MODEL_ACCEPT = float(os.getenv("LOCAL_MODEL_ACCEPT", "0.9")) # Calibrated P(score >= 7) to accept
+    LOCAL_MODEL_REJECT = float(os.getenv("LOCAL_MODEL_REJECT", "0.1")) # ... and to reject
+    LOCAL_MODEL_MIN_SAMPLES = int(os.getenv("LOCAL_MODEL_MIN_SAMPLES", "200"))
+    LOCAL_MODEL_MIN_ACCURACY = float(os.getenv("LOCAL_MODEL_MIN_ACCURACY", "0.9")) # On held-out confident items
+    LOCAL_MODEL_MIN_CONFIDENT = int(os.getenv("LOCAL_MODEL_MIN_CONFIDENT", "30")) # ... of which there must be this many
+    
+    LLM_BUDGET_PATH = os.getenv("LLM_BUDGET_PATH", os.path.join(STATE_DIR, "llm_spend.db")) # Spend per run / day
+    
+    # Topic profiles (JSON): several team digests from one fetch pass. No file = the single default brief
+    PROFILES_PATH = os.getenv("PROFILES_PATH", "profiles.json")
+    
+    # Queue mode (python main.py --once --workers N): fetch / extraction / agent calls as tasks in a SQLite work
+    # queue, consumed by N local worker processes plus any `python workers.py worker` pointed at the same file
+    QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", "-1")) # -1 = classic in-process job
+    QUEUE_PATH = os.getenv("QUEUE_PATH", os.path.join(STATE_DIR, "queue.db"))
+    QUEUE_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", "120")) # Unrenewed lease = worker gone, task requeued
+    QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+    
+    # Traffic archive (python main.py --once --record PATH / --replay PATH, see traffic.py)
+    TRAFFIC_MODE = os.getenv("TRAFFIC_MODE", "") # "record" / "replay"; set by the flags, inherited by child processes
+    TRAFFIC_PATH = os.getenv("TRAFFIC_PATH", os.path.join(STATE_DIR, "traffic.db"))
+    
+    # Backfill (python backfill.py START END): history by date-range shards, checkpointed in STATE_DIR
+    BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "4"))
+    BACKFILL_NAVER_RATE = float(os.getenv("BACKFILL_NAVER_RATE", "8")) # Requests/s, shared by all shards
+    BACKFILL_ARCHIVE_RATE = float(os.getenv("BACKFILL_ARCHIVE_RATE", "1")) # web.archive.org and Google News
+    
+    # Feed health: quarantine a feed after N consecutive failures (backoff doubles each time)
+    FEED_QUARANTINE_AFTER = int(os.getenv("FEED_QUARANTINE_AFTER", "3"))
+    
+    # Scheduling (--daemon)
+    DIGEST_AT = os.getenv("DIGEST_AT", "09:00")
+    POLL_FAST_MINUTES = int(os.getenv("POLL_FAST_MINUTES", "12"))
+    POLL_SLOW_MINUTES = int(os.getenv("POLL_SLOW_MINUTES", "60"))
+    POLL_JITTER_SECONDS = int(os.getenv("POLL_JITTER_SECONDS", "90"))
+    POLL_LLM_BATCH = int(os.getenv("POLL_LLM_BATCH", "2")) # New items LLM-processed per poll & category
+    BREAKING_SCORE = float(os.getenv("BREAKING_SCORE", "9.5")) # Agent score that triggers a separate alert
+    
+    # Profiling (--profile)
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profile_output")
+    PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+    
+    @classmethod
+    def telegram_chat_ids(cls):
+        ids = [cls.TELEGRAM_CHAT_ID] if cls.TELEGRAM_CHAT_ID else []
+        for chat_id in cls.TELEGRAM_CHAT_IDS.split(","):
+            chat_id = chat_id.strip()
+            if chat_id and chat_id not in ids:
+                ids.append(chat_id)
+        return ids
+    
     # Validation
     @classmethod
     def validate(cls):
         missing = []
         if not cls.TELEGRAM_BOT_TOKEN: missing.append("TELEGRAM_BOT_TOKEN")
-        if not cls.TELEGRAM_CHAT_ID: missing.append("TELEGRAM_CHAT_ID")
+        if not cls.telegram_chat_ids(): missing.append("TELEGRAM_CHAT_ID")
         # Add other critical keys as needed
         return missing
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from config import Config
+
+# Share of the job budget that must still be left to *start* a stage.
+# When the deadline gets close, stages wind down in this order (first listed stops first):
+#   full_content -> feeds -> llm_score (heuristic instead) -> llm_summary (title only) -> notify (always)
+STAGE_RESERVES = {
+    "full_content": 0.45,
+    "feeds": 0.35,
+    "llm_score": 0.25,
+    "llm_summary": 0.12,
+    "notify": 0.0,
+}
+
+# Time always kept back for assembling + sending the brief
+NOTIFY_RESERVE_SECONDS = 30
+
+# Scheduler jobs (poll / digest) run in parallel threads, each with its own deadline.
+# Helper threads without one of their own fall back to the most recently started deadline.
+_local = threading.local()
+_latest = None
+
+
+class Deadline:
+    """Job-level time budget that every stage checks before doing more work."""
+
+    def __init__(self, seconds: float = None, elapsed: float = 0.0, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.start = clock() - elapsed
+        self.started_at = time.time() - elapsed # Wall clock: lets another process join the same budget
+        self._announced = set()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.start
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return float("inf")
+        return self.seconds - self.elapsed()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, stage: str) -> bool:
+        """False once the remaining budget is below the stage's reserve (priority wind-down)."""
+        if self.seconds is None:
+            return True
+        reserve = max(NOTIFY_RESERVE_SECONDS, self.seconds * STAGE_RESERVES.get(stage, 0.0))
+        if stage == "notify":
+            return True
+        ok = self.remaining() > reserve
+        if not ok and stage not in self._announced:
+            self._announced.add(stage)
+            print(f"⏱️ Deadline near ({self.remaining():.0f}s left): winding down '{stage}'")
+        return ok
+
+    def budget(self, stage: str):
+        """Seconds until `stage` winds down (None = unlimited): how long a coordinator may wait on it."""
+        if self.seconds is None:
+            return None
+        reserve = max(NOTIFY_RESERVE_SECONDS, self.seconds * STAGE_RESERVES.get(stage, 0.0))
+        return max(1.0, self.remaining() - reserve)
+
+    def timeout(self, default: float) -> float:
+        """Per-call timeout: never longer than what's left before the notify reserve (min 1s)."""
+        if self.seconds is None:
+            return default
+        return max(1.0, min(default, self.remaining() - NOTIFY_RESERVE_SECONDS))
+
+    def sleep(self, seconds: float, stage: str = "llm_summary") -> bool:
+        """Back-off sleep that respects the deadline. False = no time left for the stage, caller should stop."""
+        if self.seconds is not None and self.remaining() - seconds <= max(
+                NOTIFY_RESERVE_SECONDS, self.seconds * STAGE_RESERVES.get(stage, 0.0)):
+            return False
+        if Config.TRAFFIC_MODE != "replay": # Replays run at full speed
+            time.sleep(seconds)
+        return True
+
+
+def start(seconds: float = None, elapsed: float = 0.0) -> Deadline:
+    """Begin a job deadline (None = unlimited), `elapsed` seconds already spent. Stages read it through current()."""
+    global _latest
+    _local.deadline = _latest = Deadline(seconds, elapsed)
+    return _latest
+
+
+def current() -> Deadline:
+    dl = getattr(_local, "deadline", None) or _latest
+    return dl if dl is not None else Deadline(None)
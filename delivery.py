@@ -0,0 +1,167 @@
+import asyncio
+import time
+from typing import Dict, List
+
+from metrics import summarize_latencies
+
+# Telegram hard limit per message
+MAX_MESSAGE_CHARS = 4096
+
+# Telegram Bot API limits: ~30 msg/s overall, ~1 msg/s per private chat, ~20 msg/min per group/channel
+GLOBAL_RATE = 30.0
+PRIVATE_CHAT_INTERVAL = 1.0
+GROUP_CHAT_INTERVAL = 3.0
+
+
+def split_message(header: str, blocks: List[str], limit: int = MAX_MESSAGE_CHARS) -> List[str]:
+    """
+    Pack blocks (one news item / section title each) into messages under `limit`,
+    splitting only at block boundaries. A single oversized block is cut at line breaks.
+    """
+    chunks = []
+    current = header
+    for block in blocks:
+        if len(block) > limit:
+            # Leave room for the header so it stays attached to the first piece
+            pieces = _split_long_block(block, limit - len(header))
+        else:
+            pieces = [block]
+        for piece in pieces:
+            if len(current) + len(piece) > limit and current.strip():
+                chunks.append(current.rstrip())
+                current = ""
+            current += piece
+    if current.strip():
+        chunks.append(current.rstrip())
+    return chunks
+
+
+def _split_long_block(block: str, limit: int) -> List[str]:
+    pieces = []
+    current = ""
+    for line in block.splitlines(keepends=True):
+        while len(line) > limit: # No line break to split on: hard cut
+            pieces.append(line[:limit])
+            line = line[limit:]
+        if len(current) + len(line) > limit:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class AsyncRateLimiter:
+    """Minimum spacing between sends (token bucket with burst 1)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class DeliveryQueue:
+    """
+    Fans a list of message chunks out to many chats.
+    - Chunks for one chat are sent in order by a single worker
+    - Workers share a global limiter; each chat has its own limiter (groups/channels are slower)
+    - RetryAfter -> wait exactly what Telegram asks; network errors -> backoff; any other error -> give up on that chat
+    """
+
+    def __init__(self, bot, concurrency: int = 8, max_attempts: int = 4):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.global_limiter = AsyncRateLimiter(1.0 / GLOBAL_RATE)
+        self.chat_limiters: Dict[str, AsyncRateLimiter] = {}
+
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.latencies: List[float] = []
+        self.failures: Dict[str, str] = {}
+        self.elapsed = 0.0
+
+    def _chat_limiter(self, chat_id: str) -> AsyncRateLimiter:
+        if chat_id not in self.chat_limiters:
+            # Group / channel ids are negative (-100...)
+            interval = GROUP_CHAT_INTERVAL if str(chat_id).startswith("-") else PRIVATE_CHAT_INTERVAL
+            self.chat_limiters[chat_id] = AsyncRateLimiter(interval)
+        return self.chat_limiters[chat_id]
+
+    async def _send(self, chat_id: str, text: str, queued_at: float) -> bool:
+        from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+        for attempt in range(self.max_attempts):
+            await self._chat_limiter(chat_id).acquire()
+            await self.global_limiter.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                self.sent += 1
+                self.latencies.append(time.monotonic() - queued_at)
+                self.failures.pop(chat_id, None)
+                return True
+            except RetryAfter as e:
+                self.retries += 1
+                wait = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                print(f"  [Delivery] {chat_id}: flood control, retry in {wait}s")
+                await asyncio.sleep(float(wait))
+            except (Forbidden, BadRequest) as e: # BadRequest is a NetworkError: catch it first
+                # Bot removed / chat not found / bad text: retrying won't help
+                self.failures[chat_id] = str(e)
+                break
+            except NetworkError as e: # Includes TimedOut
+                self.retries += 1
+                self.failures[chat_id] = str(e)
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                # ChatMigrated / InvalidToken / anything unexpected: give up on this chat only,
+                # the other workers keep sending
+                self.failures[chat_id] = f"{type(e).__name__}: {e}"
+                break
+        self.failed += 1
+        return False
+
+    async def _worker(self, queue: asyncio.Queue, chunks: List[str], queued_at: float):
+        while True:
+            try:
+                chat_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for chunk in chunks:
+                if not await self._send(chat_id, chunk, queued_at):
+                    break # Don't send part 2 without part 1
+
+    async def deliver(self, chat_ids: List[str], chunks: List[str]):
+        queue = asyncio.Queue()
+        for chat_id in chat_ids:
+            queue.put_nowait(chat_id)
+
+        start = time.monotonic()
+        workers = [asyncio.create_task(self._worker(queue, chunks, start))
+                   for _ in range(min(self.concurrency, len(chat_ids)))]
+        for result in await asyncio.gather(*workers, return_exceptions=True):
+            if isinstance(result, Exception): # Never leave the others mid-send: report and carry on
+                print(f"  [Delivery] worker stopped: {type(result).__name__}: {result}")
+        self.elapsed = time.monotonic() - start
+        return self
+
+    def report(self) -> str:
+        throughput = self.sent / self.elapsed if self.elapsed else 0.0
+        lines = [
+            f"Delivery: {self.sent} sent, {self.failed} failed, {self.retries} retries "
+            f"in {self.elapsed:.1f}s ({throughput:.1f} msg/s)",
+            f"Latency (queued -> sent): {summarize_latencies(self.latencies)}",
+        ]
+        for chat_id, error in self.failures.items():
+            lines.append(f"  ! {chat_id}: {error}")
+        return "\n".join(lines)
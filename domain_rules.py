@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+RULE_WINDOW = 20 # Latest outcomes kept per rule
+
+
+class DomainRuleStore:
+    """
+    Learned per-domain extraction rules, persisted between runs.
+    - hint(): the selector that last produced good article text on this host (tried first)
+    - record(): hit / miss bookkeeping. A rule whose recent success rate drops below
+      min_success_rate, or that hasn't been confirmed for max_age, is dropped and the
+      host goes back to discovery
+    """
+
+    def __init__(self, path: str = None, min_success_rate: float = 0.6, min_trials: int = 5,
+                 max_age: float = 30 * 24 * 3600):
+        self.path = path
+        self.min_success_rate = min_success_rate
+        self.min_trials = min_trials
+        self.max_age = max_age
+        self.rules: Dict[str, Dict] = {}
+        self.run_stats = {"hits": 0, "misses": 0, "learned": 0, "dropped": 0}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.rules = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[DomainRules] Could not read {self.path} ({e}). Starting fresh.")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.rules, f)
+            os.replace(tmp, self.path)
+
+    def begin_run(self):
+        self.run_stats = dict.fromkeys(self.run_stats, 0)
+
+    def _drop(self, host: str, why: str):
+        rule = self.rules.pop(host)
+        self.run_stats["dropped"] += 1
+        print(f"  [DomainRules] Dropped '{rule['selector']}' for {host} ({why})")
+
+    def hint(self, host: str, now: float = None) -> Optional[str]:
+        now = now or time.time()
+        with self._lock:
+            rule = self.rules.get(host)
+            if rule and now - rule["confirmed_at"] > self.max_age:
+                self._drop(host, f"not confirmed for {(now - rule['confirmed_at']) / 86400:.0f} days")
+                rule = None
+            return rule["selector"] if rule else None
+
+    def record(self, host: str, hint: Optional[str], selector: str, good: bool, now: float = None):
+        """Outcome of one extraction: which selector produced the text and whether it was good."""
+        now = now or time.time()
+        with self._lock:
+            rule = self.rules.get(host)
+            if hint and rule and rule["selector"] == hint:
+                hit = good and selector == hint
+                rule["recent"] = (rule["recent"] + [int(hit)])[-RULE_WINDOW:]
+                if hit:
+                    rule["hits"] += 1
+                    rule["confirmed_at"] = now
+                    self.run_stats["hits"] += 1
+                    return
+                rule["misses"] += 1
+                self.run_stats["misses"] += 1
+                rate = sum(rule["recent"]) / len(rule["recent"])
+                if len(rule["recent"]) < self.min_trials or rate >= self.min_success_rate:
+                    return
+                self._drop(host, f"{rate:.0%} success over the last {len(rule['recent'])} pages")
+            if host not in self.rules and good and selector and selector != "meta":
+                self.rules[host] = {"selector": selector, "hits": 0, "misses": 0, "recent": [],
+                                    "learned_at": now, "confirmed_at": now}
+                self.run_stats["learned"] += 1
+
+    def report(self) -> str:
+        s = self.run_stats
+        tried = s["hits"] + s["misses"]
+        rate = f"{s['hits'] / tried:.0%}" if tried else "-"
+        return (f"Domain rules: {len(self.rules)} hosts, {s['hits']}/{tried} hits ({rate}), "
+                f"{s['learned']} learned, {s['dropped']} dropped")
@@ -0,0 +1,385 @@
+import codecs
+import math
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from config import Config
+
+# Content containers tried during discovery, in priority order ("tag", "tag.class" or "tag#id")
+CONTENT_SELECTORS = [
+    "article",
+    "div.main-content",
+    "div.article-body",
+    "div.post-content",
+    "div.entry-content",
+    "div.news_body",
+    "div.view_con",
+    # Common Korean news CMS containers
+    "div#article-view-content-div",
+    "div#articleBody",
+    "div#articletxt",
+    "div#newsct_article",
+    "div.article_body",
+    "div.article_txt",
+    "div.story-news",
+]
+META_DESCRIPTIONS = (("name", "description"), ("property", "og:description"))
+SKIP_TAGS = ("script", "style")
+
+FEED_CHUNK = 16 * 1024 # Bytes handed to the pull parser at a time
+SNIFF_BYTES = 32 * 1024 # Prefix searched for <meta charset> / run through charset detection
+GOOD_CHARS = 200 # Less text than this is a teaser / related-news box, not the article
+ENOUGH_CHARS = 500 # A content node with this much text ends the parse early
+
+
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+
+def parse_selector(selector: str) -> Tuple[str, str, str]:
+    """'div.view_con' -> ('div', 'view_con', ''), 'div#articleBody' -> ('div', '', 'articleBody')"""
+    if "#" in selector:
+        tag, id_ = selector.split("#", 1)
+        return tag, "", id_
+    tag, _, css_class = selector.partition(".")
+    return tag, css_class, ""
+
+
+_PARSED = [parse_selector(s) for s in CONTENT_SELECTORS]
+_CANDIDATE_TAGS = {parsed[0] for parsed in _PARSED}
+
+
+def _matches(el, parsed) -> bool:
+    tag, css_class, id_ = parsed
+    if el.tag != tag:
+        return False
+    if css_class and css_class not in (el.get("class") or "").split():
+        return False
+    return not id_ or el.get("id") == id_
+
+
+def _match(el) -> int:
+    """Index of the first CONTENT_SELECTORS entry `el` matches, -1 if none."""
+    if el.tag not in _CANDIDATE_TAGS:
+        return -1
+    for rank, parsed in enumerate(_PARSED):
+        if _matches(el, parsed):
+            return rank
+    return -1
+
+
+def _outermost(el, test) -> bool:
+    # A nested match (an <article> inside another) is part of its ancestor
+    return not any(test(parent) for parent in el.iterancestors())
+
+
+def _node_text(el) -> str:
+    from lxml import etree
+    # Like BeautifulSoup's get_text(strip=True): stripped strings, script/style excluded
+    etree.strip_elements(el, *SKIP_TAGS, with_tail=False)
+    return "".join(s.strip() for s in el.itertext())
+
+
+def _codec(name: str):
+    """Charset label -> name libxml2/iconv understands ('ks_c_5601-1987' -> 'cp949'), None if unknown."""
+    try:
+        name = codecs.lookup(name.strip()).name
+    except (LookupError, AttributeError):
+        return None
+    # Pages labelled EUC-KR are really CP949 (its superset, as browsers decode them)
+    return "cp949" if name == "euc_kr" else name.replace("_", "-")
+
+
+def header_charset(content_type: str):
+    """Explicit charset from a Content-Type header (no HTTP ISO-8859-1 default)."""
+    match = _HEADER_CHARSET.search(content_type or "")
+    return _codec(match.group(1)) if match else None
+
+
+def sniff_encoding(prefix: bytes) -> str:
+    """Encoding of a document from its first bytes: BOM, then <meta charset>, then detection on the prefix only."""
+    for bom, name in ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if prefix.startswith(bom):
+            return name
+    match = _META_CHARSET.search(prefix)
+    if match and _codec(match.group(1).decode("ascii")):
+        return _codec(match.group(1).decode("ascii"))
+    from requests.compat import chardet
+    detected = _codec(chardet.detect(prefix[:SNIFF_BYTES]).get("encoding") or "")
+    # Pure-ASCII prefixes say nothing about the (probably Korean) text further down
+    return detected if detected not in (None, "ascii") else "utf-8"
+
+
+class ArticleExtractor:
+    """
+    Incremental article extraction: feed() bytes as they arrive, it returns True once the
+    article is found (so the caller can stop downloading), result() gives (text, selector).
+    - hint (a learned per-domain selector): done as soon as that element closes with good text
+    - discovery: done once an <article> with good text, or any candidate with enough_chars, has closed
+    Candidates with good text beat higher-priority teasers; meta description is the last resort.
+    Without a known encoding the first SNIFF_BYTES are buffered to find it.
+    """
+
+    def __init__(self, encoding: str = None, hint: str = None, enough_chars: int = ENOUGH_CHARS):
+        self.encoding = encoding
+        self.hint = hint
+        self.enough_chars = enough_chars
+        self._hinted = parse_selector(hint) if hint else None
+        self._parser = None
+        self._pending = b"" # Bytes held back until the encoding is known
+        self._found = None # (text, selector) early result
+        self._good = None # (rank, text) best candidate with GOOD_CHARS+
+        self._short = None # (rank, text) best candidate below that
+        self._meta = {}
+        self.done = False
+
+    def _start(self):
+        from lxml import etree
+        self.encoding = self.encoding or sniff_encoding(self._pending)
+        # Push parsing doesn't sniff the charset itself (libxml2 would assume Latin-1)
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=self.encoding)
+        data, self._pending = self._pending, b""
+        return self._feed(data)
+
+    def feed(self, data: bytes) -> bool:
+        if self.done:
+            return True
+        if self._parser is None:
+            self._pending += data
+            # Start as soon as a <meta charset> shows up, else once the sniff window is full
+            if not self.encoding and len(self._pending) < SNIFF_BYTES and not _META_CHARSET.search(self._pending):
+                return False
+            return self._start()
+        return self._feed(data)
+
+    def _feed(self, data: bytes) -> bool:
+        for offset in range(0, len(data), FEED_CHUNK):
+            self._parser.feed(data[offset:offset + FEED_CHUNK])
+            if self._read_events():
+                self.done = True
+                return True
+        return False
+
+    def _read_events(self) -> bool:
+        hinted = self._hinted
+        for event, el in self._parser.read_events():
+            if event == "start":
+                if el.tag == "meta":
+                    for attr, value in META_DESCRIPTIONS:
+                        if el.get(attr) == value and el.get("content"):
+                            self._meta.setdefault(value, el.get("content"))
+                continue
+            if not isinstance(el.tag, str):
+                continue
+            text = None
+            if hinted and _matches(el, hinted) and _outermost(el, lambda p: _matches(p, hinted)):
+                text = _node_text(el)
+                if len(text) >= GOOD_CHARS:
+                    self._found = (text, self.hint)
+                    return True
+            rank = _match(el)
+            if rank < 0 or (self._good and self._good[0] <= rank):
+                continue
+            if not _outermost(el, lambda p: _match(p) == rank):
+                continue
+            text = text if text is not None else _node_text(el)
+            if len(text) >= GOOD_CHARS:
+                self._good = (rank, text)
+                # With a hint, keep reading: the hinted element may still come
+                if not hinted and (rank == 0 or len(text) >= self.enough_chars):
+                    return True
+            elif self._short is None or rank < self._short[0]:
+                self._short = (rank, text)
+        return False
+
+    def result(self) -> Tuple[str, str]:
+        """(text, selector); selector is '' when nothing matched. Ends the parse if still running."""
+        from lxml import etree
+        if not self.done:
+            if self._parser is None:
+                self._start()
+            if not self.done:
+                try:
+                    self._parser.close()
+                except etree.LxmlError:
+                    pass
+                self._read_events()
+                self.done = True
+        if self._found:
+            return self._found
+        best = self._good or self._short
+        if best:
+            return best[1], CONTENT_SELECTORS[best[0]]
+        for _, value in META_DESCRIPTIONS:
+            if self._meta.get(value):
+                return "[Meta] " + self._meta[value], "meta"
+        return "", ""
+
+
+def extract_html(html: bytes, encoding: str = None, hint: str = None,
+                 enough_chars: int = ENOUGH_CHARS) -> Tuple[str, str]:
+    """Main text of a downloaded article page: (text, selector). See ArticleExtractor."""
+    extractor = ArticleExtractor(encoding, hint, enough_chars)
+    extractor.feed(html)
+    return extractor.result()
+
+
+def _body_left(resp) -> bool:
+    """Whether the server still had body bytes for us when we stopped reading."""
+    if resp._content_consumed:
+        return False # Already read in full (traffic record / replay)
+    raw = resp.raw
+    remaining = getattr(raw, "length_remaining", None) # urllib3: wire bytes still due per Content-Length
+    if remaining is not None:
+        return remaining > 0
+    return not raw.closed # Chunked: http.client closes the body once the last chunk is read
+
+
+def fetch_and_extract(url: str, timeout: float, hint: str = None, max_bytes: int = None) -> Dict:
+    """
+    Worker task: stream one article page into the extractor and hang up once the article
+    is found (or max_bytes is reached), instead of downloading the whole page.
+    """
+    from http_client import get_client
+    start = time.perf_counter()
+    result = {"url": url, "text": "", "selector": "", "hint": hint, "status": None, "bytes": 0,
+              "bytes_saved": 0, "cut": False, "error": "", "parse_seconds": 0.0}
+    limit = max_bytes or Config.ARTICLE_MAX_BYTES
+    try:
+        with get_client().stream(url, timeout=timeout) as resp:
+            result["status"] = resp.status_code
+            if resp.status_code == 200:
+                extractor = ArticleExtractor(header_charset(resp.headers.get("content-type")), hint)
+                size = 0
+                parse_seconds = 0.0
+                for chunk in resp.iter_content(FEED_CHUNK): # Decoded (gunzipped) bytes
+                    size += len(chunk)
+                    parse_start = time.perf_counter()
+                    done = extractor.feed(chunk)
+                    parse_seconds += time.perf_counter() - parse_start
+                    if done or size >= limit:
+                        result["cut"] = _body_left(resp) # Done on the last chunk = read in full, nothing saved
+                        break
+                parse_start = time.perf_counter()
+                result["text"], result["selector"] = extractor.result()
+                result["parse_seconds"] = parse_seconds + time.perf_counter() - parse_start
+            result["bytes"] = resp.raw.tell() # Wire bytes actually pulled
+            total = int(resp.headers.get("content-length") or 0)
+            if result["cut"]:
+                # Chunked / gzipped pages usually send no Content-Length: what we skipped is unknown
+                result["bytes_saved"] = max(0, total - result["bytes"]) if total else None
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def is_good(result: Dict) -> bool:
+    return result["selector"] not in ("", "meta") and len(result["text"]) >= GOOD_CHARS
+
+
+class ExtractionPool:
+    """
+    Article fetch + extraction in worker processes, so HTML parsing isn't serialized on the GIL.
+    - spawn context: safe next to the scheduler's threads, workers only import this module
+    - workers=0 (or a broken pool) runs the same code inline
+    - with a DomainRuleStore, each page is parsed with its host's learned selector first
+    """
+
+    def __init__(self, workers: int = None, rules=None):
+        self.workers = Config.EXTRACT_WORKERS if workers is None else workers
+        self.rules = rules
+        self._executor = None
+        self.begin_run()
+
+    def begin_run(self):
+        """Reset the per-run counters shown in report()."""
+        self.pages = 0
+        self.bytes = 0
+        self.bytes_saved = 0 # Known remainder (Content-Length) of pages we hung up on
+        self.cut = 0
+        self.cut_unsized = 0 # ... of which no Content-Length: remainder unknown
+        self.seconds = 0.0
+        self.parse = {"hinted": [0, 0.0], "discovery": [0, 0.0]} # pages, parse seconds
+        if self.rules:
+            self.rules.begin_run()
+
+    def _get_executor(self):
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def fetch_many(self, urls: List[str], timeout: float, budget: float = None) -> Dict[str, Dict]:
+        """url -> result dict (see fetch_and_extract). Pages not done within `budget` seconds are dropped."""
+        if not urls:
+            return {}
+        hosts = {url: urlsplit(url).hostname or "" for url in urls}
+        hints = {url: self.rules.hint(hosts[url]) for url in urls} if self.rules else {}
+        results = self._run(urls, timeout, budget, hints)
+
+        for url, result in results.items():
+            self.pages += 1
+            self.bytes += result["bytes"]
+            self.bytes_saved += result["bytes_saved"] or 0
+            self.cut += result["cut"]
+            self.cut_unsized += result["bytes_saved"] is None
+            self.seconds += result.get("seconds", 0)
+            if result["status"] != 200:
+                continue
+            kind = self.parse["hinted" if result["hint"] else "discovery"]
+            kind[0] += 1
+            kind[1] += result["parse_seconds"]
+            if self.rules:
+                self.rules.record(hosts[url], result["hint"], result["selector"], is_good(result))
+        if self.rules:
+            self.rules.save()
+        return results
+
+    def _run(self, urls: List[str], timeout: float, budget: float, hints: Dict[str, str]) -> Dict[str, Dict]:
+        executor = self._get_executor()
+        results = {}
+        if executor is None:
+            for url in urls:
+                results[url] = fetch_and_extract(url, timeout, hints.get(url))
+            return results
+        if budget is None:
+            budget = timeout * math.ceil(len(urls) / self.workers) + 5
+        try:
+            futures = {executor.submit(fetch_and_extract, url, timeout, hints.get(url)): url for url in urls}
+            finished, unfinished = wait(futures, timeout=budget)
+            for future in unfinished:
+                future.cancel()
+            for future in finished:
+                results[futures[future]] = future.result()
+            if unfinished:
+                print(f"  [Extract] {len(unfinished)} page(s) dropped (out of time)")
+        except BrokenProcessPool as e:
+            print(f"  [Extract] Worker pool broke ({e}); extracting inline from now on")
+            self.close()
+            self.workers = 0
+            results.update(self._run([u for u in urls if u not in results], timeout, budget, hints))
+        return results
+
+    def report(self) -> str:
+        mode = f"{self.workers} worker process(es)" if self.workers else "inline"
+        avg = self.seconds / self.pages if self.pages else 0
+        lines = [f"{self.pages} article page(s) via {mode}, {avg:.2f}s/page",
+                 f"Article bytes: {self.bytes / 1024:.0f}KB read, {self.bytes_saved / 1024:.0f}KB skipped "
+                 f"({self.cut} page(s) cut off early" +
+                 (f", {self.cut_unsized} of unknown size)" if self.cut_unsized else ")")]
+        parse = ", ".join(f"{kind} {n} page(s) {secs / n * 1000:.1f}ms" for kind, (n, secs) in self.parse.items() if n)
+        if parse:
+            lines.append(f"Parse time/page: {parse}")
+        if self.rules:
+            lines.append(self.rules.report())
+        return "\n".join(lines)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from metrics import percentile
+
+LATENCY_WINDOW = 50 # Latest fetch latencies kept per feed
+SEEN_WINDOW = 300 # Latest entry link hashes kept per feed (to count *new* items)
+
+
+def _new_record() -> Dict:
+    return {
+        "attempts": 0,
+        "successes": 0,
+        "consecutive_failures": 0,
+        "bozo_count": 0,
+        "latencies": [],
+        "new_items_avg": None, # EWMA of new entries per successful fetch
+        "last_success": None,
+        "last_error": "",
+        "quarantined_until": 0,
+        "next_poll_at": 0,
+        "seen": [],
+    }
+
+
+class FeedHealthTracker:
+    """
+    Per-feed health records, persisted between runs.
+    - Failing feeds (errors, bozo, HTTP >= 400) are quarantined with exponential backoff
+    - Slow-moving feeds (few new items per fetch) are polled less often
+    - skipped() / report() explain what was not fetched this run and why
+    """
+
+    def __init__(self, path: str = None, quarantine_after: int = 3, base_backoff: float = 3600,
+                 max_backoff: float = 7 * 24 * 3600, min_interval: float = 600, max_interval: float = 6 * 3600):
+        self.path = path
+        self.quarantine_after = quarantine_after
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.feeds: Dict[str, Dict] = {}
+        self._skipped: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.feeds = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[FeedHealth] Could not read {self.path} ({e}). Starting fresh.")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.feeds, f)
+            os.replace(tmp, self.path)
+
+    def _record(self, url: str) -> Dict:
+        if url not in self.feeds:
+            self.feeds[url] = _new_record()
+        return self.feeds[url]
+
+    def begin_run(self):
+        self._skipped = []
+
+    # --- Decisions ---
+
+    def should_poll(self, url: str, now: float = None) -> Tuple[bool, str]:
+        now = now or time.time()
+        with self._lock:
+            rec = self._record(url)
+            if rec["quarantined_until"] > now:
+                reason = (f"quarantined for {(rec['quarantined_until'] - now) / 3600:.1f}h more "
+                          f"({rec['consecutive_failures']} failures, last: {rec['last_error'][:60]})")
+            elif rec["next_poll_at"] > now:
+                reason = (f"slow feed (avg {rec['new_items_avg']:.1f} new/fetch), "
+                          f"next poll in {(rec['next_poll_at'] - now) / 60:.0f}m")
+            else:
+                return True, ""
+            self._skipped.append((url, reason))
+            return False, reason
+
+    def new_entry_count(self, url: str, links: List[str]) -> int:
+        """How many of these entry links were never seen in this feed before (remembers them)."""
+        with self._lock:
+            rec = self._record(url)
+            seen = set(rec["seen"])
+            hashes = [hashlib.sha1(link.encode("utf-8")).hexdigest()[:12] for link in links if link]
+            fresh = [h for h in hashes if h not in seen]
+            rec["seen"] = (rec["seen"] + fresh)[-SEEN_WINDOW:]
+            return len(fresh)
+
+    # --- Outcomes ---
+
+    def record_success(self, url: str, latency: float, new_items: int, now: float = None):
+        now = now or time.time()
+        with self._lock:
+            rec = self._record(url)
+            rec["attempts"] += 1
+            rec["successes"] += 1
+            rec["consecutive_failures"] = 0
+            rec["quarantined_until"] = 0
+            rec["last_success"] = now
+            rec["latencies"] = (rec["latencies"] + [round(latency, 3)])[-LATENCY_WINDOW:]
+
+            avg = rec["new_items_avg"]
+            rec["new_items_avg"] = new_items if avg is None else 0.7 * avg + 0.3 * new_items
+            # Adaptive polling: ~1 new item per poll is the target. Quiet feeds back off up to max_interval.
+            interval = self.min_interval / max(rec["new_items_avg"], self.min_interval / self.max_interval)
+            rec["next_poll_at"] = now + min(self.max_interval, interval) if rec["new_items_avg"] < 1 else 0
+
+    def record_failure(self, url: str, latency: float, error: str, bozo: bool = False, now: float = None):
+        now = now or time.time()
+        with self._lock:
+            rec = self._record(url)
+            rec["attempts"] += 1
+            rec["consecutive_failures"] += 1
+            rec["last_error"] = str(error)
+            rec["latencies"] = (rec["latencies"] + [round(latency, 3)])[-LATENCY_WINDOW:]
+            if bozo:
+                rec["bozo_count"] += 1
+
+            excess = rec["consecutive_failures"] - self.quarantine_after
+            if excess >= 0:
+                backoff = min(self.max_backoff, self.base_backoff * (2 ** excess))
+                rec["quarantined_until"] = now + backoff
+                print(f"  [FeedHealth] Quarantined {url} for {backoff / 3600:.1f}h "
+                      f"after {rec['consecutive_failures']} consecutive failures")
+
+    # --- Reporting ---
+
+    def skipped(self) -> List[Tuple[str, str]]:
+        return list(self._skipped)
+
+    def report(self, urls: List[str] = None) -> str:
+        lines = [f"{'feed':<60} {'ok%':>5} {'p50':>6} {'p95':>6} {'bozo':>4} {'new/f':>5}  status"]
+        now = time.time()
+        for url in urls or sorted(self.feeds):
+            rec = self.feeds.get(url)
+            if not rec or not rec["attempts"]:
+                continue
+            ok = rec["successes"] / rec["attempts"] * 100
+            avg = rec["new_items_avg"]
+            if rec["quarantined_until"] > now:
+                status = "QUARANTINED"
+            elif rec["next_poll_at"] > now:
+                status = "backoff (slow)"
+            else:
+                status = "ok"
+            lines.append(
+                f"{url[:60]:<60} {ok:>4.0f}% {percentile(rec['latencies'], 50):>5.2f}s "
+                f"{percentile(rec['latencies'], 95):>5.2f}s {rec['bozo_count']:>4} "
+                f"{(avg if avg is not None else 0):>5.1f}  {status}")
+        if self._skipped:
+            lines.append("Skipped this run:")
+            lines.extend(f"  - {url}: {reason}" for url, reason in self._skipped)
+        return "\n".join(lines)
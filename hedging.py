@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+from metrics import percentile, summarize_latencies
+
+PRIMARY, SECONDARY, EFFECTIVE = "gemini", "openai", "effective"
+
+
+class HedgePolicy:
+    """
+    When to send a slow LLM request to the second provider as well, learned from recent calls.
+    - delay: the primary's p-th latency percentile over the last `window` calls (no hedging until
+      `min_samples` calls are in: a guessed delay would hedge far too much or never)
+    - cap: hedges never exceed max_rate of calls, so a slow day doesn't double the LLM bill
+    Latencies are kept per provider, plus 'effective' (what the caller waited for).
+    A primary that lost the race still reports its latency when it finishes, so the primary
+    window stays the unhedged distribution: p50/p95/p99 before vs. after hedging.
+    One policy per kind of call (`name`): latencies of short and long replies don't mix.
+    """
+
+    def __init__(self, pct: float = 0, max_rate: float = 0.1, min_samples: int = 20, window: int = 200,
+                 name: str = ""):
+        self.name = name
+        self.pct = pct
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.latencies: Dict[str, deque] = {name: deque(maxlen=window) for name in (PRIMARY, SECONDARY, EFFECTIVE)}
+        self.calls = 0
+        self.hedges = 0
+        self.secondary_wins = 0
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.latencies[name].append(seconds)
+
+    def values(self, name: str) -> List[float]:
+        with self._lock:
+            return list(self.latencies[name])
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait for the primary before hedging; None = don't hedge this call."""
+        with self._lock:
+            self.calls += 1
+            primary = list(self.latencies[PRIMARY])
+        if not self.pct or len(primary) < self.min_samples:
+            return None
+        return percentile(primary, self.pct)
+
+    def take_hedge(self) -> bool:
+        """Claim one hedge under the rate cap."""
+        with self._lock:
+            if self.hedges + 1 > self.max_rate * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def count_win(self, secondary: bool):
+        with self._lock:
+            self.secondary_wins += secondary
+
+    def report(self) -> str:
+        lines = [f"{name:10} {summarize_latencies(self.values(name))}"
+                 for name in (PRIMARY, SECONDARY, EFFECTIVE) if self.values(name)]
+        if self.pct and self.calls:
+            lines.append(f"hedged {self.hedges}/{self.calls} calls past p{self.pct:g} "
+                         f"(cap {self.max_rate:.0%}), {SECONDARY} answered first {self.secondary_wins}x")
+        prefix = f"{self.name:10} " if self.name else ""
+        return "\n".join(prefix + line for line in lines)
+
+
+def first_valid(futures, timeout: float, valid=None):
+    """
+    Result of whichever future first succeeds with a result passing valid(result) (index, result).
+    The others are cancelled: dropped if not started yet, otherwise left to finish in their
+    thread with the result ignored. A result failing the check keeps the race going; if nothing
+    passes, the first such result is returned (the caller's own parsing decides). Raises the first
+    error if all fail, TimeoutError if none answers in time.
+    """
+    pending = set(futures)
+    errors, rejected = [], None
+    end = time.monotonic() + timeout
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            if rejected:
+                return rejected
+            raise TimeoutError(f"no LLM answer within {timeout:.0f}s")
+        for future in sorted(done, key=futures.index):
+            if future.exception() is not None:
+                errors.append(future.exception())
+            elif valid is None or valid(future.result()):
+                for other in pending:
+                    other.cancel()
+                return futures.index(future), future.result()
+            elif rejected is None:
+                rejected = futures.index(future), future.result()
+    if rejected:
+        return rejected
+    raise errors[0]
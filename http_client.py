@@ -0,0 +1,194 @@
+import importlib.util
+import socket
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from config import Config
+
+# One browser-like UA for every scraper request
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+_client = None
+_client_lock = threading.Lock()
+_dns_original = None # socket.getaddrinfo before install_dns_cache (None = not installed)
+
+
+def _accept_encoding() -> str:
+    # urllib3 decodes br only when brotli is installed
+    return "gzip, deflate, br" if importlib.util.find_spec("brotli") else "gzip, deflate"
+
+
+def install_dns_cache(ttl: float = 300):
+    """
+    Process-wide getaddrinfo cache. requests/urllib3, httpx (Telegram, OpenAI) and urllib all
+    resolve through socket.getaddrinfo, so one cache covers every client in the process.
+    """
+    global _dns_original
+    if _dns_original is not None:
+        return
+    original = socket.getaddrinfo
+    cache = {}
+    lock = threading.Lock()
+
+    def cached_getaddrinfo(host, port, *args, **kwargs):
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with lock:
+            hit = cache.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+        result = original(host, port, *args, **kwargs)
+        with lock:
+            cache[key] = (now + ttl, result)
+        return result
+
+    socket.getaddrinfo = cached_getaddrinfo
+    _dns_original = original
+
+
+def uninstall_dns_cache():
+    """Put the original socket.getaddrinfo back (tests, embedding)."""
+    global _dns_original
+    if _dns_original is not None:
+        socket.getaddrinfo, _dns_original = _dns_original, None
+
+
+class HttpClient:
+    """
+    The one HTTP client every scraper shares.
+    - keep-alive pool per host (requests.Session + HTTPAdapter)
+    - gzip/deflate (+ br when brotli is available), consistent UA, TLS verification always on
+    - bodies read in chunks and capped at max_bytes (resp.truncated tells you if it was cut),
+      or stream() for callers that stop reading as soon as they have what they need
+    - per-host request / new-connection counts to see how much keep-alive actually saves
+    - optional per-host rate limits (limit_rate), shared by every thread using the client
+    """
+
+    def __init__(self, pool_maxsize: int = 10, max_bytes: int = None, timeout: float = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.max_bytes = max_bytes or Config.HTTP_MAX_BYTES
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": _accept_encoding(),
+        })
+        self.session.verify = True
+        # pool_connections = number of hosts kept; pool_maxsize = keep-alive sockets per host
+        self.adapter = HTTPAdapter(pool_connections=64, pool_maxsize=pool_maxsize, max_retries=0)
+        if Config.TRAFFIC_MODE:
+            import traffic # --record / --replay: same pool, every exchange written down or served from the archive
+            self.adapter = traffic.http_adapter(pool_connections=64, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self.requests_by_host = defaultdict(int)
+        self.bytes_by_host = defaultdict(int)
+        self.truncated = 0
+        self._lock = threading.Lock()
+        self._intervals = {} # host -> min seconds between requests
+        self._next_slot = defaultdict(float)
+
+    def limit_rate(self, host: str, per_second: float):
+        """Space requests to `host` at most `per_second` apart, across all threads (None/0 = unlimited)."""
+        with self._lock:
+            if per_second:
+                self._intervals[host] = 1.0 / per_second
+            else:
+                self._intervals.pop(host, None)
+
+    def _throttle(self, url: str):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            interval = self._intervals.get(host)
+            if not interval:
+                return
+            now = time.monotonic()
+            wait = self._next_slot[host] - now
+            self._next_slot[host] = max(now, self._next_slot[host]) + interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def get(self, url: str, params=None, headers=None, timeout=None, max_bytes: int = None):
+        self._throttle(url)
+        resp = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout, stream=True)
+        limit = max_bytes or self.max_bytes
+        chunks = []
+        size = 0
+        resp.truncated = False
+        try:
+            for chunk in resp.iter_content(64 * 1024): # Decoded (gunzipped) bytes, capped below
+                if size + len(chunk) > limit:
+                    chunks.append(chunk[:limit - size])
+                    size = limit
+                    resp.truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        finally:
+            resp.close() # Fully read -> connection goes back to the pool; truncated -> dropped
+        resp._content = b"".join(chunks)
+        resp._content_consumed = True
+        self._count(url, resp.raw.tell(), resp.truncated)
+        return resp
+
+    @contextmanager
+    def stream(self, url: str, params=None, headers=None, timeout=None):
+        """
+        Streamed GET for readers that may stop early (iterate resp.iter_content yourself).
+        On exit the connection is released: back to the pool if the body was read to the end,
+        dropped otherwise. Only the bytes actually pulled are counted.
+        """
+        self._throttle(url)
+        resp = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout, stream=True)
+        try:
+            yield resp
+        finally:
+            wire = resp.raw.tell()
+            resp.close()
+            self._count(url, wire)
+
+    def _count(self, url: str, size: int, truncated: bool = False):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            self.requests_by_host[host] += 1
+            self.bytes_by_host[host] += size
+            if truncated:
+                self.truncated += 1
+
+    def connection_stats(self):
+        """{host: (requests, new_connections)} from urllib3's per-host pools."""
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_, conns = stats.get(pool.host, (0, 0))
+            stats[pool.host] = (requests_ + pool.num_requests, conns + pool.num_connections)
+        return stats
+
+    def report(self) -> str:
+        lines = [f"{'host':<40} {'reqs':>5} {'conns':>5} {'reuse%':>6} {'KB':>8}"]
+        for host, (reqs, conns) in sorted(self.connection_stats().items(), key=lambda kv: -kv[1][0]):
+            reuse = (1 - conns / reqs) * 100 if reqs else 0
+            lines.append(f"{host[:40]:<40} {reqs:>5} {conns:>5} {reuse:>5.0f}% {self.bytes_by_host.get(host, 0) / 1024:>8.1f}")
+        if self.truncated:
+            lines.append(f"{self.truncated} response(s) truncated at {self.max_bytes // 1024}KB")
+        return "\n".join(lines)
+
+
+def get_client() -> HttpClient:
+    """Process-wide shared client (created on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                install_dns_cache(Config.DNS_CACHE_TTL)
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+from config import Config
+from models import NewsItem, normalize_title
+import profiler
+import deadline
+
+
+class CandidatePool:
+    """
+    Items collected between digests.
+    Polls add new items and LLM-process them a few at a time, so the daily digest
+    only has to pick the best survivors and assemble the message.
+    State: 'new' -> 'accepted' | 'rejected' -> (delivered, removed from pool)
+    """
+
+    def __init__(self, path: str = None, delivered_ttl_days: int = 3):
+        self.path = path
+        self.delivered_ttl = delivered_ttl_days * 24 * 3600
+        self.items: Dict[str, NewsItem] = {} # norm title -> item
+        self.delivered: Dict[str, float] = {} # norm title / link -> delivered at
+        self.alerted: Dict[str, float] = {}
+        self._lock = threading.Lock() # Poll and digest jobs run in different threads
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.items = {k: NewsItem.from_dict(v) for k, v in data.get("items", {}).items()}
+            self.delivered = data.get("delivered", {})
+            self.alerted = data.get("alerted", {})
+        except (OSError, ValueError) as e:
+            print(f"[Pool] Could not read {self.path} ({e}). Starting empty.")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            items = {k: v.to_dict() for k, v in self.items.items()}
+            data = {"items": items, "delivered": self.delivered, "alerted": self.alerted}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def add(self, items: List[NewsItem], category: str) -> List[NewsItem]:
+        """Add fresh items. Returns only the ones never seen before (incremental)."""
+        added = []
+        now = time.time()
+        with self._lock:
+            for item in items:
+                key = normalize_title(item.title)
+                if not key or key in self.items or key in self.delivered or item.link in self.delivered:
+                    continue
+                item.category = item.category or category
+                item.pool_state = 'new'
+                item.pooled_at = now
+                self.items[key] = item
+                added.append(item)
+        return added
+
+    def pending(self, category: str, limit: int = None) -> List[NewsItem]:
+        with self._lock:
+            items = [i for i in self.items.values() if i.category == category and i.pool_state == 'new']
+        items.sort(key=lambda x: x.score, reverse=True)
+        return items[:limit] if limit else items
+
+    def mark_processed(self, batch: List[NewsItem], survivors: List[NewsItem]):
+        survivor_ids = {id(i) for i in survivors}
+        with self._lock:
+            for item in batch:
+                item.pool_state = 'accepted' if id(item) in survivor_ids else 'rejected'
+
+    def accepted(self, category: str) -> List[NewsItem]:
+        with self._lock:
+            items = [i for i in self.items.values() if i.category == category and i.pool_state == 'accepted']
+        items.sort(key=lambda x: x.agent_score or 0, reverse=True)
+        return items
+
+    def rejected(self, category: str) -> List[NewsItem]:
+        with self._lock:
+            items = [i for i in self.items.values() if i.category == category and i.pool_state != 'accepted']
+        items.sort(key=lambda x: x.score, reverse=True)
+        return items
+
+    def snapshot(self) -> List[NewsItem]:
+        """Every pooled item, read under the lock (polls mutate / replace the dict meanwhile)."""
+        with self._lock:
+            return list(self.items.values())
+
+    def mark_delivered(self, items: List[NewsItem]):
+        now = time.time()
+        with self._lock:
+            for item in items:
+                key = normalize_title(item.title)
+                if not key:
+                    continue
+                self.items.pop(key, None)
+                self.delivered[key] = now
+                if item.link:
+                    self.delivered[item.link] = now
+
+    def needs_alert(self, item: NewsItem) -> bool:
+        key = normalize_title(item.title)
+        with self._lock:
+            if key in self.alerted:
+                return False
+            self.alerted[key] = time.time()
+            return True
+
+    def prune(self, max_age_hours: float = 36):
+        """Drop stale undelivered items and forget old delivered keys."""
+        now = time.time()
+        with self._lock:
+            self.items = {k: v for k, v in self.items.items() if now - (v.pooled_at or now) < max_age_hours * 3600}
+            self.delivered = {k: t for k, t in self.delivered.items() if now - t < self.delivered_ttl}
+            self.alerted = {k: t for k, t in self.alerted.items() if now - t < self.delivered_ttl}
+
+
+def process_pending(runtime, category: str, limit: int):
+    """LLM-score/summarize the best few new items of a category (no Safety Net: that's the digest's call)."""
+    pool = runtime.pool
+    batch = pool.pending(category, limit=limit)
+    if not batch:
+        return []
+    with profiler.stage(f"process_{category}"):
+        survivors = runtime.processor.process_news(batch, safety_net=False)
+    pool.mark_processed(batch, survivors)
+    return survivors
+
+
+def send_breaking_alerts(runtime, survivors: List[NewsItem]):
+    import asyncio
+    for item in survivors:
+        if (item.agent_score or 0) >= Config.BREAKING_SCORE and runtime.pool.needs_alert(item):
+            print(f"🚨 Breaking: {item.title[:40]}")
+            asyncio.run(runtime.notifier.send_alert(item))
+
+
+def poll_sources(runtime, name: str, fetchers: Dict[str, callable]):
+    """
+    One incremental poll: fetch -> add unseen items to pool -> process a bounded batch.
+    fetchers: category -> zero-arg function returning items
+    """
+    pool = runtime.pool
+    pool.prune()
+    runtime.feed_health.begin_run()
+    runtime.extractor.begin_run()
+    # A poll must finish well before the next one is due
+    deadline.start(Config.POLL_FAST_MINUTES * 60 * 0.8)
+    runtime.processor.budget.start_run(time.strftime(f"poll-{name}-%Y%m%d-%H%M%S"))
+    for category, fetch in fetchers.items():
+        with profiler.stage(f"poll_{name}_{category}"):
+            items = fetch()
+        items = runtime.undelivered(items)
+        new_items = pool.add(items, category)
+        print(f"[Poll:{name}] {category}: {len(items)} fetched, {len(new_items)} new")
+        survivors = process_pending(runtime, category, Config.POLL_LLM_BATCH)
+        send_breaking_alerts(runtime, survivors)
+        # Poll results (with any fresh agent scores) go to the archive in one transaction
+        try:
+            runtime.archive.store_run(items)
+        except Exception as e:
+            print(f"  [Archive] Failed: {e}")
+    pool.save()
+    runtime.feed_health.save()
+    for url, reason in runtime.feed_health.skipped():
+        print(f"[Poll:{name}] skipped {url}: {reason}")
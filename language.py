@@ -0,0 +1,36 @@
+import html
+import re
+
+KOREAN = "ko"
+OTHER = "other"
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+_LETTER = re.compile(r"[가-힣ㄱ-ㆎA-Za-zÀ-ɏ]")
+_SOURCE_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,30}$")
+_SPACES = re.compile(r"\s+")
+
+TITLE_MAX = 80 # Same limit the translation prompt asks for
+KOREAN_SHARE = 0.3 # Hangul share of letters that makes a title Korean ('오픈AI, GPT-5 공개' is Korean)
+
+
+def detect_lang(title: str, summary: str = "") -> str:
+    """Script-based language guess: Korean if enough of the letters are Hangul (title first, then summary)."""
+    for text in (title, summary):
+        letters = len(_LETTER.findall(text or ""))
+        if letters >= 4:
+            return KOREAN if len(_HANGUL.findall(text)) / letters >= KOREAN_SHARE else OTHER
+    return OTHER
+
+
+def tidy_korean_title(title: str, strip_outlet: bool = False, max_len: int = TITLE_MAX) -> str:
+    """
+    Brief-ready Korean title without an LLM: entities decoded, whitespace collapsed, length capped.
+    strip_outlet drops a trailing ' - 매체명' (aggregators like Google News append it).
+    """
+    title = _SPACES.sub(" ", html.unescape(title or "")).strip()
+    if strip_outlet:
+        stripped = _SOURCE_SUFFIX.sub("", title)
+        title = stripped if len(stripped) >= 10 else title
+    if len(title) > max_len:
+        title = title[:max_len - 1].rstrip() + "…"
+    return title
@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+# Share of the budget that must still be left to *start* an LLM stage. As spend grows the agent
+# degrades in this order (first listed stops first):
+#   llm_score (local model / heuristic instead) -> llm_summary (no translation) -> llm (titles only)
+BUDGET_RESERVES = {
+    "llm_score": 0.3,
+    "llm_summary": 0.1,
+    "llm": 0.0,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_spend (
+    day TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    tokens_in INTEGER NOT NULL DEFAULT 0,
+    tokens_out INTEGER NOT NULL DEFAULT 0,
+    estimated INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, run_id, provider)
+);
+"""
+
+# reserve(): the call and its estimated prompt tokens are booked before it runs
+ADD = """
+INSERT INTO llm_spend (day, run_id, provider, calls, failed, tokens_in, tokens_out, estimated)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT(day, run_id, provider) DO UPDATE SET
+    calls = calls + 1, failed = failed + excluded.failed, tokens_in = tokens_in + excluded.tokens_in,
+    tokens_out = tokens_out + excluded.tokens_out, estimated = estimated + excluded.estimated
+"""
+
+# record(): the booking settled against what the provider reported
+SETTLE = """
+UPDATE llm_spend SET failed = failed + ?, tokens_in = tokens_in + ?, tokens_out = tokens_out + ?
+WHERE day = ? AND run_id = ? AND provider = ?
+"""
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count before the call: ~4 ASCII characters per token, ~1 token per Hangul / other character."""
+    text = text or ""
+    ascii_chars = sum(1 for c in text if c < "\x80")
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+@dataclass
+class Ticket:
+    """One reserved call: who it is charged to and what we expected (and booked) it to cost."""
+    run_id: str
+    provider: str
+    estimated: int
+    day: str = ""
+
+
+class LlmBudget:
+    """
+    LLM calls and tokens per provider, per run and per day, with priority wind-down (BUDGET_RESERVES).
+    - reserve() before every call books it with its estimated prompt tokens, in the same transaction as the
+      check (raises BudgetExhausted once nothing is left), so concurrent calls can't all slip past the limit;
+      record() after it settles the booking with the provider's reported usage (the estimate stands when a
+      call failed or reported none)
+    - spend lives in a small SQLite file: queue worker processes of one run share the run's budget
+    - the current run is per thread (scheduler polls and the digest run side by side), like deadline.py
+    """
+
+    def __init__(self, path: str = None, run_calls: int = None, run_tokens: int = None,
+                 day_calls: int = None, day_tokens: int = None):
+        self.path = path or Config.LLM_BUDGET_PATH
+        self.limits = {
+            "run_calls": Config.LLM_RUN_MAX_CALLS if run_calls is None else run_calls,
+            "run_tokens": Config.LLM_RUN_MAX_TOKENS if run_tokens is None else run_tokens,
+            "day_calls": Config.LLM_DAY_MAX_CALLS if day_calls is None else day_calls,
+            "day_tokens": Config.LLM_DAY_MAX_TOKENS if day_tokens is None else day_tokens,
+        }
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._local = threading.local()
+        self._latest = "adhoc"
+        self._announced = set()
+
+    def start_run(self, run_id: str):
+        self._local.run_id = run_id
+        if run_id == self._latest:
+            return # Queue workers call this for every task of a run
+        self._latest = run_id
+        cutoff = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 24 * 3600))
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM llm_spend WHERE day < ?", (cutoff,))
+
+    @property
+    def run_id(self) -> str:
+        return getattr(self._local, "run_id", None) or self._latest
+
+    # --- Spend ---
+
+    def totals(self, run_id: str = None) -> Dict[str, int]:
+        """calls / tokens for the run and for today (all runs, all processes)."""
+        with self._lock:
+            return self._totals(run_id or self.run_id)
+
+    def _totals(self, run_id: str) -> Dict[str, int]:
+        # Caller holds self._lock
+        day = time.strftime("%Y-%m-%d")
+        run = self.conn.execute("SELECT COALESCE(SUM(calls), 0), COALESCE(SUM(tokens_in + tokens_out), 0) "
+                                "FROM llm_spend WHERE run_id = ?", (run_id,)).fetchone()
+        today = self.conn.execute("SELECT COALESCE(SUM(calls), 0), COALESCE(SUM(tokens_in + tokens_out), 0) "
+                                  "FROM llm_spend WHERE day = ?", (day,)).fetchone()
+        return {"run_calls": run[0], "run_tokens": run[1], "day_calls": today[0], "day_tokens": today[1]}
+
+    def used(self, totals: Dict[str, int] = None) -> float:
+        """Share of the tightest limit already spent (0 when everything is unlimited)."""
+        totals = totals or self.totals()
+        return max([totals[k] / limit for k, limit in self.limits.items() if limit] or [0.0])
+
+    def allows(self, stage: str) -> bool:
+        """False once less than the stage's reserve is left (announced once per run and stage)."""
+        used = self.used()
+        ok = used < 1.0 - BUDGET_RESERVES.get(stage, 0.0)
+        if not ok:
+            self._announce(stage, used)
+        return ok
+
+    def _announce(self, stage: str, used: float):
+        if (self.run_id, stage) not in self._announced:
+            self._announced.add((self.run_id, stage))
+            print(f"💸 LLM budget {used:.0%} spent: winding down '{stage}'")
+
+    def reserve(self, provider: str, prompt: str) -> Ticket:
+        """Check the budget and book the call in one write transaction (across threads and processes)."""
+        ticket = Ticket(self.run_id, provider, estimate_tokens(prompt), time.strftime("%Y-%m-%d"))
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                used = self.used(self._totals(ticket.run_id))
+                if used < 1.0:
+                    self.conn.execute(ADD, (ticket.day, ticket.run_id, provider, 0, ticket.estimated, 0,
+                                            ticket.estimated))
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+        if used >= 1.0:
+            self._announce("llm", used)
+            raise BudgetExhausted(f"LLM budget spent ({ticket.run_id})")
+        return ticket
+
+    def record(self, ticket: Ticket, usage: Optional[Tuple[int, int]] = None, failed: bool = False):
+        """usage = (prompt tokens, completion tokens) as reported by the provider."""
+        tokens_in, tokens_out = usage if usage else (ticket.estimated, 0)
+        with self._lock, self.conn:
+            self.conn.execute(SETTLE, (int(failed), tokens_in - ticket.estimated, tokens_out,
+                                       ticket.day, ticket.run_id, ticket.provider))
+
+    def report(self, run_id: str = None) -> str:
+        run_id = run_id or self.run_id
+        with self._lock:
+            rows = self.conn.execute("SELECT provider, SUM(calls), SUM(failed), SUM(tokens_in), SUM(tokens_out), "
+                                     "SUM(estimated) FROM llm_spend WHERE run_id = ? GROUP BY provider ORDER BY provider",
+                                     (run_id,)).fetchall()
+        lines = [f"{provider:8} {calls} calls ({failed} failed), {tokens_in + tokens_out:,} tokens "
+                 f"(in {tokens_in:,} / out {tokens_out:,}; prompts estimated {estimated:,})"
+                 for provider, calls, failed, tokens_in, tokens_out, estimated in rows]
+        totals = self.totals(run_id)
+        limits = ", ".join(f"{k.replace('_', ' ')} {totals[k]:,}/{limit:,}" for k, limit in self.limits.items() if limit)
+        lines.append(f"budget: {limits or 'unlimited'}")
+        return "\n".join(lines)
@@ -1,125 +1,372 @@
-import schedule
-import time
 import asyncio
+import os
 import sys
+import time
 from scrapers.rss_scraper import RSSScraper
-from scrapers.api_scraper import NaverNewsScraper
-from processor import ContentProcessor
-from notifier import TelegramNotifier
 from config import Config
+from runtime import Runtime
+import deadline
+from scheduler import AsyncScheduler
+from incremental import poll_sources, process_pending
+from models import NewsItem, normalize_title
+import profiler
+
+# 1. Define Sources (V2)
+# International Sources
+INTL_FEEDS = [
+    "https://techcrunch.com/category/artificial-intelligence/feed/",
+    "https://venturebeat.com/category/ai/feed/",
+    "https://www.artificialintelligence-news.com/feed/",
+    "https://feeds.bloomberg.com/markets/news.rss", # Added Bloomberg
+]
+
+# Domestic Sources (RSS)
+# Google News is the best aggregator for "Artificial Intelligence" in Korea (and the fastest moving)
+GOOGLE_NEWS_KR_FEED = "https://news.google.com/rss/search?q=%EC%9D%B8%EA%B3%B5%EC%A7%80%EB%8A%A5+when:24h&hl=ko&gl=KR&ceid=KR:ko"
+DOMESTIC_FEEDS = [
+    GOOGLE_NEWS_KR_FEED,
+    "https://rss.etnews.com/Section902.xml", # ETNews AI
+    "http://feeds.feedburner.com/zdkorea", # ZDNet (often unstable: feed health quarantines it when it fails)
+    "https://www.hankyung.com/feed/ai", # Hankyung AI
+]
+SLOW_DOMESTIC_FEEDS = [f for f in DOMESTIC_FEEDS if f != GOOGLE_NEWS_KR_FEED]
+
+def fetch_international(runtime: Runtime, keep_rejected: bool = False):
+    intl_scraper = RSSScraper(INTL_FEEDS, category='international', session=runtime.session,
+                              content_cache=runtime.content_cache, health=runtime.feed_health,
+                              extractor=runtime.extractor, keep_rejected=keep_rejected)
+    return intl_scraper.fetch_news()
+
+def fetch_domestic_rss(runtime: Runtime, feeds=DOMESTIC_FEEDS, keep_rejected: bool = False):
+    dom_scraper = RSSScraper(feeds, category='domestic', session=runtime.session,
+                             content_cache=runtime.content_cache, health=runtime.feed_health,
+                             extractor=runtime.extractor, keep_rejected=keep_rejected)
+    return dom_scraper.fetch_news()
+
+def fetch_naver(runtime: Runtime, keep_rejected: bool = False):
+    # API (Simple v3)
+    # from scrapers.api_scraper import NaverNewsScraper
+    from scrapers.simple_naver import SimpleNaverScraper
+    naver_scraper = SimpleNaverScraper(keep_rejected=keep_rejected)
+    items = naver_scraper.fetch_news()
+    runtime.naver_last_error = naver_scraper.last_error
+    return items
+
+def fetch_profile_naver(runtime: Runtime, profiles):
+    """One Naver pass over the union of every profile's queries (each query runs once)."""
+    from profiles import shared_naver_queries
+    queries, excludes = shared_naver_queries(profiles)
+    if not queries:
+        return []
+    from scrapers.api_scraper import NaverNewsScraper
+    naver_scraper = NaverNewsScraper(session=runtime.session, keep_rejected=True)
+    items = naver_scraper.fetch_queries(queries, excludes)
+    if naver_scraper.last_error:
+        runtime.naver_last_error = naver_scraper.last_error
+    return items
+
+def dedup_by_title(items):
+    unique = []
+    seen_titles = set()
+    for item in items:
+        # Normalize title for dedup
+        norm_title = normalize_title(item.title)
+        if norm_title not in seen_titles:
+            unique.append(item)
+            seen_titles.add(norm_title)
+    return unique
+
+def build_debug_item(runtime: Runtime, raw_naver: int, dedup: int, candidates: int):
+    # [Diagnostic Debug] If Domestic is empty, append debug info
+    debug_msg = "\n[🔍 디버그 정보]\n"
+    debug_msg += f"- Naver ID Loaded: {'YES' if Config.NAVER_CLIENT_ID else 'NO'}\n"
+    debug_msg += f"- Naver Secret Loaded: {'YES' if Config.NAVER_CLIENT_SECRET else 'NO'}\n"
+    debug_msg += f"- Google Key Loaded: {'YES' if Config.GOOGLE_API_KEY else 'NO'}\n"
+    debug_msg += f"- Naver Error: {runtime.naver_last_error}\n" # Added
+    debug_msg += f"- Raw Naver items found: {raw_naver}\n"
+    debug_msg += f"- Raw/Dedup/Candidate: {raw_naver}/{dedup}/{candidates}"
+    
+    # Appended as a mock item so it shows up
+    return NewsItem(title='', link='', source='debug', processed_summary=debug_msg)
+
+def archive_run(runtime: Runtime, items, delivered=(), by_profile=None):
+    try:
+        stored = runtime.archive.store_run(items, delivered=delivered)
+        for profile, sent in (by_profile or {}).items():
+            runtime.archive.mark_delivered(sent, profile=profile)
+        pruned = runtime.archive.prune(Config.ARCHIVE_RETENTION_DAYS)
+        print(f"  [Archive] {stored} stored, {pruned} pruned")
+    except Exception as e:
+        # History is nice to have: never fail the brief because of it
+        print(f"  [Archive] Failed: {e}")
+
+def report_feed_health(runtime: Runtime):
+    print("=== Feed Health ===")
+    print(runtime.feed_health.report(INTL_FEEDS + DOMESTIC_FEEDS))
+    runtime.feed_health.save()
 
-def job():
+def job(runtime: Runtime = None, run_id: str = None):
     print("="*30)
     print(">>> RUNNING VERSION: 2026-02-09 (SIMPLIFIED) <<<")
     print(">>> IF YOU DO NOT SEE THIS, YOU ARE RUNNING OLD CODE <<<")
     print("="*30)
     
-    # 1. Define Sources (V2)
-    # International Sources
-    intl_feeds = [
-        "https://techcrunch.com/category/artificial-intelligence/feed/",
-        "https://venturebeat.com/category/ai/feed/",
-        "https://www.artificialintelligence-news.com/feed/",
-        "https://feeds.bloomberg.com/markets/news.rss", # Added Bloomberg
-    ]
-    
-    # Domestic Sources (RSS)
-    domestic_feeds = [
-        # Google News is the best aggregator for "Artificial Intelligence" in Korea
-        "https://news.google.com/rss/search?q=%EC%9D%B8%EA%B3%B5%EC%A7%80%EB%8A%A5+when:24h&hl=ko&gl=KR&ceid=KR:ko",
-        "https://rss.etnews.com/Section902.xml", # ETNews AI
-        # "http://feeds.feedburner.com/zdkorea", # ZDNet (often unstable but try)
-        "https://www.hankyung.com/feed/ai", # Hankyung AI
-    ]
+    # --once: fresh runtime per run. --daemon: warm runtime passed in.
+    runtime = runtime or Runtime()
+    runtime.runs += 1
+    runtime.feed_health.begin_run()
+    runtime.extractor.begin_run()
+    # Hard wall-clock budget: stages wind down in priority order and we still send what's ready
+    deadline.start(Config.JOB_DEADLINE_SECONDS)
+    # LLM calls / tokens of this run count against the run and the day budget
+    # (a resumed queue run keeps its id: finished tasks and spend carry over)
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    runtime.processor.budget.start_run(run_id)
+    
+    if Config.QUEUE_WORKERS >= 0:
+        # Queue mode: same stages as below, run as tasks by worker processes
+        from workers import run_job
+        return run_job(runtime, Config.QUEUE_WORKERS, run_id)
+    
+    # Topic profiles share this one fetch pass; scoring, selection and delivery are per profile
+    profiles = runtime.profiles
+    # Profiles with their own keywords filter for themselves: scrapers keep what the built-in tiers reject
+    custom = any(p.keywords is not None for p in profiles)
     
     # 2. Fetch & Score
     print("Fetching International News...")
-    intl_scraper = RSSScraper(intl_feeds, category='international')
-    intl_items = intl_scraper.fetch_news()
-    intl_items.sort(key=lambda x: x['score'], reverse=True)
-    candidates_intl = intl_items[:6] # Send top 6 to Agent
+    with profiler.stage("fetch_intl"):
+        intl_items = fetch_international(runtime, keep_rejected=custom)
     
     print("Fetching Domestic News (RSS + Naver API)...")
     # 1. RSS
-    dom_scraper = RSSScraper(domestic_feeds, category='domestic')
-    dom_rss_items = dom_scraper.fetch_news()
+    with profiler.stage("fetch_domestic_rss"):
+        dom_rss_items = fetch_domestic_rss(runtime, keep_rejected=custom)
     print(f"  - RSS Items: {len(dom_rss_items)}")
     
-    # 2. API (Simple v3)
-    # from scrapers.api_scraper import NaverNewsScraper
-    from scrapers.simple_naver import SimpleNaverScraper
-    
+    # 2. API (Simple v3) + the union of the profiles' own queries
     print("Fetching Domestic News (Naver Simple V3)...")
-    naver_scraper = SimpleNaverScraper()
-    dom_api_items = naver_scraper.fetch_news()
+    with profiler.stage("fetch_naver"):
+        dom_api_items = fetch_naver(runtime, keep_rejected=custom) + fetch_profile_naver(runtime, profiles)
     print(f"  - Naver V3 Items: {len(dom_api_items)}")
     
     # Merge & Deduplicate
-    all_dom_items = dom_rss_items + dom_api_items
-    unique_dom = []
-    seen_titles = set()
+    with profiler.stage("dedup"):
+        unique_dom = dedup_by_title(dom_rss_items + dom_api_items)
     
-    for item in all_dom_items:
-        # Normalize title for dedup
-        norm_title = item['title'].replace(' ', '').lower()
-        if norm_title not in seen_titles:
-            unique_dom.append(item)
-            seen_titles.add(norm_title)
-            
-    # Sort by keyword score
-    unique_dom.sort(key=lambda x: x.get('score', 0), reverse=True)
-    candidates_dom = unique_dom[:6] # Send top 6 to Agent
+    candidates = select_candidates(runtime, profiles, intl_items, unique_dom)
     
-    print(f"Candidates for Agent Scoring: {len(candidates_intl)} Intl, {len(candidates_dom)} Domestic.")
+    # 3. Process (Agent Scoring + Summarize): each item once, however many profiles picked it
+    processor = runtime.processor
+    survivors = {}
+    for (category, batch), stage in zip(agent_batches(profiles, candidates).items(), ("process_intl", "process_dom")):
+        print(f"Agent evaluating {category} items ({len(batch)})...")
+        with profiler.stage(stage):
+            survivors[category] = {id(i) for i in processor.process_news(batch, safety_net=False)}
     
-    # 3. Process (Agent Scoring + Summarize)
-    processor = ContentProcessor()
+    # 4. Select + Notify, per profile
+    delivered, by_profile = deliver_briefs(runtime, profiles, candidates, survivors, len(dom_api_items), len(unique_dom))
+    finish_run(runtime, intl_items + unique_dom, delivered, by_profile)
+
+def select_candidates(runtime: Runtime, profiles, intl_items, unique_dom):
+    """profile name -> category -> items for the agent: keyword score for every profile in one pass, best first."""
+    from profiles import ProfileMatrix
+    with profiler.stage("profile_score"):
+        matrix = ProfileMatrix(profiles)
+        ranked = {
+            'international': matrix.ranked(intl_items, matrix.score(intl_items)),
+            'domestic': matrix.ranked(unique_dom, matrix.score(unique_dom)),
+        }
+    candidates = {}
+    for profile in profiles:
+        candidates[profile.name] = {
+            category: runtime.undelivered(per_profile[profile.name], profile.archive_key)[:profile.candidates] # Send top N to Agent
+            for category, per_profile in ranked.items()
+        }
+        print(f"[{profile.name}] Candidates for Agent Scoring: {len(candidates[profile.name]['international'])} Intl, "
+              f"{len(candidates[profile.name]['domestic'])} Domestic.")
+    return candidates
+
+def agent_batches(profiles, candidates):
+    """category -> the union of every profile's candidates (each item once)."""
+    return {category: list({id(i): i for p in profiles for i in candidates[p.name][category]}.values())
+            for category in ('international', 'domestic')}
+
+def deliver_briefs(runtime: Runtime, profiles, candidates, survivors, raw_naver: int, dedup: int):
+    """
+    Top survivors per profile (Safety Net if none), one brief each.
+    Returns (sent by the global-history brief, archive key -> sent by that profile).
+    """
+    processor = runtime.processor
+    notifier = runtime.notifier
+    delivered, by_profile = [], {}
+    for profile in profiles:
+        finals = {}
+        for category, picked in candidates[profile.name].items():
+            final = [i for i in picked if id(i) in survivors[category]][:profile.top_n] # Pick Top N Survivors
+            if not final and picked:
+                print(f"⚠️ [{profile.name}] All {category} items filtered by Agent. Using Safety Net (Top 1).")
+                final = [processor.rescue(picked[0])]
+            finals[category] = final
+        final_intl, final_dom = finals['international'], finals['domestic']
+        sent = final_intl + final_dom
+        
+        if not final_dom:
+            final_dom.append(build_debug_item(runtime, raw_naver, dedup, len(candidates[profile.name]['domestic'])))
+
+        with profiler.stage("notify"):
+            if not asyncio.run(notifier.send_daily_brief(final_intl, final_dom, chat_ids=profile.chat_ids,
+                                                         title=profile.title or None)):
+                continue # Not delivered: these items stay eligible for the next brief
+        if profile.archive_key:
+            by_profile[profile.archive_key] = sent
+        else:
+            delivered += sent
+    return delivered, by_profile
+
+def finish_run(runtime: Runtime, items, delivered, by_profile):
+    # 5. Archive: every normalized item of this run (+ agent scores / summaries), one transaction
+    with profiler.stage("archive"):
+        archive_run(runtime, items, delivered=delivered, by_profile=by_profile)
     
-    print("Agent evaluating International items...")
-    processed_intl = processor.process_news(candidates_intl)
-    final_intl = processed_intl[:3] # Pick Top 3 Survivors
+    report_feed_health(runtime)
+    print("=== HTTP Connections ===")
+    print(runtime.session.report())
+    if runtime.extractor.pages:
+        print(runtime.extractor.report())
+    llm_report = runtime.llm_report()
+    if llm_report:
+        print("=== LLM Spend & Latency ===")
+        print(llm_report)
     
-    print("Agent evaluating Domestic items...")
-    processed_dom = processor.process_news(candidates_dom)
-    final_dom = processed_dom[:3] # Pick Top 3 Survivors
+    print("=== Job Finished ===")
+
+def poll_fast(runtime: Runtime):
+    """Intra-day poll of fast-moving sources (Naver + Google News)."""
+    poll_sources(runtime, "fast", {
+        'domestic': lambda: dedup_by_title(fetch_naver(runtime) + fetch_domestic_rss(runtime, [GOOGLE_NEWS_KR_FEED])),
+    })
+
+def poll_slow(runtime: Runtime):
+    """Less frequent poll of the remaining RSS feeds."""
+    poll_sources(runtime, "slow", {
+        'international': lambda: fetch_international(runtime),
+        'domestic': lambda: fetch_domestic_rss(runtime, SLOW_DOMESTIC_FEEDS),
+    })
+
+def digest(runtime: Runtime):
+    """
+    Daily brief from the incremental pool. Most items were already scored/summarized
+    by the polls, so this mostly assembles the message.
+    """
+    print("=== Daily Digest (incremental) ===")
+    deadline.start(Config.JOB_DEADLINE_SECONDS)
+    runtime.processor.budget.start_run(time.strftime("digest-%Y%m%d-%H%M%S"))
+    pool = runtime.pool
+    processor = runtime.processor
+    finals = {}
     
-    # 4. Notify
-    notifier = TelegramNotifier()
+    for category in ('international', 'domestic'):
+        # Last bounded pass over anything the polls didn't get to
+        if len(pool.accepted(category)) < 3:
+            process_pending(runtime, category, 6)
+        final = pool.accepted(category)[:3] # Pick Top 3 Survivors
+        
+        if not final:
+            # Safety Net: re-run the best rejected candidate through the normal path
+            final = processor.process_news(pool.rejected(category)[:1])[:3]
+        finals[category] = final
+    
+    final_intl, final_dom = finals['international'], finals['domestic']
+    picked = final_intl + final_dom
+    pooled = pool.snapshot()
     
-    # [Diagnostic Debug] If Domestic is empty, append debug info
     if not final_dom:
-        debug_msg = "\n[🔍 디버그 정보]\n"
-        debug_msg += f"- Naver ID Loaded: {'YES' if Config.NAVER_CLIENT_ID else 'NO'}\n"
-        debug_msg += f"- Naver Secret Loaded: {'YES' if Config.NAVER_CLIENT_SECRET else 'NO'}\n"
-        debug_msg += f"- Google Key Loaded: {'YES' if Config.GOOGLE_API_KEY else 'NO'}\n"
-        debug_msg += f"- Naver Error: {getattr(naver_scraper, 'last_error', 'None')}\n" # Added
-        debug_msg += f"- Raw Naver items found: {len(dom_api_items)}\n"
-        debug_msg += f"- Raw/Dedup/Candidate: {len(dom_api_items)}/{len(unique_dom)}/{len(candidates_dom)}"
-        
-        # Append as a mock item so it shows up
-        final_dom.append({
-            'processed_summary': debug_msg
-        })
+        final_dom.append(build_debug_item(runtime, 0, len(pooled), 0))
+    
+    # Only a brief that went out takes its items out of the pool (a failed send retries them next digest)
+    delivered = picked if asyncio.run(runtime.notifier.send_daily_brief(final_intl, final_dom)) else []
+    pool.mark_delivered(delivered)
+    archive_run(runtime, pooled, delivered=delivered)
+    pool.save()
+    print("=== Digest Finished ===")
+
+def run_profiled():
+    """
+    --profile: run job() once under cProfile + stack sampler.
+    Writes collapsed stacks (flamegraph) + hot function table to Config.PROFILE_DIR.
+    """
+    prof = profiler.PipelineProfiler(top_n=Config.PROFILE_TOP_N)
+    try:
+        prof.run(job)
+    finally:
+        out_dir = prof.write(Config.PROFILE_DIR)
+        print(prof.stage_table())
+        print(f"📊 Profile written to {out_dir} (stacks.collapsed, report.txt, job.pstats)")
 
-    asyncio.run(notifier.send_daily_brief(final_intl, final_dom))
+def run_daemon(run_now: bool = False):
+    """
+    --daemon: long-lived asyncio scheduler with several cadences.
+    - poll_fast  (Naver + Google News) every POLL_FAST_MINUTES
+    - poll_slow  (other RSS) every POLL_SLOW_MINUTES
+    - digest     daily at DIGEST_AT, assembled from the incrementally processed pool
+    One warm Runtime (HTTP session, LLM clients, caches, pool) is shared by all jobs.
+    """
+    print(f"AI News Agent V2 Daemon Started. Digest daily at {Config.DIGEST_AT}, polling every {Config.POLL_FAST_MINUTES}m...")
+    runtime = Runtime()
+    runtime.warm_up()
     
-    print("=== Job Finished ===")
+    scheduler = AsyncScheduler(state_path=os.path.join(Config.STATE_DIR, "scheduler.json"))
+    scheduler.every(Config.POLL_FAST_MINUTES * 60, "poll_fast", poll_fast, runtime, jitter=Config.POLL_JITTER_SECONDS)
+    scheduler.every(Config.POLL_SLOW_MINUTES * 60, "poll_slow", poll_slow, runtime, jitter=Config.POLL_JITTER_SECONDS)
+    scheduler.daily(Config.DIGEST_AT, "digest", digest, runtime)
+    
+    if run_now:
+        digest(runtime)
+    
+    asyncio.run(scheduler.run_forever())
 
 def main():
+    args = sys.argv[1:]
+    for flag in ("--record", "--replay"):
+        if flag in args:
+            # --record PATH: write every outbound exchange down; --replay PATH: rerun against it, no network
+            import traffic
+            traffic.enable(flag[2:], args[args.index(flag) + 1])
     Config.validate()
-    print("AI News Agent V2 Started. Waiting for schedule (Daily 09:00)...")
     
-    schedule.every().day.at("09:00").do(job)
+    if "--workers" in args:
+        # --workers N: queue mode with N local worker processes (see workers.py)
+        Config.QUEUE_WORKERS = int(args[args.index("--workers") + 1])
     
+    # Queue mode: --run-id ID reruns that run, --resume the newest one whose coordinator never finished.
+    # Either way tasks already done are reused instead of fetched / scored again.
+    run_id = args[args.index("--run-id") + 1] if "--run-id" in args else None
+    if run_id is None and "--resume" in args:
+        from workers import open_queue
+        queue = open_queue()
+        run_id = queue.latest_open_run()
+        queue.close()
+        print(f"Resuming queue run {run_id}" if run_id else "No unfinished queue run to resume: starting a new one")
+
+    if "--profile" in args:
+        run_profiled()
+        return
+
+    if "--daemon" in args:
+        run_daemon(run_now="--run-now" in args)
+        return
+
     # Also run once immediately for testing if argument provided
-    if len(sys.argv) > 1 and (sys.argv[1] == "--run-now" or sys.argv[1] == "--once"):
-        job()
-        if sys.argv[1] == "--once":
+    if "--run-now" in args or "--once" in args:
+        job(run_id=run_id)
+        if "--once" in args:
             return # Exit main, thus exiting the script
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    print(f"AI News Agent V2 Started. Waiting for schedule (Daily {Config.DIGEST_AT})...")
+    scheduler = AsyncScheduler(state_path=os.path.join(Config.STATE_DIR, "scheduler.json"))
+    scheduler.daily(Config.DIGEST_AT, "job", job)
+    asyncio.run(scheduler.run_forever())
 
 if __name__ == "__main__":
     main()
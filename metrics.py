@@ -0,0 +1,15 @@
+from typing import List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100). 0.0 for empty input."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def summarize_latencies(values: List[float]) -> str:
+    return (f"p50 {percentile(values, 50):.2f}s / p95 {percentile(values, 95):.2f}s / "
+            f"p99 {percentile(values, 99):.2f}s (n={len(values)})")
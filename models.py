@@ -0,0 +1,77 @@
+import sys
+import zlib
+from dataclasses import dataclass, field, fields
+from typing import Dict, Optional
+
+from language import detect_lang
+
+
+def normalize_title(title: str) -> str:
+    """Dedup key: case / whitespace-insensitive title."""
+    return (title or "").replace(' ', '').lower()
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """
+    One news item, shared by scrapers -> processor -> notifier.
+    - __slots__: no per-item __dict__ (several days of history fit in memory)
+    - source / category / lang are interned: a handful of distinct strings shared by every item
+    - full article text is kept zlib-compressed and only inflated when read
+    """
+    title: str
+    link: str
+    source: str
+    summary: str = ""
+    published: str = ""
+    category: str = ""
+    score: float = 0 # Keyword score (0 when the scraper doesn't score)
+    lang: str = "" # 'ko' | 'other', detected from the script at ingestion
+
+    # Set by ContentProcessor
+    agent_score: Optional[float] = None
+    agent_reason: str = ""
+    agent_action: str = ""
+    agent_source: str = "" # llm | local | heuristic | safety_net
+    processed_summary: Optional[str] = None
+
+    # Set by CandidatePool (incremental polling)
+    pool_state: str = ""
+    pooled_at: float = 0.0
+
+    _full_text: Optional[bytes] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.title = self.title or ""
+        self.link = self.link or ""
+        self.source = sys.intern(self.source or "")
+        self.category = sys.intern(self.category or "")
+        self.lang = sys.intern(self.lang or detect_lang(self.title, self.summary))
+
+    @property
+    def full_text(self) -> str:
+        if self._full_text is None:
+            return self.summary
+        return zlib.decompress(self._full_text).decode("utf-8")
+
+    @full_text.setter
+    def full_text(self, text: str):
+        self._full_text = zlib.compress(text.encode("utf-8")) if text else None
+
+    def to_dict(self) -> Dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "_full_text"}
+        if self._full_text is not None:
+            data["full_text"] = self.full_text
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NewsItem":
+        known = {f.name for f in fields(cls) if f.name != "_full_text"}
+        kwargs = {k: v for k, v in data.items() if k in known}
+        # Older dicts used both 'published' and 'published_at'
+        if not kwargs.get("published") and data.get("published_at"):
+            kwargs["published"] = data["published_at"]
+        item = cls(**{"title": "", "link": "", "source": "", **kwargs})
+        if data.get("full_text"):
+            item.full_text = data["full_text"]
+        return item
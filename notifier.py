@@ -1,53 +1,109 @@
-import telegram
 import asyncio
-from typing import List, Dict
+import threading
+from typing import List
 from config import Config
+from delivery import DeliveryQueue, split_message
+from models import NewsItem
 import datetime
 
 class TelegramNotifier:
     def __init__(self):
         self.bot_token = Config.TELEGRAM_BOT_TOKEN
-        self.chat_id = Config.TELEGRAM_CHAT_ID
-        self.bot = None
-        if self.bot_token:
-            self.bot = telegram.Bot(token=self.bot_token)
+        self.chat_ids = Config.telegram_chat_ids()
+        self.chat_id = self.chat_ids[0] if self.chat_ids else None # Primary chat (kept for old callers)
+        self._bot = None
+        self._send_lock = threading.Lock() # One event loop at a time may use the bot (see deliver)
+        self.last_delivery = None
 
-    async def send_daily_brief(self, intl_news: List[Dict], domestic_news: List[Dict]):
-        if not self.bot or not self.chat_id:
-            print("Telegram config missing.")
-            return
+    @property
+    def bot(self):
+        # Lazy: python-telegram-bot (+ httpx) is only imported when we actually send
+        if self._bot is None and self.bot_token and Config.TRAFFIC_MODE == "replay":
+            import traffic
+            self._bot = traffic.ReplayBot() # Compares against the recorded messages, sends nothing
+        if self._bot is None and self.bot_token:
+            import telegram
+            from telegram.request import HTTPXRequest
+            # Pool sized for the delivery queue's concurrency (PTB's default is 1 connection)
+            request = HTTPXRequest(connection_pool_size=Config.TELEGRAM_SEND_CONCURRENCY,
+                                   connect_timeout=Config.HTTP_TIMEOUT, read_timeout=Config.HTTP_TIMEOUT)
+            self._bot = telegram.Bot(token=self.bot_token, request=request)
+            if Config.TRAFFIC_MODE:
+                import traffic
+                self._bot = traffic.RecordingBot(self._bot)
+        return self._bot
+
+    def build_brief_chunks(self, intl_news: List[NewsItem], domestic_news: List[NewsItem], title: str = None) -> List[str]:
+        # Header (topic profiles bring their own title)
+        header = f"📢 {title or '오늘의 AI & AX 주요 뉴스'}\n\n"
+        blocks = []
 
-        print("Constructing V2 Daily Brief...")
-        
-        # Header
-        message = "📢 오늘의 AI & AX 주요 뉴스\n\n"
-        
         # International Section
-        message += "🌐 [해외 주요 소식]\n\n"
+        blocks.append("🌐 [해외 주요 소식]\n\n")
         for item in intl_news:
-            summary_block = item.get('processed_summary', '요약 없음')
-            link = item.get('link', '')
-            # The summary block already contains [Translated Title] + 3 bullets
-            # We just need to append the link to the last bullet or simpler:
-            # The prompt format was:
-            # [Title]
-            # - Point 1...
-            # We will append the link at the end.
-            
-            message += f"{summary_block} 🔗 링크: {link}\n\n"
-            
+            summary_block = item.processed_summary or '요약 없음'
+            link = item.link
+            # The summary block already contains [Translated Title] (+ score footer)
+            # We append the link at the end.
+            blocks.append(f"{summary_block} 🔗 링크: {link}\n\n")
+
         # Domestic Section
-        message += "🇰🇷 [국내 주요 소식]\n\n"
+        blocks.append("🇰🇷 [국내 주요 소식]\n\n")
         for item in domestic_news:
-            summary_block = item.get('processed_summary', '요약 없음')
-            link = item.get('link', '')
-            message += f"{summary_block} 🔗 링크: {link}\n\n"
-            
+            summary_block = item.processed_summary or '요약 없음'
+            link = item.link
+            blocks.append(f"{summary_block} 🔗 링크: {link}\n\n")
+
+        # Telegram caps messages at 4096 chars: split between items, never inside one
+        return split_message(header, blocks)
+
+    async def deliver(self, chunks: List[str], chat_ids: List[str] = None):
+        chat_ids = chat_ids or self.chat_ids
+        # `async with` binds the bot's HTTP client to the current event loop (daemon runs use a new loop each time)
+        # and shuts it down on exit. A breaking alert and the digest run their own loops in scheduler threads:
+        # they take turns, so one never closes the client under the other. The lock is only ever taken
+        # on this loop's thread: a cancelled wait leaves it free.
+        while not self._send_lock.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            async with self.bot:
+                queue = DeliveryQueue(self.bot, concurrency=Config.TELEGRAM_SEND_CONCURRENCY)
+                await queue.deliver(chat_ids, chunks)
+        finally:
+            self._send_lock.release()
+        self.last_delivery = queue
+        print(queue.report())
+        return queue
+
+    async def send_daily_brief(self, intl_news: List[NewsItem], domestic_news: List[NewsItem], chat_ids: List[str] = None,
+                               title: str = None) -> bool:
+        """True if the brief reached at least one chat."""
+        if not self.bot or not (chat_ids or self.chat_ids):
+            print("Telegram config missing.")
+            return False
+
+        print("Constructing V2 Daily Brief...")
+        chunks = self.build_brief_chunks(intl_news, domestic_news, title)
+
         # Send
         try:
-            # Telegram has a char limit (4096), but 6 items should fit.
-            # If too long, we might need to split, but assuming it fits for now.
-            await self.bot.send_message(chat_id=self.chat_id, text=message)
-            print("Message sent successfully.")
+            queue = await self.deliver(chunks, chat_ids)
+            if queue.sent:
+                print(f"Message sent successfully ({len(chunks)} part(s) x {len(chat_ids or self.chat_ids)} chat(s)).")
+            return bool(queue.sent)
         except Exception as e:
             print(f"Failed to send message: {e}")
+            return False
+
+    async def send_alert(self, item: NewsItem, chat_ids: List[str] = None):
+        """Breaking news: single item, sent right away instead of waiting for the daily brief."""
+        if not self.bot or not (chat_ids or self.chat_ids):
+            print("Telegram config missing.")
+            return
+
+        summary_block = item.processed_summary or item.title
+        chunks = split_message("🚨 [속보] AI 주요 뉴스\n\n", [f"{summary_block} 🔗 링크: {item.link}"])
+        try:
+            await self.deliver(chunks, chat_ids)
+        except Exception as e:
+            print(f"Failed to send alert: {e}")
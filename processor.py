@@ -1,45 +1,174 @@
-import google.generativeai as genai
-from openai import OpenAI
+import os
 from config import Config
-from typing import Dict, List
+from typing import List
+from models import NewsItem
+from language import KOREAN, tidy_korean_title
 import re
 import time
 import random
 import json
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import profiler
+import deadline
+from hedging import HedgePolicy, PRIMARY, SECONDARY, EFFECTIVE, first_valid
+from llm_budget import BudgetExhausted, estimate_tokens
+from prompts import PromptBuilder, SCORING, TRANSLATION
+from streaming import JsonFieldStream, read_stream
+
+# Google News links; their titles end with " - 매체명"
+GOOGLE_NEWS_PREFIX = "https://news.google.com/"
+
+def _submit(fn, *args) -> Future:
+    """
+    Run one LLM call on a daemon thread of its own. Gemini SDK calls have no reliable client-side timeout:
+    callers stop waiting after LLM_TIMEOUT, and a call hung on its socket must not hold up interpreter exit
+    (ThreadPoolExecutor threads are joined at exit, daemon threads are not).
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm", daemon=True).start()
+    return future
+
+
+def _cancel_stream(response):
+    """Cancel an abandoned Gemini stream (the gRPC / REST iterator under the SDK response) so generation stops."""
+    iterator = getattr(response, "_iterator", None)
+    cancel = getattr(iterator, "cancel", None) or getattr(iterator, "close", None)
+    if cancel:
+        cancel()
 
 class ContentProcessor:
     def __init__(self):
-        self.client = None
-        if Config.GOOGLE_API_KEY:
-            genai.configure(api_key=Config.GOOGLE_API_KEY)
-            self.model = genai.GenerativeModel('gemini-1.5-flash') # Stable version
-        else:
+        # SDK clients are created on first use: importing google.generativeai / openai
+        # costs more than the rest of the app, and many runs never need the fallback.
+        self._model = None
+        self._openai_client = None
+        self._relevance_model = False # Not loaded yet (None = no usable local model)
+        self._budget = None
+        self.prompts = PromptBuilder()
+        self.early_rejects = 0 # Scoring streams cut off once the score was clearly too low
+        # Scoring replies are streamed and often cut after 'score'; translations come back whole:
+        # each kind learns its own hedge delay and has its own cap
+        self.hedges = {task.name: HedgePolicy(Config.LLM_HEDGE_PERCENTILE, Config.LLM_HEDGE_MAX_RATE,
+                                              Config.LLM_HEDGE_MIN_SAMPLES, name=task.name)
+                       for task in (SCORING, TRANSLATION)}
+        if not Config.GOOGLE_API_KEY:
             print("Google API Key missing. Summarization will be skipped/mocked.")
-        
-        # Initialize OpenAI Client (Lazy load or check key)
-        self.openai_client = None
-        if Config.OPENAI_API_KEY:
-            self.openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
 
-    def process_news(self, news_items: List[Dict]) -> List[Dict]:
+    @property
+    def model(self):
+        if self._model is None and Config.GOOGLE_API_KEY:
+            import google.generativeai as genai
+            genai.configure(api_key=Config.GOOGLE_API_KEY)
+            self._model = genai.GenerativeModel('gemini-1.5-flash') # Stable version
+        return self._model
+
+    @property
+    def openai_client(self):
+        if self._openai_client is None and Config.OPENAI_API_KEY:
+            from openai import OpenAI
+            self._openai_client = OpenAI(api_key=Config.OPENAI_API_KEY, timeout=Config.LLM_TIMEOUT, max_retries=1)
+        return self._openai_client
+
+    @property
+    def budget(self):
+        """Per-run / per-day LLM spend (llm_budget.py); start_run() it at the start of each job."""
+        if self._budget is None:
+            from llm_budget import LlmBudget
+            self._budget = LlmBudget()
+        return self._budget
+
+    @property
+    def relevance_model(self):
+        """Local model trained from past agent scores (relevance_model.py), if it passed its held-out check."""
+        if self._relevance_model is False:
+            self._relevance_model = None
+            if os.path.exists(Config.LOCAL_MODEL_PATH):
+                try:
+                    from relevance_model import RelevanceModel
+                    model = RelevanceModel.load(Config.LOCAL_MODEL_PATH)
+                    if model.usable():
+                        self._relevance_model = model
+                    else:
+                        print("Local relevance model below its accuracy bar: LLM scores everything.")
+                except Exception as e:
+                    print(f"Could not load local relevance model: {e}")
+        return self._relevance_model
+
+    def _local_scores(self, news_items: List[NewsItem]):
+        """Batch-score with the local model: {id(item): (probability, predicted score)}."""
+        model = self.relevance_model
+        if model is None or not news_items:
+            return {}
+        with profiler.stage("local.score"):
+            prob, score = model.predict([(i.title, self._clean_text(i.summary)) for i in news_items])
+        return {id(item): (float(p), float(s)) for item, p, s in zip(news_items, prob, score)}
+
+    def _local_decision(self, local):
+        """(score, reason, action) when the local model is confident, else None (ask the LLM)."""
+        if local is None:
+            return None
+        prob, predicted = local
+        from relevance_model import LOCAL_REASON, ACCEPT_SCORE
+        if prob >= Config.LOCAL_MODEL_ACCEPT:
+            return round(max(ACCEPT_SCORE, predicted), 1), f"{LOCAL_REASON} (관련도 {prob:.0%})", "내용 확인 요망"
+        if prob <= Config.LOCAL_MODEL_REJECT:
+            return round(min(ACCEPT_SCORE - 0.1, predicted), 1), f"{LOCAL_REASON} (관련도 {prob:.0%})", "참고"
+        return None
+
+    def _fallback_score(self, title: str, content: str, local):
+        """No LLM scoring (deadline or budget): the local model's prediction even when unsure, else keywords."""
+        if local is not None:
+            from relevance_model import LOCAL_REASON
+            prob, predicted = local
+            return (round(predicted, 1), f"{LOCAL_REASON} (관련도 {prob:.0%}, LLM 생략)", "참고"), "local"
+        return self._heuristic_score(title, content), "heuristic"
+
+    def process_news(self, news_items: List[NewsItem], safety_net: bool = True) -> List[NewsItem]:
         processed = []
+        dl = deadline.current()
+        budget = self.budget
+        local_scores = self._local_scores(news_items) if Config.GOOGLE_API_KEY else {}
+        local_decided = 0
+        untranslated = 0
+        early_rejects = self.early_rejects
         for item in news_items:
             # Skip if API key missing
             if not Config.GOOGLE_API_KEY:
-                item['processed_summary'] = item['summary'][:200]
+                item.processed_summary = item.summary[:200]
                 processed.append(item)
                 continue
             
-            clean_content = self._clean_text(item.get('summary', ''))
+            clean_content = self._clean_text(item.summary)
             
             # --- Scoring Agent Step ---
             try:
-                score, reason, action = self._evaluate_relevance(item['title'], clean_content)
-                item['agent_score'] = score
-                item['agent_reason'] = reason
-                item['agent_action'] = action
+                local = self._local_decision(local_scores.get(id(item)))
+                if local:
+                    (score, reason, action), source = local, "local"
+                else:
+                    with profiler.stage("llm.score"):
+                        if dl.allows("llm_score") and budget.allows("llm_score"):
+                            score, reason, action, source = self._evaluate_relevance(item.title, clean_content)
+                        else:
+                            (score, reason, action), source = self._fallback_score(
+                                item.title, clean_content, local_scores.get(id(item)))
+                item.agent_score = score
+                item.agent_reason = reason
+                item.agent_action = action
+                item.agent_source = source
                 
-                print(f"  > Scoring '{item['title'][:20]}...': {score}/10")
+                local_decided += bool(local)
+                print(f"  > Scoring '{item.title[:20]}...': {score}/10" + (" (local model)" if local else ""))
                 
                 # Filter: Only keep >= 7.0
                 if score < 7.0:
@@ -47,114 +176,109 @@ class ContentProcessor:
                     continue
             except Exception as e:
                 print(f"Scoring failed: {e}. Defaulting to keep.")
-                item['agent_score'] = 0
-                item['agent_reason'] = "평가 실패 (API 오류)"
+                item.agent_score = 0
+                item.agent_reason = "평가 실패 (API 오류)"
+                item.agent_source = "heuristic"
 
             # --- Summarization Step ---
+            # Korean-native items need no translation: tidy the title locally, no LLM call
+            summary_block = self._korean_title(item)
+            untranslated += summary_block is not None
             # Retry logic
-            summary_block = None
-            for attempt in range(4): # 4 attempts
+            for attempt in range(4 if summary_block is None else 0): # 4 attempts
+                if not dl.allows("llm_summary") or not budget.allows("llm_summary"):
+                    break # Title-only fallback below
                 try:
-                    summary_block = self._generate_v2_summary(item['title'], clean_content)
+                    with profiler.stage("llm.summary"):
+                        summary_block = self._generate_v2_summary(item.title, clean_content)
                     break # Success
                 except Exception as e:
-                    print(f"Attempt {attempt+1} failed for '{item['title'][:20]}': {e}")
-                    time.sleep(10 * (attempt + 1)) 
+                    print(f"Attempt {attempt+1} failed for '{item.title[:20]}': {e}")
+                    if not dl.sleep(10 * (attempt + 1)):
+                        break
             
             if not summary_block:
                 # [Graceful Fallback] Title Only
                 last_error = getattr(self, 'last_error', 'Unknown Error')
-                if "Korean" in item.get('source', ''): # If domestic
-                     summary_block = item['title']
+                if item.lang == KOREAN: # If domestic
+                     summary_block = item.title
                 else:
-                     summary_block = f"{item['title']} (번역 실패)"
+                     summary_block = f"{item.title} (번역 실패)"
                 
                 # Append error as debug note? User wants clean output.
                 # summary_block += f"\n[Debug: {last_error}]" 
                 # Let's hide error if user wants clean output, or keep it subtle.
                 pass
 
-            # Add Agent Score Footer (Compact)
-            if 'agent_score' in item and item['agent_score'] > 0:
-                summary_block += f"\n[💡 AI 점수: {item['agent_score']} / {item['agent_reason']}]"
+            # Add Agent Score Footer (Compact); budget spent: titles only
+            if item.agent_score is not None and item.agent_score > 0 and budget.allows("llm"):
+                summary_block += f"\n[💡 AI 점수: {item.agent_score} / {item.agent_reason}]"
 
-            item['processed_summary'] = summary_block
+            item.processed_summary = summary_block
             processed.append(item)
             
             # Safety delay between items
-            time.sleep(5) 
+            dl.sleep(5)
             
+        if local_scores:
+            print(f"  [Local model] {local_decided}/{len(news_items)} item(s) scored without an LLM call")
+        if untranslated:
+            print(f"  [Language] {untranslated} Korean item(s) kept as-is, translation skipped")
+        if self.early_rejects > early_rejects:
+            print(f"  [Streaming] {self.early_rejects - early_rejects} scoring call(s) cut off at "
+                  f"score < {Config.LLM_EARLY_REJECT_BELOW:g}")
+
         # Safety Net: If everything was filtered out, allow the top candidate from original input
-        if not processed and news_items:
+        if safety_net and not processed and news_items:
             print("⚠️ All items filtered by Agent. Using Safety Net (Top 1).")
-            rescue_item = news_items[0]
-            # Mock agent score for rescue
-            if 'agent_score' not in rescue_item:
-                rescue_item['agent_score'] = 7.0
-                rescue_item['agent_reason'] = "구조된 뉴스 (Safety Net)"
-            
-            clean_content = self._clean_text(rescue_item.get('summary', ''))
-            rescue_item['processed_summary'] = self._generate_v2_summary(rescue_item['title'], clean_content) + \
-                                               f"\n\n[🤖 에이전트 판단: {rescue_item['agent_score']}점 / {(rescue_item['agent_reason'])}]"
-            processed.append(rescue_item)
+            processed.append(self.rescue(news_items[0]))
 
         return processed
 
-    def _evaluate_relevance(self, title: str, content: str) -> (float, str, str):
+    def rescue(self, rescue_item: NewsItem) -> NewsItem:
+        """Safety Net: summarize a rejected (or unscored) item anyway, with the agent's verdict attached."""
+        if rescue_item.processed_summary:
+            return rescue_item # Already summarized (e.g. rescued for another profile's brief)
+        # Mock agent score for rescue
+        if rescue_item.agent_score is None:
+            rescue_item.agent_score = 7.0
+            rescue_item.agent_reason = "구조된 뉴스 (Safety Net)"
+            rescue_item.agent_source = "safety_net"
+        
+        clean_content = self._clean_text(rescue_item.summary)
+        rescue_summary = self._korean_title(rescue_item)
+        if rescue_summary is None and deadline.current().allows("llm_summary") and self.budget.allows("llm_summary"):
+            rescue_summary = self._generate_v2_summary(rescue_item.title, clean_content)
+        rescue_item.processed_summary = (rescue_summary or rescue_item.title) + \
+                                        f"\n\n[🤖 에이전트 판단: {rescue_item.agent_score}점 / {(rescue_item.agent_reason)}]"
+        return rescue_item
+
+    def _korean_title(self, item: NewsItem):
+        """Title for Korean-native items (no translation needed); None = foreign, translate it."""
+        if item.lang != KOREAN:
+            return None
+        return tidy_korean_title(item.title, strip_outlet=item.link.startswith(GOOGLE_NEWS_PREFIX))
+
+    def _evaluate_relevance(self, title: str, content: str) -> (float, str, str, str):
         """
         V4 Scoring Agent v3.0: AX Implementation Lead Persona
-        Returns: (Score, Reason, Action Item)
-        """
-        prompt = f"""
-        # AI/AX News Scoring Prompt v3.0
-        
-        ## Role
-        You are an **AX (AI Transformation) Lead** at a large enterprise.
-        
-        ## Task
-        Score this news article based on: **"Will this help me do my AX job better TODAY or THIS WEEK?"**
-        
-        ## News
-        Title: {title}
-        Content: {content}
-
-        ## Evaluation Criteria (0-10 scale)
-
-        ### 🛠️ TIER 1: Tool/Product Updates (Most Important)
-        **10 points - MUST READ:** Major model releases (GPT-5, Claude Opus), Significant feature updates, Critical issues.
-        **7 points - IMPORTANT:** Minor updates, Benchmarks, Pricing changes.
-        **Specific Tool Checklist:** Claude, OpenAI, Cursor, Windsurf, n8n, Zapier, Microsoft Copilot. (If YES -> +3 points)
-
-        ### 🏢 TIER 2: Enterprise Implementation
-        **10 points - MUST READ:** Specific metrics (ROI, time saved), Detailed process.
-        **7 points - IMPORTANT:** Case study with clear methodology, C-level strategy.
-        **Examples:** "Time saved 40%", "Cost reduction"
-
-        ### 📊 TIER 3: Industry Insights
-        **10 points:** Analyst reports (Gartner) with data, ROI studies.
-        **7 points:** Expert analysis, Regulatory updates.
-
-        ## RED FLAGS (Auto-reject 0 points)
-        - No mention of specific tools/companies
-        - Abstract future predictions / Ethics debates
-        - General hiring/stock news
-
-        ## Output Format (JSON)
-        {{
-          "score": 8.5,
-          "category": "TOOL_UPDATE | CASE_STUDY | INSIGHT",
-          "relevance": "HIGH | MEDIUM | LOW",
-          "reason": "[1-line Korean summary of why this matters for AX practitioners]",
-          "action_item": "[What you can do with this info: e.g., '팀 미팅에서 도구 전환 검토 필요']",
-          "decision": "ACCEPT | REJECT"
-        }}
+        Returns: (Score, Reason, Action Item, Source) - source 'llm', or 'heuristic' when the LLM failed
         """
+        prompt = self.prompts.build(SCORING, title, content)
         
         try:
-            # Call Robust Generation
-            text = self._generate_content_robust(prompt)
+            # Call Robust Generation (streamed: a clearly failing score ends the call early)
+            text = self._generate_content_robust(prompt, stop=self._early_reject, valid=self._valid_score,
+                                                 task=SCORING.name)
             print(f"Debug Raw Text: {text[:100]}...") # Debug log
 
+            parsed = JsonFieldStream()
+            parsed.feed(text)
+            if not parsed.closed and self._early_reject(parsed.fields):
+                self.early_rejects += 1
+                score = float(parsed.fields["score"])
+                return score, f"조기 판정: {score}점 (응답 중단)", "참고", "llm"
+
             # Robust JSON Extraction
             # Find the substring that looks like a JSON object: { ... }
             json_match = re.search(r'(\{.*\})', text, re.DOTALL)
@@ -172,18 +296,35 @@ class ContentProcessor:
                 print(f"⚠️ No JSON found in response. Text: {text[:50]}...")
                 # Trigger heuristic instead of raising generic error
                 h_score, h_reason, h_action = self._heuristic_score(title, content)
-                return h_score, h_reason, h_action
+                return h_score, h_reason, h_action, "heuristic"
             
             score = float(data.get('score', 0))
             reason = data.get('reason', "판단 근거 없음")
             action = data.get('action_item', "참고")
             
-            return score, reason, action
+            return score, reason, action, "llm"
 
         except Exception as e:
             print(f"Scoring Error: {e} | Fallback to Heuristic")
             h_score, h_reason, h_action = self._heuristic_score(title, content)
-            return h_score, h_reason, h_action
+            return h_score, h_reason, h_action, "heuristic"
+
+    @staticmethod
+    def _valid_score(text: str) -> bool:
+        """A scoring reply worth winning a hedge race: its JSON has a numeric score (complete or cut early)."""
+        score = JsonFieldStream().feed(text or "").get("score")
+        return isinstance(score, (int, float)) and not isinstance(score, bool)
+
+    @staticmethod
+    def _valid_text(text: str) -> bool:
+        return bool(text and text.strip())
+
+    @staticmethod
+    def _early_reject(fields) -> bool:
+        """Stop streaming once 'score' is in and clearly below the 7.0 cut (borderline ones keep their reason)."""
+        score = fields.get("score")
+        return (isinstance(score, (int, float)) and not isinstance(score, bool)
+                and score < Config.LLM_EARLY_REJECT_BELOW)
 
     def _heuristic_score(self, title: str, content: str) -> (float, str, str):
         """
@@ -210,19 +351,20 @@ class ContentProcessor:
         text = re.sub('<[^<]+?>', '', text)
         return text.strip()
 
-    def _generate_content_robust(self, prompt: str) -> str:
+    def _generate_content_robust(self, prompt: str, stop=None, valid=None, task: str = SCORING.name) -> str:
         """
         Try Gemini (with retries) -> If 429/Exhausted -> Try OpenAI
+        stop(fields) streams the reply and ends it as soon as the JSON fields so far are enough.
+        valid(text) decides which reply wins when a call is hedged; task picks the hedge policy.
         """
+        dl = deadline.current()
         # 1. Try Gemini with Retries
         if self.model:
             for attempt in range(3): # Try 3 times
                 try:
-                    response = self.model.generate_content(prompt)
-                    # Check if response was blocked
-                    if response.prompt_feedback and response.prompt_feedback.block_reason:
-                        raise Exception(f"Blocked by Gemini: {response.prompt_feedback.block_reason}")
-                    return response.text.strip()
+                    return self._call_gemini(prompt, stop, valid, task)
+                except BudgetExhausted:
+                    raise
                 except Exception as e:
                     error_str = str(e)
                     # If it's the last attempt, check if we should fallback
@@ -233,100 +375,136 @@ class ContentProcessor:
                     # If quota related, wait and retry
                     if "429" in error_str or "ResourceExhausted" in error_str:
                         print(f"⚠️ Gemini Rate Limit (Attempt {attempt+1}/3). Waiting 20s...")
-                        time.sleep(20)
+                        waited = dl.sleep(20)
                     else:
                         print(f"⚠️ Gemini Error (Attempt {attempt+1}/3): {e}. Waiting 5s...")
-                        time.sleep(5)
+                        waited = dl.sleep(5)
+                    if not waited:
+                        print("⏱️ No time left for Gemini retries.")
+                        break
 
         # 2. Fallback to OpenAI
         print("🔄 Switching to OpenAI Fallback...")
-        return self._call_openai_fallback(prompt)
+        return self._call_openai_fallback(prompt, stop, task)
+
+    def _call_gemini(self, prompt: str, stop=None, valid=None, task: str = SCORING.name) -> str:
+        """
+        One Gemini call, bounded by LLM_TIMEOUT. With hedging on, a call still running past the
+        learned latency percentile (of this task's calls) is also sent to OpenAI: the first answer
+        passing valid(text) wins.
+        """
+        dl = deadline.current()
+        hedge = self.hedges[task]
+        timeout = dl.timeout(Config.LLM_TIMEOUT)
+        start = time.perf_counter()
+        primary = _submit(self._timed, self.budget.reserve(PRIMARY, prompt), self._gemini_text, prompt, stop, hedge)
+        delay = hedge.delay() if self.openai_client else None
+        try:
+            text = primary.result(timeout=timeout if delay is None else min(delay, timeout))
+        except FutureTimeout:
+            waited = time.perf_counter() - start
+            # Hedging is the first extra spend to go when the budget gets tight
+            if delay is None or waited >= timeout or not self.budget.allows("llm_score") or not hedge.take_hedge():
+                text = primary.result(timeout=max(0.0, timeout - waited))
+            else:
+                print(f"⏩ Gemini {task} slower than its p{hedge.pct:g} ({delay:.1f}s): hedging with OpenAI")
+                secondary = _submit(self._timed, self.budget.reserve(SECONDARY, prompt), self._openai_text,
+                                    prompt, stop, hedge)
+                winner, text = first_valid([primary, secondary], timeout - waited, valid)
+                hedge.count_win(winner == 1)
+        hedge.record(EFFECTIVE, time.perf_counter() - start)
+        return text
+
+    def _timed(self, ticket, call, prompt: str, stop=None, hedge: HedgePolicy = None) -> str:
+        """Run one provider call: latency for hedging (the task's policy), tokens for the budget."""
+        start = time.perf_counter()
+        try:
+            if Config.TRAFFIC_MODE:
+                import traffic
+                text, usage = traffic.llm_call(ticket.provider, prompt, stop, lambda: call(prompt, stop))
+            else:
+                text, usage = call(prompt, stop)
+        except Exception:
+            self.budget.record(ticket, failed=True)
+            raise
+        if hedge is not None:
+            hedge.record(ticket.provider, time.perf_counter() - start) # Successful calls only
+        self.budget.record(ticket, usage)
+        return text
+
+    def _gemini_text(self, prompt: str, stop=None):
+        """(text, (prompt tokens, output tokens) or None). Streamed when there is a stop condition."""
+        if stop is None:
+            response = self.model.generate_content(prompt)
+        else:
+            response = self.model.generate_content(prompt, stream=True)
+            text, stopped = read_stream((chunk.text for chunk in response), stop)
+            if stopped:
+                _cancel_stream(response)
+                # Abandoned mid-stream: no usage report, so estimate both sides as _openai_stream does
+                return text.strip(), (estimate_tokens(prompt), estimate_tokens(text))
+        # Check if response was blocked
+        if response.prompt_feedback and response.prompt_feedback.block_reason:
+            raise Exception(f"Blocked by Gemini: {response.prompt_feedback.block_reason}")
+        meta = getattr(response, "usage_metadata", None)
+        usage = (meta.prompt_token_count, meta.candidates_token_count) if meta else None
+        return (response.text if stop is None else text).strip(), usage
+
+    def _openai_text(self, prompt: str, stop=None):
+        if stop is not None:
+            return self._openai_stream(prompt, stop)
+        response = self.openai_client.chat.completions.create(
+            model="gpt-4o-mini", # Cost efficient
+            messages=[
+                {"role": "system", "content": "You are a helpful AI news assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1000,
+            timeout=deadline.current().timeout(Config.LLM_TIMEOUT)
+        )
+        usage = (response.usage.prompt_tokens, response.usage.completion_tokens) if response.usage else None
+        return response.choices[0].message.content.strip(), usage
+
+    def _openai_stream(self, prompt: str, stop):
+        stream = self.openai_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful AI news assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1000,
+            timeout=deadline.current().timeout(Config.LLM_TIMEOUT),
+            stream=True # openai 1.12: no stream_options / chunk.usage, so usage is estimated below
+        )
+
+        def pieces():
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        try:
+            text, _ = read_stream(pieces(), stop)
+        finally:
+            stream.close() # Early stop: drops the connection, the rest is never generated
+        return text.strip(), (estimate_tokens(prompt), estimate_tokens(text))
 
-    def _call_openai_fallback(self, prompt: str) -> str:
+    def _call_openai_fallback(self, prompt: str, stop=None, task: str = SCORING.name) -> str:
         if not self.openai_client:
             print("❌ OpenAI Key missing. Cannot fallback.")
             raise Exception("All LLMs failed & no fallback key.")
             
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini", # Cost efficient
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI news assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000
-            )
-            return response.choices[0].message.content.strip()
+            return self._timed(self.budget.reserve(SECONDARY, prompt), self._openai_text, prompt, stop,
+                               self.hedges[task])
         except Exception as e:
             print(f"❌ OpenAI Fallback failed: {e}")
             raise e
 
     def _generate_v2_summary(self, title: str, content: str) -> str:
-        prompt = f"""
-        # Complete Translation & Summary Prompt v3.0
-
-        ## Role
-        You are a **Professional Tech News Editor** for Korean AX practitioners.
-
-        ## Your Mission
-        Transform English tech news into **natural Korean** that reads like it was originally written by a Korean tech journalist at 테크크런치 or 블로터.
-
-        ## Input
-        Title: {title}
-        Content: {content}
-
-        ---
-
-        ## CRITICAL RULES
-
-        ### Language
-        - **ALL output must be in Korean**
-        - NO English except:
-          - Product names (Claude, GPT-4, Cursor)
-          - Well-known acronyms (LLM, ROI, API, SaaS)
-          - Company names when commonly written in English (OpenAI, Microsoft)
-
-        ### Translation Quality Standards
-
-        **1. Natural Korean (자연스러운 한국어)**
-        ❌ "~입니다", "~되었습니다" (formal written)
-        ✅ "~임", "~됨" or 체언종결 (professional brief)
-
-        ❌ "~것으로 나타났다", "~라고 발표했다"
-        ✅ Direct statement (불필요한 인용 구조 제거)
-
-        **2. Technical Terms (Consistency Table)**
-        | English | Korean (USE) | 금지어 |
-        |---------|--------------|--------|
-        | AI Agent | AI 에이전트 | AI 에이전트들, 에이전트 솔루션 |
-        | Implementation | 도입, 적용 | 구현, 이행 |
-        | Workflow | 워크플로 | 작업 흐름, 업무 흐름 |
-        | Case Study | 사례 | 케이스 스터디 |
-        | ROI | ROI | 투자수익률 |
-        | Deploy | 배포 | 디플로이 |
-        | Enterprise | 기업, 엔터프라이즈 | 엔터프라이즈급 |
-
-        **3. Numbers & Metrics**
-        - Percentage: 50% (no space)
-        - Money: 1,000만 달러, 100억 원
-        - Time: 3개월, 2주, 6시간
-        - Dates: 2024년 3분기, 2025년 2월
-
-        ---
-
-        ## Output Format
-        Just the **Korean Translated Title**.
-        - Do NOT include original English title.
-        - Do NOT add bullets or summary.
-        - Do NOT add "Title:" prefix.
-        - Keep it under 80 characters.
-        """
+        prompt = self.prompts.build(TRANSLATION, title, content)
         
         try:
-            # For domestic news, if it's alread Korean, just return it? 
-            # But the input 'content' might be English for international.
-            # We rely on the LLM to detect.
-             return self._generate_content_robust(prompt)
+            # Korean-native items never get here (see _korean_title): this is translation only
+            return self._generate_content_robust(prompt, valid=self._valid_text, task=TRANSLATION.name)
         except Exception as e:
             self.last_error = str(e) # Store error for debugging
             print(f"Summary generation failed: {e}")
@@ -0,0 +1,151 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import datetime
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Active profiler (None when not profiling -> stage() is a no-op)
+_active = None
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Tag a pipeline stage. Cheap no-op unless a PipelineProfiler is running.
+    Stages nest: 'fetch_intl' > 'rss.parse_feed' > ...
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+class PipelineProfiler:
+    """
+    Runs a job under cProfile + a stack sampler.
+    - cProfile -> top-N hot function table
+    - Sampler  -> collapsed stacks (stage;module:func;... count) for flamegraph.pl / speedscope
+    - stage()  -> per-stage wall & CPU breakdown
+    """
+
+    def __init__(self, interval: float = 0.005, top_n: int = 25):
+        self.interval = interval
+        self.top_n = top_n
+        self.samples = Counter()
+        self.stage_wall = defaultdict(float)
+        self.stage_cpu = defaultdict(float)
+        self.stage_calls = Counter()
+        self.stage_order: List[str] = []
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+
+        self._stacks: Dict[int, List[str]] = defaultdict(list)  # thread id -> stage stack
+        self._profile = cProfile.Profile()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @contextmanager
+    def stage(self, name: str):
+        tid = threading.get_ident()
+        stack = self._stacks[tid]
+        stack.append(name)
+        path = "/".join(stack)
+        if path not in self.stage_wall:
+            self.stage_order.append(path)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.stage_wall[path] += time.perf_counter() - wall_start
+            self.stage_cpu[path] += time.process_time() - cpu_start
+            self.stage_calls[path] += 1
+            stack.pop()
+
+    def run(self, func, *args, **kwargs):
+        global _active
+        _active = self
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        self._profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._profile.disable()
+            self.total_wall = time.perf_counter() - wall_start
+            self.total_cpu = time.process_time() - cpu_start
+            self._stop.set()
+            self._sampler.join()
+            _active = None
+
+    def _sample_loop(self):
+        sampler_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == sampler_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                    frames.append(f"{module}:{code.co_name}")
+                    frame = frame.f_back
+                frames.reverse()
+                tags = self._stacks.get(tid) or ["untagged"]
+                key = ";".join(tags + frames)
+                self.samples[key] += 1
+
+    # --- Output ---
+
+    def collapsed_stacks(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def stage_table(self) -> str:
+        lines = [f"{'stage':<40} {'calls':>5} {'wall(s)':>9} {'cpu(s)':>9} {'wall%':>6}"]
+        for path in self.stage_order:
+            wall = self.stage_wall[path]
+            pct = (wall / self.total_wall * 100) if self.total_wall else 0
+            lines.append(f"{path:<40} {self.stage_calls[path]:>5} {wall:>9.3f} {self.stage_cpu[path]:>9.3f} {pct:>5.1f}%")
+        lines.append(f"{'TOTAL':<40} {'':>5} {self.total_wall:>9.3f} {self.total_cpu:>9.3f}")
+        return "\n".join(lines)
+
+    def hot_functions(self, sort_key: str = "tottime") -> str:
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.strip_dirs().sort_stats(sort_key).print_stats(self.top_n)
+        return out.getvalue()
+
+    def report(self) -> str:
+        return "\n".join([
+            "=== Stage Breakdown ===",
+            self.stage_table(),
+            "",
+            f"=== Top {self.top_n} Hot Functions (self time) ===",
+            self.hot_functions("tottime"),
+            f"=== Top {self.top_n} Hot Functions (cumulative) ===",
+            self.hot_functions("cumulative"),
+        ])
+
+    def write(self, out_dir: str) -> str:
+        run_dir = os.path.join(out_dir, datetime.datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(run_dir, exist_ok=True)
+
+        with open(os.path.join(run_dir, "stacks.collapsed"), "w", encoding="utf-8") as f:
+            f.write(self.collapsed_stacks() + "\n")
+        with open(os.path.join(run_dir, "report.txt"), "w", encoding="utf-8") as f:
+            f.write(self.report())
+        self._profile.dump_stats(os.path.join(run_dir, "job.pstats"))
+        return run_dir
@@ -0,0 +1,165 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config import Config
+
+DEFAULT = "default"
+MIN_SCORE = 2 # Tier C minimum: the same bar the scrapers use
+REJECT_SCORE = -99
+
+
+@dataclass
+class TopicProfile:
+    """
+    One team's digest: what counts as relevant, what to drop and who receives it.
+    keywords=None means the built-in keyword tiers (the score the scrapers already computed).
+    """
+    name: str
+    title: str = "" # Brief header (default: the standard one)
+    chat_ids: List[str] = field(default_factory=list)
+    keywords: Optional[Dict[str, float]] = None # term -> weight (case-insensitive, domestic scorer's word boundaries)
+    exclude: List[str] = field(default_factory=list) # Any of these terms rejects the item
+    reject_patterns: List[str] = field(default_factory=list) # Regexes on the title, reject on match
+    naver_queries: List[str] = field(default_factory=list) # Extra Naver searches (fetched once for all profiles)
+    top_n: int = 3 # Items per section in the brief
+    candidates: int = 6 # Items per section sent to the agent
+    global_history: bool = field(default=False, init=False) # Only the no-profiles-file default brief
+
+    @property
+    def archive_key(self) -> Optional[str]:
+        # The single built-in brief keeps the archive's global delivery history; with a profiles
+        # file every profile, 'default' included, has its own (one team's brief never hides an item from another)
+        return None if self.global_history else self.name
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TopicProfile":
+        profile = cls(**data)
+        for pattern in profile.reject_patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Profile '{profile.name}': bad reject pattern {pattern!r} ({e})")
+        if not profile.chat_ids:
+            profile.chat_ids = Config.telegram_chat_ids()
+        return profile
+
+
+def load_profiles(path: str = None) -> List[TopicProfile]:
+    """
+    Profiles from a JSON file ({"profiles": [{...}, ...]}).
+    No file: the single default profile, i.e. the usual brief to TELEGRAM_CHAT_ID(S).
+    """
+    path = path or Config.PROFILES_PATH
+    if not path or not os.path.exists(path):
+        profile = TopicProfile(DEFAULT, chat_ids=Config.telegram_chat_ids())
+        profile.global_history = True
+        return [profile]
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    profiles = [TopicProfile.from_dict(p) for p in data.get("profiles", [])]
+    names = [p.name for p in profiles]
+    if not profiles or len(set(names)) != len(names):
+        raise ValueError(f"{path}: need at least one profile, with unique names ({names})")
+    return profiles
+
+
+def shared_naver_queries(profiles: List[TopicProfile]):
+    """
+    (queries, excludes) for the one shared Naver pass: the union of every profile's queries,
+    and only the exclude terms all profiles agree on (anything else is filtered per profile).
+    """
+    from scrapers.api_scraper import NAVER_QUERIES
+
+    queries = list(dict.fromkeys(q for p in profiles for q in p.naver_queries))
+    default_excludes = [t.lstrip("-") for t in NAVER_QUERIES["exclude"]]
+    common = None
+    for p in profiles:
+        terms = set(p.exclude if p.keywords is not None else default_excludes)
+        common = terms if common is None else common & terms
+    common = common or set()
+    return queries, [t for t in default_excludes if t in common] + sorted(common - set(default_excludes))
+
+
+class ProfileMatrix:
+    """
+    Scores a batch of items for every profile at once.
+    Each distinct term / reject pattern is checked once per item, whatever the number of
+    profiles using it: hits (items x terms) @ weights (terms x profiles) -> scores (items x profiles).
+    Terms match with the domestic scorer's word boundaries ('ai' is not in 'said'), all of them
+    in one regex pass over the text.
+    """
+
+    def __init__(self, profiles: List[TopicProfile]):
+        import numpy as np
+        from scrapers.domestic_scoring import term_key, term_pattern
+
+        self.profiles = profiles
+        self.terms = sorted({t.lower() for p in profiles if p.keywords is not None
+                             for t in list(p.keywords) + p.exclude if t.strip()})
+        self._term_key = term_key
+        self._keys = [term_key(t) for t in self.terms]
+        # Zero-width: every start position is tried, so a term inside a longer one still counts on its own
+        by_length = sorted(self.terms, key=len, reverse=True)
+        self._terms_rx = re.compile("(?=(" + "|".join(term_pattern(t) for t in by_length) + "))",
+                                    re.IGNORECASE) if self.terms else None
+        self._term_rxs = [re.compile(term_pattern(t), re.IGNORECASE) for t in self.terms]
+        self._same_start = {} # matched key -> terms that may also start there ('cursor' under 'cursor ai')
+        self.patterns = sorted({pat for p in profiles for pat in p.reject_patterns})
+        self._compiled = [re.compile(pat, re.IGNORECASE) for pat in self.patterns]
+        term_index = {t: k for k, t in enumerate(self.terms)}
+        pattern_index = {pat: k for k, pat in enumerate(self.patterns)}
+
+        n = len(profiles)
+        self.weights = np.zeros((len(self.terms), n), dtype=np.float32)
+        self.excludes = np.zeros((len(self.terms), n), dtype=np.float32)
+        self.rejects = np.zeros((len(self.patterns), n), dtype=np.float32)
+        self.builtin = np.array([p.keywords is None for p in profiles])
+        for j, p in enumerate(profiles):
+            for term, weight in (p.keywords or {}).items():
+                self.weights[term_index[term.lower()], j] += weight
+            for term in p.exclude:
+                self.excludes[term_index[term.lower()], j] = 1
+            for pat in p.reject_patterns:
+                self.rejects[pattern_index[pat], j] = 1
+
+    def _hits(self, text: str) -> List[bool]:
+        """Which terms occur in `text`."""
+        found = [False] * len(self.terms)
+        for match in self._terms_rx.finditer(text) if self._terms_rx else ():
+            key = self._term_key(match.group(1))
+            if key not in self._same_start:
+                self._same_start[key] = [k for k, other in enumerate(self._keys) if key.startswith(other)]
+            for k in self._same_start[key]:
+                # The alternation reports the longest term here; shorter ones starting at the same spot get their own check
+                if not found[k] and (self._keys[k] == key or self._term_rxs[k].match(text, match.start())):
+                    found[k] = True
+        return found
+
+    def score(self, items):
+        """(items x profiles) score matrix; REJECT_SCORE where a profile rejects the item."""
+        import numpy as np
+
+        hits = np.array([self._hits(i.title + " " + i.summary) for i in items],
+                        dtype=np.float32).reshape(len(items), len(self.terms))
+        title_hits = np.array([[bool(rx.search(i.title)) for rx in self._compiled] for i in items],
+                              dtype=np.float32).reshape(len(items), len(self.patterns))
+        builtin = np.array([i.score for i in items], dtype=np.float32)
+        scores = np.where(self.builtin, builtin[:, None], hits @ self.weights)
+        rejected = (hits @ self.excludes + title_hits @ self.rejects) > 0
+        return np.where(rejected | (scores < 0), REJECT_SCORE, scores)
+
+    def ranked(self, items, scores) -> Dict[str, List]:
+        """profile name -> its items that pass, best first."""
+        import numpy as np
+
+        out = {}
+        for j, p in enumerate(self.profiles):
+            column = scores[:, j]
+            # Built-in scores were already thresholded by the scrapers (below the bar = -99)
+            floor = 0 if p.keywords is None else MIN_SCORE
+            order = np.argsort(-column, kind="stable")
+            out[p.name] = [items[k] for k in order if column[k] >= floor]
+        return out
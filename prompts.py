@@ -0,0 +1,218 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from config import Config
+from llm_budget import estimate_tokens
+
+_SLOT = re.compile(r"\{(\w+)\}") # {title}; JSON examples like {\n "score": ...} are left alone
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\s*\n+\s*")
+_WORD = re.compile(r"[0-9A-Za-z가-힣][0-9A-Za-z가-힣.+-]*")
+
+# Sentences mentioning these are kept first when content has to be cut (the scoring rubric's signals)
+FOCUS_KEYWORDS = (
+    "claude", "gpt", "gemini", "openai", "anthropic", "cursor", "windsurf", "copilot", "n8n", "zapier", "agent",
+    "model", "launch", "release", "pricing", "benchmark", "enterprise", "roi", "workflow", "automation", "%",
+    "출시", "공개", "도입", "사례", "자동화", "에이전트", "기업", "업데이트", "요금", "성과", "절감",
+)
+
+
+class PromptTemplate:
+    """
+    A prompt's static text, split around its {slots} once at import: rendering is a join, and the
+    static part's token count is known up front. content_tokens caps what {content} may add.
+    """
+
+    def __init__(self, name: str, text: str, content_tokens: int):
+        self.name = name
+        parts = _SLOT.split(text)
+        self._static, self._slots = parts[0::2], parts[1::2]
+        self.content_tokens = content_tokens
+        self.static_tokens = estimate_tokens("".join(self._static))
+
+    def render(self, **values) -> str:
+        out = [self._static[0]]
+        for slot, static in zip(self._slots, self._static[1:]):
+            out.append(values[slot])
+            out.append(static)
+        return "".join(out)
+
+
+SCORING = PromptTemplate("score", """\
+# AI/AX News Scoring Prompt v3.0
+
+## Role
+You are an **AX (AI Transformation) Lead** at a large enterprise.
+
+## Task
+Score this news article based on: **"Will this help me do my AX job better TODAY or THIS WEEK?"**
+
+## News
+Title: {title}
+Content: {content}
+
+## Evaluation Criteria (0-10 scale)
+
+### 🛠️ TIER 1: Tool/Product Updates (Most Important)
+**10 points - MUST READ:** Major model releases (GPT-5, Claude Opus), Significant feature updates, Critical issues.
+**7 points - IMPORTANT:** Minor updates, Benchmarks, Pricing changes.
+**Specific Tool Checklist:** Claude, OpenAI, Cursor, Windsurf, n8n, Zapier, Microsoft Copilot. (If YES -> +3 points)
+
+### 🏢 TIER 2: Enterprise Implementation
+**10 points - MUST READ:** Specific metrics (ROI, time saved), Detailed process.
+**7 points - IMPORTANT:** Case study with clear methodology, C-level strategy.
+**Examples:** "Time saved 40%", "Cost reduction"
+
+### 📊 TIER 3: Industry Insights
+**10 points:** Analyst reports (Gartner) with data, ROI studies.
+**7 points:** Expert analysis, Regulatory updates.
+
+## RED FLAGS (Auto-reject 0 points)
+- No mention of specific tools/companies
+- Abstract future predictions / Ethics debates
+- General hiring/stock news
+
+## Output Format (JSON)
+{
+  "score": 8.5,
+  "category": "TOOL_UPDATE | CASE_STUDY | INSIGHT",
+  "relevance": "HIGH | MEDIUM | LOW",
+  "reason": "[1-line Korean summary of why this matters for AX practitioners]",
+  "action_item": "[What you can do with this info: e.g., '팀 미팅에서 도구 전환 검토 필요']",
+  "decision": "ACCEPT | REJECT"
+}""", Config.PROMPT_SCORE_CONTENT_TOKENS)
+
+TRANSLATION = PromptTemplate("translate", """\
+# Complete Translation & Summary Prompt v3.0
+
+## Role
+You are a **Professional Tech News Editor** for Korean AX practitioners.
+
+## Your Mission
+Transform English tech news into **natural Korean** that reads like it was originally written by a Korean tech journalist at 테크크런치 or 블로터.
+
+## Input
+Title: {title}
+Content: {content}
+
+---
+
+## CRITICAL RULES
+
+### Language
+- **ALL output must be in Korean**
+- NO English except:
+  - Product names (Claude, GPT-4, Cursor)
+  - Well-known acronyms (LLM, ROI, API, SaaS)
+  - Company names when commonly written in English (OpenAI, Microsoft)
+
+### Translation Quality Standards
+
+**1. Natural Korean (자연스러운 한국어)**
+❌ "~입니다", "~되었습니다" (formal written)
+✅ "~임", "~됨" or 체언종결 (professional brief)
+
+❌ "~것으로 나타났다", "~라고 발표했다"
+✅ Direct statement (불필요한 인용 구조 제거)
+
+**2. Technical Terms (Consistency Table)**
+| English | Korean (USE) | 금지어 |
+|---------|--------------|--------|
+| AI Agent | AI 에이전트 | AI 에이전트들, 에이전트 솔루션 |
+| Implementation | 도입, 적용 | 구현, 이행 |
+| Workflow | 워크플로 | 작업 흐름, 업무 흐름 |
+| Case Study | 사례 | 케이스 스터디 |
+| ROI | ROI | 투자수익률 |
+| Deploy | 배포 | 디플로이 |
+| Enterprise | 기업, 엔터프라이즈 | 엔터프라이즈급 |
+
+**3. Numbers & Metrics**
+- Percentage: 50% (no space)
+- Money: 1,000만 달러, 100억 원
+- Time: 3개월, 2주, 6시간
+- Dates: 2024년 3분기, 2025년 2월
+
+---
+
+## Output Format
+Just the **Korean Translated Title**.
+- Do NOT include original English title.
+- Do NOT add bullets or summary.
+- Do NOT add "Title:" prefix.
+- Keep it under 80 characters.""", Config.PROMPT_TRANSLATE_CONTENT_TOKENS)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    while text and estimate_tokens(text) > max_tokens:
+        text = text[:int(len(text) * 0.9)]
+    return text.rstrip() + "…"
+
+
+def fit_content(content: str, max_tokens: int, title: str = "", keywords: Iterable[str] = FOCUS_KEYWORDS) -> str:
+    """
+    Article text cut to max_tokens: the lead sentences (up to half the budget: news puts what
+    happened first), then the sentences with the most title words / focus keywords, in article order.
+    """
+    content = (content or "").strip()
+    if estimate_tokens(content) <= max_tokens:
+        return content
+    sentences = [s for s in _SENTENCE_END.split(content) if s]
+    cost = [estimate_tokens(s) for s in sentences]
+    terms = {w.lower() for w in _WORD.findall(title or "") if len(w) >= 2} | set(keywords)
+
+    chosen, used = set(), 0
+    for i, tokens in enumerate(cost):
+        if used + tokens > max_tokens // 2:
+            break
+        chosen.add(i)
+        used += tokens
+    if not chosen: # No sentence breaks in the lead (one long blob): its beginning then
+        return _truncate(content, max_tokens)
+
+    lowered = [s.lower() for s in sentences]
+    hits = {i: sum(term in lowered[i] for term in terms) for i in range(len(sentences)) if i not in chosen}
+    for i in sorted(hits, key=lambda i: (-hits[i], i)):
+        if hits[i] == 0:
+            break
+        if used + cost[i] <= max_tokens:
+            chosen.add(i)
+            used += cost[i]
+
+    out, previous = [], -1
+    for i in sorted(chosen):
+        if previous >= 0 and i != previous + 1:
+            out.append("…")
+        out.append(sentences[i])
+        previous = i
+    return " ".join(out)
+
+
+class PromptBuilder:
+    """Renders the precompiled templates with content fitted to each task's budget, and counts prompt tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # template -> [prompts, prompt tokens, trimmed, content tokens in, content tokens kept]
+        self.stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0, 0])
+
+    def build(self, template: PromptTemplate, title: str, content: str) -> str:
+        fitted = fit_content(content, template.content_tokens, title)
+        prompt = template.render(title=title, content=fitted)
+        before, after = estimate_tokens(content), estimate_tokens(fitted)
+        with self._lock:
+            s = self.stats[template.name]
+            s[0] += 1
+            s[1] += estimate_tokens(prompt)
+            s[2] += fitted != (content or "").strip()
+            s[3] += before
+            s[4] += after
+        return prompt
+
+    def report(self) -> str:
+        with self._lock:
+            stats = {name: list(s) for name, s in self.stats.items()}
+        return "\n".join(
+            f"prompt {name:9} {n} built, ~{total // max(n, 1):,} tokens avg; content trimmed in {trimmed} "
+            f"({content_in:,} -> {content_kept:,} tokens)"
+            for name, (n, total, trimmed, content_in, content_kept) in sorted(stats.items()))
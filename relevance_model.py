@@ -0,0 +1,254 @@
+import json
+import re
+import sys
+import time
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+from config import Config
+
+N_FEATURES = 2 ** 18
+ACCEPT_SCORE = 7.0 # process_news keeps items the agent scores at or above this
+LOCAL_REASON = "로컬 모델 판단"
+
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def _tokens(title: str, summary: str) -> List[str]:
+    """Words, word bigrams and char 2/3-grams (particle-tolerant for Korean: 클로드가 shares 클로, 로드)."""
+    out = []
+    for prefix, text in (("t:", title), ("", summary)):
+        words = [w.lower() for w in _WORD.findall(text or "")]
+        out.extend(prefix + w for w in words)
+        out.extend(f"{prefix}{a}_{b}" for a, b in zip(words, words[1:]))
+        for w in words:
+            padded = f"<{w}>"
+            out.extend("c:" + padded[i:i + n] for n in (2, 3) for i in range(len(padded) - n + 1))
+    return out
+
+
+def featurize(docs: Sequence[Tuple[str, str]], n_features: int = N_FEATURES):
+    """
+    Hashed n-gram features in CSR form: (indices, values, rows). crc32, not hash(): features must
+    hash the same in every process. log(1 + tf), each row L2-normalized.
+    """
+    import numpy as np
+
+    indices, values, rows = [], [], []
+    for row, (title, summary) in enumerate(docs):
+        counts: Dict[int, int] = {}
+        for token in _tokens(title, summary):
+            h = zlib.crc32(token.encode("utf-8")) % n_features
+            counts[h] = counts.get(h, 0) + 1
+        if not counts:
+            continue
+        vals = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        indices.append(np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)))
+        values.append(vals / np.linalg.norm(vals))
+        rows.append(np.full(len(counts), row, dtype=np.int64))
+    if not indices:
+        return np.zeros(0, np.int64), np.zeros(0, np.float32), np.zeros(0, np.int64)
+    return np.concatenate(indices), np.concatenate(values), np.concatenate(rows)
+
+
+def _sigmoid(z):
+    import numpy as np
+    return 1 / (1 + np.exp(-np.clip(z, -35, 35)))
+
+
+def _dot(X, w, n: int):
+    import numpy as np
+    indices, values, rows = X
+    return np.bincount(rows, weights=w[indices] * values, minlength=n)
+
+
+def _fit_linear(X, y, n: int, n_features: int, logistic: bool, sample_weight=None,
+                epochs: int = 150, lr: float = 0.5, l2: float = 1e-4):
+    """Full-batch AdaGrad on sparse rows: logistic loss (y in {0,1}) or squared loss."""
+    import numpy as np
+    indices, values, rows = X
+    w = np.zeros(n_features, dtype=np.float64)
+    b = 0.0 if logistic else float(np.average(y, weights=sample_weight))
+    g2 = np.full(n_features, 1e-8)
+    gb2 = 1e-8
+    sw = np.ones(n) if sample_weight is None else sample_weight
+    sw = sw / sw.sum()
+    for _ in range(epochs):
+        z = _dot(X, w, n) + b
+        pred = _sigmoid(z) if logistic else z
+        err = (pred - y) * sw
+        grad = np.bincount(indices, weights=values * err[rows], minlength=n_features) + l2 * w
+        g2 += grad * grad
+        w -= lr * grad / np.sqrt(g2)
+        gb = err.sum()
+        gb2 += gb * gb
+        b -= lr * gb / np.sqrt(gb2)
+    return w.astype(np.float32), b
+
+
+def _fit_platt(z, y) -> Tuple[float, float]:
+    """Calibration: p = sigmoid(a * z + c), fitted on held-out margins (Newton steps)."""
+    import numpy as np
+    # Platt's smoothed targets: a perfectly separated calibration set doesn't give p = 0 / 1
+    pos = y.sum()
+    y = np.where(y == 1, (pos + 1) / (pos + 2), 1 / (len(y) - pos + 2))
+    a, c = 1.0, 0.0
+    for _ in range(50):
+        p = _sigmoid(a * z + c)
+        g = np.array([np.dot(p - y, z), np.sum(p - y)])
+        r = p * (1 - p) + 1e-9
+        h = np.array([[np.dot(r, z * z), np.dot(r, z)], [np.dot(r, z), r.sum()]]) + 1e-6 * np.eye(2)
+        step = np.linalg.solve(h, g)
+        a, c = a - step[0], c - step[1]
+        if np.abs(step).max() < 1e-6:
+            break
+    return float(a), float(c)
+
+
+class RelevanceModel:
+    """
+    Local relevance model trained on historical LLM agent scores.
+    - hashed word / char n-grams, logistic regression (accept = score >= 7) + linear score regression
+    - Platt-calibrated probability, so 'confident' means the same thing after every retrain
+    - predict() scores a whole batch with a few NumPy ops (milliseconds)
+    """
+
+    def __init__(self, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self.w = self.rw = None
+        self.b = self.rb = 0.0
+        self.platt = (1.0, 0.0)
+        self.metrics: Dict = {}
+
+    @property
+    def trained(self) -> bool:
+        return self.w is not None
+
+    def fit(self, docs: List[Tuple[str, str]], scores: List[float], seed: int = 0) -> Dict:
+        """Train on 70%, calibrate on 15%, report on the last 15% (never seen by either)."""
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(docs))
+        n_train, n_calib = int(len(docs) * 0.7), int(len(docs) * 0.15)
+        parts = np.split(order, [n_train, n_train + n_calib])
+        scores = np.asarray(scores, dtype=np.float64)
+
+        def subset(idx):
+            return featurize([docs[i] for i in idx], self.n_features), scores[idx], len(idx)
+
+        (X, s, n), (Xc, sc, nc), (Xt, st, nt) = subset(parts[0]), subset(parts[1]), subset(parts[2])
+        y = (s >= ACCEPT_SCORE).astype(np.float64)
+        # Balanced classes: most candidates are rejects
+        pos = max(y.sum(), 1)
+        weights = np.where(y == 1, n / (2 * pos), n / (2 * max(n - pos, 1)))
+        self.w, self.b = _fit_linear(X, y, n, self.n_features, logistic=True, sample_weight=weights)
+        self.rw, self.rb = _fit_linear(X, s, n, self.n_features, logistic=False)
+        self.platt = _fit_platt(_dot(Xc, self.w, nc) + self.b, (sc >= ACCEPT_SCORE).astype(np.float64))
+        self.metrics = self.evaluate(Xt, st, nt)
+        self.metrics.update({"trained_at": time.time(), "n_train": n, "n_calib": nc, "n_test": nt})
+        return self.metrics
+
+    def _predict_features(self, X, n: int):
+        import numpy as np
+        a, c = self.platt
+        prob = _sigmoid(a * (_dot(X, self.w, n) + self.b) + c)
+        score = np.clip(_dot(X, self.rw, n) + self.rb, 0, 10)
+        return prob, score
+
+    def predict(self, docs: List[Tuple[str, str]]):
+        """(probability of acceptance, predicted agent score) arrays for a batch of (title, summary)."""
+        return self._predict_features(featurize(docs, self.n_features), len(docs))
+
+    def evaluate(self, X, scores, n: int, accept: float = None, reject: float = None) -> Dict:
+        import numpy as np
+        accept = Config.LOCAL_MODEL_ACCEPT if accept is None else accept
+        reject = Config.LOCAL_MODEL_REJECT if reject is None else reject
+        prob, pred = self._predict_features(X, n)
+        y = scores >= ACCEPT_SCORE
+        decided = (prob >= accept) | (prob <= reject)
+        correct = (prob >= 0.5) == y
+        # Expected calibration error over 10 probability bins
+        bins = np.minimum((prob * 10).astype(int), 9)
+        ece = sum(abs(prob[bins == k].mean() - y[bins == k].mean()) * (bins == k).sum()
+                  for k in range(10) if (bins == k).any()) / max(n, 1)
+        return {
+            "accuracy": float(correct.mean()) if n else 0.0,
+            "positive_rate": float(y.mean()) if n else 0.0,
+            "score_mae": float(np.abs(pred - scores).mean()) if n else 0.0,
+            "brier": float(((prob - y) ** 2).mean()) if n else 0.0,
+            "ece": float(ece),
+            "confident_share": float(decided.mean()) if n else 0.0, # LLM calls that would be skipped
+            "confident_accuracy": float(correct[decided].mean()) if decided.any() else 0.0,
+            "confident_n": int(decided.sum()), # Held-out items behind confident_accuracy
+        }
+
+    def usable(self) -> bool:
+        """Only trust the model if it earned it on held-out LLM scores."""
+        m = self.metrics
+        return (self.trained and m.get("n_train", 0) >= Config.LOCAL_MODEL_MIN_SAMPLES
+                and m.get("confident_n", 0) >= Config.LOCAL_MODEL_MIN_CONFIDENT # 2 of 2 right proves nothing
+                and m.get("confident_accuracy", 0) >= Config.LOCAL_MODEL_MIN_ACCURACY)
+
+    def save(self, path: str):
+        import os
+        import numpy as np
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, w=self.w, rw=self.rw, b=self.b, rb=self.rb, platt=np.array(self.platt),
+                            n_features=self.n_features, metrics=json.dumps(self.metrics))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RelevanceModel":
+        import numpy as np
+        with np.load(path) as data:
+            model = cls(int(data["n_features"]))
+            model.w, model.rw = data["w"], data["rw"]
+            model.b, model.rb = float(data["b"]), float(data["rb"])
+            model.platt = tuple(float(v) for v in data["platt"])
+            model.metrics = json.loads(str(data["metrics"]))
+        return model
+
+
+def format_report(metrics: Dict) -> str:
+    m = metrics
+    trained = time.strftime("%Y-%m-%d %H:%M", time.localtime(m.get("trained_at", 0)))
+    return "\n".join([
+        f"Relevance model (trained {trained}): {m['n_train']} train / {m['n_calib']} calib / {m['n_test']} held-out",
+        f"  accuracy {m['accuracy']:.1%} (held-out accept rate {m['positive_rate']:.1%}), "
+        f"score MAE {m['score_mae']:.2f}",
+        f"  calibration: Brier {m['brier']:.3f}, ECE {m['ece']:.3f}",
+        f"  confident (p >= {Config.LOCAL_MODEL_ACCEPT} or <= {Config.LOCAL_MODEL_REJECT}): "
+        f"{m['confident_share']:.1%} of items, {m['confident_accuracy']:.1%} correct "
+        f"({m.get('confident_n', 0)} held-out items)",
+    ])
+
+
+def train(days: int = None) -> RelevanceModel:
+    from archive import NewsArchive
+    rows = NewsArchive(Config.ARCHIVE_PATH).labeled(days)
+    if len(rows) < 20:
+        raise SystemExit(f"Only {len(rows)} LLM-scored items in the archive; need more history to train.")
+    start = time.perf_counter()
+    model = RelevanceModel()
+    model.fit([(title, summary) for title, summary, _ in rows], [score for _, _, score in rows])
+    print(f"Trained on {len(rows)} LLM-scored items in {time.perf_counter() - start:.2f}s")
+    print(format_report(model.metrics))
+    if not model.usable():
+        print(f"⚠️ Below the bar (>= {Config.LOCAL_MODEL_MIN_SAMPLES} train items, "
+              f">= {Config.LOCAL_MODEL_MIN_ACCURACY:.0%} accuracy on >= {Config.LOCAL_MODEL_MIN_CONFIDENT} "
+              f"confident held-out items): the LLM keeps scoring everything.")
+    model.save(Config.LOCAL_MODEL_PATH)
+    print(f"Saved to {Config.LOCAL_MODEL_PATH}")
+    return model
+
+
+if __name__ == "__main__":
+    # python relevance_model.py train [days] | report
+    if len(sys.argv) > 1 and sys.argv[1] == "train":
+        train(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "report":
+        print(format_report(RelevanceModel.load(Config.LOCAL_MODEL_PATH).metrics))
+    else:
+        print("Usage: python relevance_model.py train [days] | report")
+        sys.exit(1)
@@ -0,0 +1,153 @@
+import importlib
+import os
+import time
+from collections import OrderedDict
+from config import Config
+
+class LRUCache(OrderedDict):
+    """
+    Small bounded dict (oldest entries evicted first) with optional TTL.
+    Used for caches that live across daemon runs so they can't grow forever.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = None):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._stamps = {}
+
+    def __contains__(self, key):
+        if not super().__contains__(key):
+            return False
+        if self.ttl is not None and time.time() - self._stamps.get(key, 0) > self.ttl:
+            del self[key]
+            return False
+        return True
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._stamps[key] = time.time()
+        while len(self) > self.max_size:
+            oldest = next(iter(self))
+            del self[oldest]
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._stamps.pop(key, None)
+
+
+class Runtime:
+    """
+    Long-lived objects shared by job() runs.
+    --once builds a fresh Runtime per run; --daemon keeps one warm so HTTP
+    keep-alive connections, LLM clients and caches survive between schedules.
+    """
+
+    def __init__(self):
+        self._processor = None
+        self._notifier = None
+        self._pool = None
+        self._archive = None
+        self._feed_health = None
+        self._extractor = None
+        self._profiles = None
+        self.content_cache = LRUCache(max_size=2000, ttl=3 * 24 * 3600) # url -> article text
+        self.naver_last_error = "None"
+        self.runs = 0
+
+    @property
+    def session(self):
+        # Process-wide pooled client (http_client.get_client), shared with every other module
+        from http_client import get_client
+        return get_client()
+
+    @property
+    def processor(self):
+        if self._processor is None:
+            from processor import ContentProcessor
+            self._processor = ContentProcessor()
+        return self._processor
+
+    def llm_report(self) -> str:
+        """This run's LLM spend, prompt sizes and latency percentiles (and hedging); empty if no LLM call was made."""
+        if self._processor is None or self._processor._budget is None:
+            return ""
+        processor = self._processor
+        if not processor.budget.totals()["run_calls"]:
+            return ""
+        reports = [processor.budget.report(), processor.prompts.report()]
+        reports += [hedge.report() for hedge in processor.hedges.values()] # Latency before / after hedging, per task
+        return "\n".join(r for r in reports if r)
+
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            from notifier import TelegramNotifier
+            self._notifier = TelegramNotifier()
+        return self._notifier
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            from incremental import CandidatePool
+            self._pool = CandidatePool(os.path.join(Config.STATE_DIR, "pool.json"))
+        return self._pool
+
+    @property
+    def archive(self):
+        if self._archive is None:
+            from archive import NewsArchive
+            self._archive = NewsArchive(Config.ARCHIVE_PATH)
+        return self._archive
+
+    def undelivered(self, items, profile: str = None):
+        """Archive cross-day dedup; a locked or corrupt archive.db skips it instead of failing the run."""
+        try:
+            return self.archive.filter_undelivered(items, Config.ARCHIVE_DEDUP_DAYS, profile)
+        except Exception as e:
+            print(f"  [Archive] Dedup skipped: {e}")
+            return items
+
+    @property
+    def feed_health(self):
+        if self._feed_health is None:
+            from feed_health import FeedHealthTracker
+            self._feed_health = FeedHealthTracker(
+                os.path.join(Config.STATE_DIR, "feed_health.json"),
+                quarantine_after=Config.FEED_QUARANTINE_AFTER,
+                min_interval=Config.POLL_FAST_MINUTES * 60,
+            )
+        return self._feed_health
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            from extractor import ExtractionPool
+            from domain_rules import DomainRuleStore
+            self._extractor = ExtractionPool(rules=DomainRuleStore(os.path.join(Config.STATE_DIR, "domain_rules.json")))
+        return self._extractor
+
+    @property
+    def profiles(self):
+        if self._profiles is None:
+            from profiles import load_profiles
+            self._profiles = load_profiles(Config.PROFILES_PATH)
+        return self._profiles
+
+    def warm_up(self):
+        """Daemon start: pay import + client construction cost once, before the first schedule."""
+        start = time.perf_counter()
+        for module in ("feedparser", "bs4"): # Parsers the first poll needs
+            importlib.import_module(module)
+        self.session
+        processor = self.processor
+        processor.model
+        processor.openai_client
+        self.notifier.bot
+        print(f"Runtime warmed up in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,163 @@
+import asyncio
+import datetime
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, List
+
+
+class ScheduledJob:
+    """
+    One cadence: either every `interval` seconds, or daily at `at` ("HH:MM", local time).
+    """
+
+    def __init__(self, name: str, func: Callable, interval: float = None, at: str = None,
+                 jitter: float = 0, catch_up: float = 0, args: tuple = ()):
+        if (interval is None) == (at is None):
+            raise ValueError(f"Job '{name}' needs exactly one of interval / at")
+        self.name = name
+        self.func = func
+        self.args = args
+        self.interval = interval
+        self.at = at
+        self.jitter = jitter
+        self.catch_up = catch_up # Max lateness (s) for which a missed daily run is still executed
+        self.last_run = None # epoch seconds of last start
+        self.next_run = None
+        self.running = False
+        self.runs = 0
+        self.skipped_overlaps = 0
+
+    def _next_daily(self, after: float) -> float:
+        hour, minute = (int(x) for x in self.at.split(":"))
+        base = datetime.datetime.fromtimestamp(after)
+        target = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target.timestamp() <= after:
+            target += datetime.timedelta(days=1)
+        return target.timestamp()
+
+    def _previous_daily(self, now: float) -> float:
+        return self._next_daily(now) - 24 * 3600
+
+    def schedule_next(self, now: float):
+        if self.interval is not None:
+            base = now + self.interval
+        else:
+            base = self._next_daily(now)
+        # Jitter spreads load (and avoids hitting sources on the exact same second every run)
+        self.next_run = base + random.uniform(0, self.jitter) if self.jitter else base
+
+    def schedule_first(self, now: float):
+        """
+        Missed-run catch-up on (re)start:
+        - interval jobs run immediately if their last run is older than one interval
+        - daily jobs run immediately if today's slot was missed by less than `catch_up` seconds
+        """
+        if self.interval is not None:
+            if self.last_run is None or now - self.last_run >= self.interval:
+                self.next_run = now
+            else:
+                self.next_run = self.last_run + self.interval
+            return
+
+        previous_slot = self._previous_daily(now)
+        missed = self.last_run is None or self.last_run < previous_slot
+        if self.catch_up and missed and now - previous_slot <= self.catch_up:
+            print(f"[Scheduler] '{self.name}' missed its {self.at} slot. Catching up now.")
+            self.next_run = now
+        else:
+            self.schedule_next(now)
+
+
+class AsyncScheduler:
+    """
+    asyncio-native scheduler with several cadences.
+    - Jobs run in worker threads (asyncio.to_thread) so blocking scrapers/LLM calls don't stall the loop
+    - Never two runs of the same job at once (a due run is skipped while the previous one is still busy)
+    - If the loop falls behind (sleep/suspend), missed interval runs are coalesced into one
+    - Last-run times are persisted so restarts catch up instead of silently skipping a digest
+    """
+
+    def __init__(self, state_path: str = None):
+        self.jobs: List[ScheduledJob] = []
+        self.state_path = state_path
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def every(self, seconds: float, name: str, func: Callable, *args, jitter: float = 0):
+        job = ScheduledJob(name, func, interval=seconds, jitter=jitter, args=args)
+        self.jobs.append(job)
+        return job
+
+    def daily(self, at: str, name: str, func: Callable, *args, jitter: float = 0, catch_up: float = 3 * 3600):
+        job = ScheduledJob(name, func, at=at, jitter=jitter, catch_up=catch_up, args=args)
+        self.jobs.append(job)
+        return job
+
+    # --- State ---
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Scheduler] Could not read state ({e}). Starting fresh.")
+            return
+        for job in self.jobs:
+            job.last_run = state.get(job.name, {}).get("last_run")
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        state = {job.name: {"last_run": job.last_run, "runs": job.runs} for job in self.jobs}
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    # --- Loop ---
+
+    async def _run_job(self, job: ScheduledJob):
+        job.running = True
+        job.last_run = time.time()
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(job.func):
+                await job.func(*job.args)
+            else:
+                await asyncio.to_thread(job.func, *job.args)
+            job.runs += 1
+            print(f"[Scheduler] '{job.name}' finished in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"[Scheduler] '{job.name}' failed: {e}")
+        finally:
+            job.running = False
+            self._save_state()
+
+    def _dispatch_due(self, now: float):
+        for job in self.jobs:
+            if job.next_run is None or job.next_run > now:
+                continue
+            if job.running:
+                job.skipped_overlaps += 1
+                print(f"[Scheduler] '{job.name}' still running. Skipping this slot.")
+            else:
+                self._tasks[job.name] = asyncio.create_task(self._run_job(job))
+            # Coalesce: next slot is computed from *now*, so a long stall yields one catch-up run, not N
+            job.schedule_next(now)
+
+    async def run_forever(self, max_sleep: float = 30):
+        self._load_state()
+        now = time.time()
+        for job in self.jobs:
+            job.schedule_first(now)
+            print(f"[Scheduler] '{job.name}' next run at {datetime.datetime.fromtimestamp(job.next_run):%Y-%m-%d %H:%M:%S}")
+
+        while True:
+            self._dispatch_due(time.time())
+            soonest = min(job.next_run for job in self.jobs)
+            # Bounded sleep so wall-clock jumps (suspend, NTP) are noticed quickly
+            await asyncio.sleep(max(0.5, min(max_sleep, soonest - time.time())))
@@ -1,12 +1,14 @@
-import requests
 import datetime
-from typing import List, Dict
+from typing import List, Optional
 from .base import NewsScraper
 from config import Config
+from models import NewsItem
+import deadline
+from http_client import get_client
+from .domestic_scoring import score_domestic
 
 class HackerNewsScraper(NewsScraper):
-    print(">>> LOADING API SCRAPER: VERSION FIX-1215 <<<")
-    def fetch_news(self) -> List[Dict]:
+    def fetch_news(self) -> List[NewsItem]:
         # Using Algolia API for search
         url = "http://hn.algolia.com/api/v1/search_by_date"
         params = {
@@ -15,25 +17,25 @@ class HackerNewsScraper(NewsScraper):
             'hitsPerPage': 5
         }
         try:
-            response = requests.get(url, params=params)
+            response = get_client().get(url, params=params, timeout=deadline.current().timeout(Config.HTTP_TIMEOUT))
             response.raise_for_status()
             data = response.json()
             items = []
             for hit in data.get('hits', []):
-                items.append({
-                    'title': hit.get('title'),
-                    'link': hit.get('url') or f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
-                    'source': 'Hacker News',
-                    'published': hit.get('created_at'),
-                    'summary': '' # No summary in HN search usually
-                })
+                items.append(NewsItem(
+                    title=hit.get('title'),
+                    link=hit.get('url') or f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
+                    source='Hacker News',
+                    published=hit.get('created_at') or '',
+                    summary='' # No summary in HN search usually
+                ))
             return items
         except Exception as e:
             print(f"Error fetching Hacker News: {e}")
             return []
 
 class NewsAPIScraper(NewsScraper):
-    def fetch_news(self) -> List[Dict]:
+    def fetch_news(self) -> List[NewsItem]:
         if not Config.NEWSAPI_KEY:
             print("NewsAPI Key missing. Skipping.")
             return []
@@ -47,18 +49,18 @@ class NewsAPIScraper(NewsScraper):
             'language': 'en' 
         }
         try:
-            response = requests.get(url, params=params)
+            response = get_client().get(url, params=params, timeout=deadline.current().timeout(Config.HTTP_TIMEOUT))
             response.raise_for_status()
             articles = response.json().get('articles', [])
             items = []
             for art in articles:
-                items.append({
-                    'title': art.get('title'),
-                    'link': art.get('url'),
-                    'source': f"NewsAPI ({art.get('source', {}).get('name')})",
-                    'published': art.get('publishedAt'),
-                    'summary': art.get('description', '')
-                })
+                items.append(NewsItem(
+                    title=art.get('title'),
+                    link=art.get('url'),
+                    source=f"NewsAPI ({art.get('source', {}).get('name')})",
+                    published=art.get('publishedAt') or '',
+                    summary=art.get('description') or ''
+                ))
             return items
         except Exception as e:
             print(f"Error fetching NewsAPI: {e}")
@@ -96,7 +98,12 @@ NAVER_QUERIES = {
 }
 
 class NaverNewsScraper(NewsScraper):
-    def fetch_news(self, query=None, display=20) -> List[Dict]:
+    def __init__(self, session=None, keep_rejected: bool = False):
+        self.http = session or get_client() # Shared pooled client
+        self.keep_rejected = keep_rejected # Keep excluded items (score -99) for per-profile filtering
+        self.last_error = None
+
+    def fetch_news(self, query=None, display=20) -> List[NewsItem]:
         if not Config.NAVER_CLIENT_ID or not Config.NAVER_CLIENT_SECRET:
             print("Naver API keys missing. Skipping.")
             return []
@@ -130,12 +137,65 @@ class NaverNewsScraper(NewsScraper):
 
         return all_items
 
-    def _execute_queries(self, url, headers, queries, display, collection, seen_links):
+    def fetch_queries(self, queries: List[str], excludes: List[str], display: int = 10) -> List[NewsItem]:
+        """Run the given queries as-is (plus the shared excludes): `display` results each."""
+        if not Config.NAVER_CLIENT_ID or not Config.NAVER_CLIENT_SECRET:
+            print("Naver API keys missing. Skipping.")
+            return []
+        url = "https://openapi.naver.com/v1/search/news.json"
+        headers = {
+            "X-Naver-Client-Id": Config.NAVER_CLIENT_ID,
+            "X-Naver-Client-Secret": Config.NAVER_CLIENT_SECRET
+        }
+        items = []
+        print(f"  [Naver] Fetching {len(queries)} profile queries...")
+        self._execute_queries(url, headers, queries, display * len(queries), items, set(),
+                              excludes=["-" + t for t in excludes])
+        return items
+
+    def search_page(self, query: str, start: int = 1, display: int = 100, excludes: List[str] = None) -> List[dict]:
+        """
+        Raw results of one date-sorted page (newest first). The API has no date filter:
+        backfill pages through with start (<= 1000) until it passes the range it wants.
+        """
+        excludes = NAVER_QUERIES["exclude"] if excludes is None else excludes
+        params = {'query': (query + " " + " ".join(excludes)).strip(), 'display': display, 'start': start, 'sort': 'date'}
+        headers = {
+            "X-Naver-Client-Id": Config.NAVER_CLIENT_ID,
+            "X-Naver-Client-Secret": Config.NAVER_CLIENT_SECRET
+        }
+        response = self.http.get("https://openapi.naver.com/v1/search/news.json", headers=headers, params=params,
+                                 timeout=deadline.current().timeout(Config.HTTP_TIMEOUT))
+        response.raise_for_status()
+        return response.json().get('items', [])
+
+    def to_item(self, raw: dict) -> Optional[NewsItem]:
+        """Search result -> scored NewsItem (None if an exclude term rejects it, unless keep_rejected)."""
+        clean_title = raw.get('title', '').replace('<b>', '').replace('</b>', '').replace('&quot;', '"')
+        summary = raw.get('description', '').replace('<b>', '').replace('</b>', '')
+        score = score_domestic(clean_title, summary)
+        if score < 0 and not self.keep_rejected:
+            return None
+        return NewsItem(
+            title=clean_title,
+            link=raw.get('originallink') or raw.get('link'),
+            source='Naver News',
+            published=raw.get('pubDate') or '',
+            summary=summary,
+            score=score,
+            category='domestic'
+        )
+
+    def _execute_queries(self, url, headers, queries, display, collection, seen_links, excludes=None):
         base_display = max(5, int(display / max(1, len(queries)))) # Distribute display count
         
+        dl = deadline.current()
         for q in queries:
+            if not dl.allows("feeds"):
+                print("  [Naver] Deadline near. Skipping remaining queries.")
+                break
             # Append excludes
-            full_query = q + " " + " ".join(NAVER_QUERIES["exclude"])
+            full_query = (q + " " + " ".join(NAVER_QUERIES["exclude"] if excludes is None else excludes)).strip()
             
             params = {
                 'query': full_query,
@@ -143,23 +203,14 @@ class NaverNewsScraper(NewsScraper):
                 'sort': 'date'
             }
             try:
-                response = requests.get(url, headers=headers, params=params)
+                response = self.http.get(url, headers=headers, params=params, timeout=dl.timeout(Config.HTTP_TIMEOUT))
                 if response.status_code != 200: continue
                 
-                for item in response.json().get('items', []):
-                    link = item.get('originallink') or item.get('link')
-                    if link in seen_links: continue
-                    
-                    clean_title = item.get('title', '').replace('<b>', '').replace('</b>', '').replace('&quot;', '"')
-                    
-                    seen_links.add(link)
-                    collection.append({
-                        'title': clean_title,
-                        'link': link,
-                        'source': 'Naver News',
-                        'published': item.get('pubDate'),
-                        'summary': item.get('description', '').replace('<b>', '').replace('</b>', '')
-                    })
+                for raw in response.json().get('items', []):
+                    item = self.to_item(raw)
+                    if item is None or item.link in seen_links: continue
+                    seen_links.add(item.link)
+                    collection.append(item)
             except Exception as e:
                 self.last_error = f"{e}"
                 print(f"Error Naver query '{q}': {e}")
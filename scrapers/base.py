@@ -1,16 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List
+from models import NewsItem
 
 class NewsScraper(ABC):
     @abstractmethod
-    def fetch_news(self) -> List[Dict]:
+    def fetch_news(self) -> List[NewsItem]:
         """
         Fetches news items.
-        Returns a list of dictionaries with keys:
+        Returns a list of NewsItem with at least:
         - title
         - link
         - source
-        - published_at (optional)
+        - published (optional)
         - summary (optional)
         """
         pass
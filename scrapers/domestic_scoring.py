@@ -0,0 +1,123 @@
+import re
+from typing import Dict, Optional, Pattern, Tuple
+
+# ========================================
+# 국내 뉴스 키워드 점수 (Naver / domestic RSS)
+# ========================================
+# Terms come from the NAVER_QUERIES tiers (quoted phrases + the AND context words),
+# plus Korean terms the queries don't spell out.
+
+TIER_WEIGHTS = {"tier1": 10, "tier2": 5}
+CONTEXT_WEIGHT = 2 # Bare AND-words: 사례, 도입, 기업, ...
+EXCLUDE_SCORE = -99
+
+KOREAN_TERMS = {
+    "앤트로픽": 10,
+    "오픈AI": 10,
+    "코파일럿": 10,
+    "에이전틱": 10,
+    "멀티 에이전트": 10,
+    "바이브 코딩": 10,
+    "도입 사례": 5,
+    "디지털 전환": 5,
+    "PoC": 5,
+    "생산성": 2,
+}
+
+# Hangul terms this short are ambiguous inside compounds (커서, 도입, 기업):
+# they must start a word. Longer ones (클로드, 제미나이) match anywhere.
+SHORT_HANGUL = 2
+
+_HANGUL = "가-힣"
+# Particles / endings that may follow an exclude term: '게임을', '웹툰의' still reject
+_PARTICLES = "|".join(["은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "와", "과", "도", "만",
+                       "로", "으로", "까지", "부터", "처럼", "보다", "이나", "나", "이란", "란"])
+_OPERATORS = re.compile(r'"[^"]*"|\bAND\b|\bOR\b|[()]')
+
+_compiled: Optional[Tuple[Pattern, Dict[str, int]]] = None
+
+
+def term_key(term: str) -> str:
+    return re.sub(r"\s+", "", term).lower()
+
+
+def query_terms() -> Dict[str, int]:
+    """term -> weight from NAVER_QUERIES (highest tier wins), excludes negative."""
+    from .api_scraper import NAVER_QUERIES
+
+    weights: Dict[str, int] = {}
+
+    def add(term: str, weight: int):
+        term = term.strip()
+        if term and (term not in weights or weights[term] < weight):
+            weights[term] = weight
+
+    for tier, weight in TIER_WEIGHTS.items():
+        for query in NAVER_QUERIES[tier]:
+            for phrase in re.findall(r'"([^"]+)"', query):
+                add(phrase, weight)
+            for word in _OPERATORS.sub(" ", query).split():
+                add(word, CONTEXT_WEIGHT)
+    for term, weight in KOREAN_TERMS.items():
+        add(term, weight)
+    # A longer term is worth at least the terms inside it ('ChatGPT' >= 'GPT', 'AI 도입' >= '도입'):
+    # the regex matches longest-first, so the inner term never gets counted on its own
+    for term in list(weights):
+        inner = [w for t, w in weights.items() if t != term and term_key(t) in term_key(term)]
+        weights[term] = max([weights[term], *inner])
+    for term in NAVER_QUERIES["exclude"]:
+        weights[term.lstrip("-")] = EXCLUDE_SCORE
+    return weights
+
+
+def term_pattern(term: str, exclude: bool = False) -> str:
+    """
+    Regex for one term with the word-boundary rules below (compile with re.IGNORECASE).
+    exclude: Hangul edges are anchored on both sides, so only the word itself (plus a particle)
+    rejects an item: '게임 업계' and '게임을' do, '게임체인저' and '모바일게임' don't.
+    """
+    # Spaces inside a phrase are optional ('생성형 AI' == '생성형AI')
+    body = r"\s*".join(re.escape(part) for part in term.split())
+    # Latin edges must not touch other Latin letters/digits (RAG vs STORAGE), but may touch
+    # Hangul: '챗GPT', 'GPT는', 'RAG를'. Korean particles / endings after a term are always fine
+    # (클로드가, 클로드는, 도입한), so only the start of a short Hangul term is anchored.
+    lead = r"(?<![A-Za-z0-9])" if re.match(r"[A-Za-z0-9]", term) else ""
+    if re.fullmatch(f"[{_HANGUL}]{{1,{SHORT_HANGUL}}}", term.split()[0]):
+        lead = f"(?<![{_HANGUL}])"
+    trail = r"(?![A-Za-z0-9])" if re.search(r"[A-Za-z0-9]$", term) else ""
+    if exclude and re.match(f"[{_HANGUL}]", term):
+        lead = f"(?<![{_HANGUL}])"
+    if exclude and re.search(f"[{_HANGUL}]$", term):
+        trail = f"(?=(?:{_PARTICLES})?(?![{_HANGUL}]))"
+    return lead + body + trail
+
+
+def compiled() -> Tuple[Pattern, Dict[str, int]]:
+    """One alternation over every term (longest first), compiled once per process."""
+    global _compiled
+    if _compiled is None:
+        weights = query_terms()
+        terms = sorted(weights, key=len, reverse=True)
+        pattern = re.compile("|".join(term_pattern(t, weights[t] == EXCLUDE_SCORE) for t in terms), re.IGNORECASE)
+        _compiled = (pattern, {term_key(t): w for t, w in weights.items()})
+    return _compiled
+
+
+def score_domestic(title: str, description: str = "") -> int:
+    """
+    Keyword score for a Korean item in one regex pass over title + description.
+    Each term counts once: full weight in the title, half in the description only.
+    Any exclude term (게임, 웹툰, ...) as a word of its own rejects the item (-99).
+    """
+    pattern, weights = compiled()
+    title = title or ""
+    text = title + "\n" + (description or "")
+    found: Dict[str, int] = {}
+    for match in pattern.finditer(text):
+        key = term_key(match.group())
+        weight = weights.get(key, 0)
+        if weight == EXCLUDE_SCORE:
+            return EXCLUDE_SCORE
+        in_title = match.start() < len(title)
+        found[key] = max(found.get(key, 0), weight if in_title else weight // 2)
+    return sum(found.values())
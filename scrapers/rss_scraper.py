@@ -1,9 +1,13 @@
-import feedparser
-import requests
-from typing import List, Dict
+from typing import Dict, List
 from .base import NewsScraper
-from bs4 import BeautifulSoup
+from models import NewsItem
 import re
+import time
+import profiler
+import deadline
+from config import Config
+from http_client import get_client
+from .domestic_scoring import score_domestic
 
 # ========================================
 # 해외 뉴스 키워드 가중치 (RSS Feed) v2.0
@@ -63,29 +67,84 @@ IMMEDIATE_REJECT_PATTERNS = [
 ]
 
 class RSSScraper(NewsScraper):
-    def __init__(self, feeds: List[str], category: str = "general"):
+    def __init__(self, feeds: List[str], category: str = "general", session=None, content_cache=None, health=None,
+                 extractor=None, keep_rejected: bool = False, full_content: bool = True, max_entries: int = 15):
         self.feeds = feeds
         self.category = category
         self.keywords = {} # Not used in v2.0 logic directly
+        self.http = session or get_client() # Shared pooled client (keep-alive, gzip, UA, size cap)
+        self.content_cache = content_cache # Optional url -> full text cache (shared across runs)
+        self.health = health # Optional FeedHealthTracker (quarantine + adaptive polling)
+        self._extractor = extractor # Optional shared ExtractionPool (created on demand otherwise)
+        # Topic profiles filter on their own: keep rejects (score -99) and low scores instead of dropping them
+        self.keep_rejected = keep_rejected
+        self.full_content = full_content # Pass 2 (article pages). Off for archived snapshots (backfill)
+        self.max_entries = max_entries
+        self.last_error = "" # Last feed failure (fetch, bozo or HTTP error), for callers that need to know
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            from extractor import ExtractionPool
+            self._extractor = ExtractionPool()
+        return self._extractor
+
+    def fetch_news(self) -> List[NewsItem]:
+        # Heavy parsers are imported on first fetch, not at module load
+        import feedparser
+        from bs4 import BeautifulSoup
 
-    def fetch_news(self) -> List[Dict]:
         news_items = []
         seen_links = set()
+        dl = deadline.current()
         
         for feed_url in self.feeds:
+            if not dl.allows("feeds"):
+                print(f"Feed: {feed_url} - Skipped (job deadline)")
+                continue
+            if self.health:
+                should_poll, reason = self.health.should_poll(feed_url)
+                if not should_poll:
+                    print(f"Feed: {feed_url} - Skipped ({reason})")
+                    continue
+
+            start = time.perf_counter()
+            recorded = False # Health outcome already recorded for this feed
             try:
-                # Use a browser-like user agent
-                feed = feedparser.parse(feed_url, agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+                # Fetch ourselves (feedparser's own urllib fetch has no timeout), then parse the bytes
+                resp = self.http.get(feed_url, timeout=dl.timeout(Config.FEED_TIMEOUT))
+                status = resp.status_code
+                if isinstance(status, int) and status >= 400:
+                    # Error pages are HTML: don't let them show up as bozo feeds
+                    print(f"Feed: {feed_url} - Status: {status}")
+                    recorded = True
+                    self.last_error = f"HTTP {status}"
+                    if self.health:
+                        self.health.record_failure(feed_url, time.perf_counter() - start, f"HTTP {status}")
+                    continue
+                with profiler.stage("rss.parse_feed"):
+                    feed = feedparser.parse(resp.content, response_headers={k.lower(): v for k, v in resp.headers.items()})
+                latency = time.perf_counter() - start
                 
                 # Debug info
-                print(f"Feed: {feed_url} - Status: {getattr(feed, 'status', 'Unknown')} - Entries: {len(feed.entries)}")
+                print(f"Feed: {feed_url} - Status: {status} - Entries: {len(feed.entries)}")
                 
                 if feed.bozo:
                     print(f"Feed bozo error: {feed.bozo_exception}")
+                    self.last_error = f"bozo: {feed.bozo_exception}"
+                    recorded = True
+                    if self.health:
+                        self.health.record_failure(feed_url, latency, f"bozo: {feed.bozo_exception}", bozo=True)
                     continue
                 
+                recorded = True
+                if self.health:
+                    new_count = self.health.new_entry_count(feed_url, [e.get('link', '') for e in feed.entries])
+                    self.health.record_success(feed_url, latency, new_count)
+                
                 # Check top 15 from each feed (increased from 10)
-                for entry in feed.entries[:15]: 
+                candidates = []
+                for entry in feed.entries[:self.max_entries]: 
                     link = entry.get('link', '')
                     if link in seen_links:
                         continue
@@ -93,43 +152,64 @@ class RSSScraper(NewsScraper):
                     title = entry.get('title', '')
                     
                     # 1. Immediate Reject Check
-                    if self._should_reject_immediately(title):
+                    rejected = self._should_reject_immediately(title)
+                    if rejected:
                         print(f"  [Reject] {title[:30]}... (Pattern Match)")
-                        continue
+                        if not self.keep_rejected:
+                            continue
 
                     raw_summary = entry.get('summary', '') or entry.get('description', '')
                     
                     # Clean summary for scoring
-                    soup = BeautifulSoup(raw_summary, "html.parser")
-                    text_content = soup.get_text().strip()
-                    
-                    # Two-Pass Extraction check
-                    if len(text_content) < 200:
-                        fetched_text = self._fetch_full_content(link)
-                        if fetched_text:
-                            text_content = fetched_text 
+                    with profiler.stage("rss.clean_summary"):
+                        soup = BeautifulSoup(raw_summary, "html.parser")
+                        text_content = soup.get_text().strip()
+                    candidates.append((entry, title, link, text_content, rejected))
+                
+                # Two-Pass Extraction check: short summaries get the article page, all fetched at once
+                # (first thing to go when the job deadline is near)
+                full_texts = {}
+                short = [link for _, _, link, text, _ in candidates if len(text) < 200]
+                if short and self.full_content and dl.allows("full_content"):
+                    with profiler.stage("rss.fetch_full_content"):
+                        full_texts = self._fetch_full_contents(short)
+                
+                for entry, title, link, text_content, rejected in candidates:
+                    full_text = full_texts.get(link)
+                    if full_text:
+                        text_content = full_text
                     
-                    score = self._calculate_score(title, text_content)
+                    with profiler.stage("rss.keyword_score"):
+                        score = -99 if rejected else self._calculate_score(title, text_content)
                     
                     # Negative Score Check
-                    if score < 0:
+                    if score < 0 and not rejected:
                         print(f"  [Reject] {title[:30]}... (Negative Score)")
-                        continue
 
-                    # Threshold Check (Tier C min)
-                    if score >= 2:
+                    # Threshold Check (Tier C min). Kept for topic profiles: below the bar = -99 for the built-in tiers
+                    if score < 2:
+                        if not self.keep_rejected:
+                            continue
+                        score = -99
+                    if link not in seen_links:
                         seen_links.add(link)
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'summary': text_content[:500],
-                            'source': feed.feed.get('title', 'RSS Feed'),
-                            'published': entry.get('published', ''),
-                            'score': score,
-                            'category': self.category
-                        })
+                        item = NewsItem(
+                            title=title,
+                            link=link,
+                            summary=text_content[:500],
+                            source=feed.feed.get('title', 'RSS Feed'),
+                            published=entry.get('published', ''),
+                            score=score,
+                            category=self.category
+                        )
+                        if full_text and len(full_text) > 500:
+                            item.full_text = full_text # Compressed, only inflated if someone reads it
+                        news_items.append(item)
             except Exception as e:
                 print(f"Error fetching RSS {feed_url}: {e}")
+                self.last_error = str(e)
+                if self.health and not recorded:
+                    self.health.record_failure(feed_url, time.perf_counter() - start, str(e))
                 
         return news_items
 
@@ -161,6 +241,13 @@ class RSSScraper(NewsScraper):
         for kw in KEYWORD_TIER_C["keywords"]:
             if kw.lower() in text:
                 score += KEYWORD_TIER_C["score"]
+
+        # Korean feeds: the domestic (NAVER_QUERIES) scale, so they rank alongside Naver items
+        if self.category == "domestic":
+            domestic = score_domestic(title, content)
+            if domestic < 0:
+                return domestic
+            score = max(score, domestic)
                 
         return score
 
@@ -173,43 +260,30 @@ class RSSScraper(NewsScraper):
     def _is_relevant(self, title: str, content: str, score: int) -> bool:
         return score >= 2
 
-    def _fetch_full_content(self, url: str) -> str:
+    def _fetch_full_contents(self, urls: List[str]) -> Dict[str, str]:
         """
-        Pass 2: Fetch article body or Meta Description
+        Pass 2: Fetch article body or Meta Description (url -> text), in the extraction worker pool
         """
-        if not url: return ""
+        texts = {}
+        todo = []
+        for url in dict.fromkeys(u for u in urls if u):
+            if self.content_cache is not None and url in self.content_cache:
+                texts[url] = self.content_cache[url]
+            else:
+                todo.append(url)
+        if not todo:
+            return texts
         
-        try:
-            # Random User-Agent to avoid blocking
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            resp = requests.get(url, headers=headers, timeout=5)
-            if resp.status_code != 200:
-                print(f"Failed to fetch {url}: {resp.status_code}")
-                return ""
-            
-            resp.encoding = resp.apparent_encoding
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # 1. Try <article>
-            article = soup.find('article')
-            if article:
-                return article.get_text(strip=True)
-            
-            # 2. Try common content divs
-            for class_name in ['main-content', 'article-body', 'post-content', 'entry-content', 'news_body', 'view_con']:
-                content_div = soup.find('div', class_=class_name)
-                if content_div:
-                    return content_div.get_text(strip=True)
-            
-            # 3. Fallback: Meta Description
-            meta_desc = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
-            if meta_desc and meta_desc.get('content'):
-                return "[Meta] " + meta_desc['content']
-            
-            return ""
-            
-        except Exception as e:
-            print(f"Error fetching full content for {url}: {e}")
-            return ""
+        dl = deadline.current()
+        results = self.extractor.fetch_many(todo, timeout=dl.timeout(Config.HTTP_TIMEOUT),
+                                            budget=dl.timeout(Config.HTTP_TIMEOUT * len(todo)))
+        for url, result in results.items():
+            if result["error"]:
+                print(f"Error fetching full content for {url}: {result['error']}")
+            elif result["status"] != 200:
+                print(f"Failed to fetch {url}: {result['status']}")
+            elif result["text"]:
+                texts[url] = result["text"]
+                if self.content_cache is not None:
+                    self.content_cache[url] = result["text"]
+        return texts
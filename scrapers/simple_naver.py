@@ -1,37 +1,36 @@
-import urllib.request
-import urllib.parse
-import json
-import ssl
-from typing import List, Dict
+from typing import List
 from config import Config
+from models import NewsItem
+from http_client import get_client
+import deadline
+from .domestic_scoring import score_domestic
 
 class SimpleNaverScraper:
-    def __init__(self):
+    def __init__(self, keep_rejected: bool = False):
         self.last_error = "Init"
+        self.keep_rejected = keep_rejected # Keep excluded items (score -99) for per-profile filtering
 
-    def fetch_news(self) -> List[Dict]:
+    def fetch_news(self) -> List[NewsItem]:
         if not Config.NAVER_CLIENT_ID or not Config.NAVER_CLIENT_SECRET:
             self.last_error = "Keys Missing"
             return []
 
         # 1. Very Basic Query (Korean Only)
         # "AI" might be ambiguous. "인공지능" is safe.
-        encText = urllib.parse.quote("인공지능")
-        url = "https://openapi.naver.com/v1/search/news.json?query=" + encText + "&display=10&sort=date"
-        
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", Config.NAVER_CLIENT_ID)
-        request.add_header("X-Naver-Client-Secret", Config.NAVER_CLIENT_SECRET)
+        url = "https://openapi.naver.com/v1/search/news.json"
+        params = {'query': "인공지능", 'display': 10, 'sort': 'date'}
+        headers = {
+            "X-Naver-Client-Id": Config.NAVER_CLIENT_ID,
+            "X-Naver-Client-Secret": Config.NAVER_CLIENT_SECRET
+        }
         
         try:
-            # Bypass SSL verification if needed (though not recommended, good for debugging)
-            context = ssl._create_unverified_context()
-            response = urllib.request.urlopen(request, context=context)
-            rescode = response.getcode()
+            # Shared client: pooled keep-alive, verified TLS, bounded body
+            response = get_client().get(url, params=params, headers=headers, timeout=deadline.current().timeout(Config.HTTP_TIMEOUT))
+            rescode = response.status_code
             
             if rescode == 200:
-                response_body = response.read()
-                data = json.loads(response_body.decode('utf-8'))
+                data = response.json()
                 items = data.get('items', [])
                 
                 self.last_error = f"Success (Found {len(items)})"
@@ -39,13 +38,22 @@ class SimpleNaverScraper:
                 # Convert to standard format
                 clean_items = []
                 for item in items:
-                    clean_items.append({
-                        'title': item['title'].replace('<b>', '').replace('</b>', '').replace('&quot;', '"'),
-                        'link': item['originallink'] or item['link'],
-                        'summary': item['description'].replace('<b>', '').replace('</b>', ''),
-                        'source': 'Naver News (Simple)',
-                        'published': item['pubDate']
-                    })
+                    title = item['title'].replace('<b>', '').replace('</b>', '').replace('&quot;', '"')
+                    summary = item['description'].replace('<b>', '').replace('</b>', '')
+                    score = score_domestic(title, summary)
+                    if score < 0:
+                        print(f"  [Reject] {title[:30]}... (Negative Score)")
+                        if not self.keep_rejected:
+                            continue
+                    clean_items.append(NewsItem(
+                        title=title,
+                        link=item['originallink'] or item['link'],
+                        summary=summary,
+                        source='Naver News (Simple)',
+                        published=item['pubDate'],
+                        score=score,
+                        category='domestic'
+                    ))
                 return clean_items
             else:
                 self.last_error = f"HTTP {rescode}"
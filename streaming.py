@@ -0,0 +1,77 @@
+import json
+from typing import Dict
+
+# strict=False: LLMs put raw newlines inside JSON strings
+_DECODER = json.JSONDecoder(strict=False)
+_SKIP = " \t\r\n,"
+
+
+class JsonFieldStream:
+    """
+    Top-level fields of a JSON object as they complete in a streamed reply.
+    feed() each chunk; it returns the fields completed by that chunk. Text before the first '{'
+    (``` fences, chatter) is skipped. A value only counts once a delimiter follows it ("8" may
+    still become "8.5"). Malformed input just stops yielding fields: the caller still has the text.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = None # Where the next key starts (None: object not opened yet)
+        self.fields: Dict[str, object] = {}
+        self.closed = False
+
+    def feed(self, chunk: str) -> Dict[str, object]:
+        self.buf += chunk or ""
+        new = {}
+        if self.pos is None:
+            start = self.buf.find("{")
+            if start < 0:
+                return new
+            self.pos = start + 1
+        buf = self.buf
+        while not self.closed:
+            i = self._skip(self.pos, _SKIP)
+            if i >= len(buf):
+                break
+            if buf[i] == "}":
+                self.closed = True
+                break
+            try:
+                key, j = _DECODER.raw_decode(buf, i)
+            except ValueError:
+                break # Key not complete yet
+            if not isinstance(key, str):
+                self.closed = True # Not a JSON object after all
+                break
+            j = self._skip(j, " \t\r\n")
+            if j >= len(buf) or buf[j] != ":":
+                break
+            j = self._skip(j + 1, " \t\r\n")
+            try:
+                value, end = _DECODER.raw_decode(buf, j)
+            except ValueError:
+                break # Value not complete yet
+            if end >= len(buf) or buf[end] not in _SKIP + "}":
+                break # Could still grow: "8" / "8." may be the start of "8.5"
+            self.fields[key] = new[key] = value
+            self.pos = end
+        return new
+
+    def _skip(self, i: int, chars: str) -> int:
+        while i < len(self.buf) and self.buf[i] in chars:
+            i += 1
+        return i
+
+
+def read_stream(pieces, stop=None):
+    """
+    Join streamed text pieces; with stop(fields so far) -> True, quit reading as soon as it says so.
+    Returns (text, stopped early).
+    """
+    parser = JsonFieldStream() if stop else None
+    text = []
+    for piece in pieces:
+        text.append(piece)
+        if parser and parser.feed(piece) and stop(parser.fields):
+            return "".join(text), True
+    return "".join(text), False
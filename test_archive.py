@@ -0,0 +1,96 @@
+import sqlite3
+import time
+
+import pytest
+
+import archive
+from archive import NewsArchive
+from models import NewsItem
+
+DAY = 86400
+
+
+def _item(title: str, summary: str = "", link: str = None, **kwargs) -> NewsItem:
+    return NewsItem(title=title, summary=summary, link=link or f"https://ex.com/{title}", source="src", **kwargs)
+
+
+@pytest.fixture
+def store():
+    s = NewsArchive(":memory:")
+    if s.tokenizer != "trigram":
+        pytest.skip("SQLite without the FTS5 trigram tokenizer")
+    yield s
+    s.close()
+
+
+def _titles(rows):
+    return sorted(row[2] for row in rows)
+
+
+def test_trigram_search_matches_inside_korean_words(store):
+    store.store_run([_item("클로드가 코딩 시장 흔든다"), _item("제미나이 업데이트", "클로드는 뒤처져"),
+                     _item("날씨 소식")])
+    assert _titles(store.search("클로드")) == ["제미나이 업데이트", "클로드가 코딩 시장 흔든다"]
+    assert store.search("없는단어") == []
+    assert store.search('"quoted" OR') == [] # Operators are literal, not FTS syntax
+
+
+def test_short_terms_use_a_like_scan(store):
+    now = time.time()
+    store.store_run([_item("OpenAI 발표"), _item("AI 도입 사례")], now=now - 2 * DAY)
+    store.store_run([_item("생성형 AI 확산")], now=now)
+    store.store_run([_item("옛날 AI 기사")], now=now - 30 * DAY)
+    assert store._use_like("AI") and not store._use_like("클로드")
+    assert _titles(store.search("AI", days=7)) == ["AI 도입 사례", "OpenAI 발표", "생성형 AI 확산"]
+    day = lambda ts: time.strftime("%Y-%m-%d", time.localtime(ts))
+    assert store.trend("AI", days=7) == [(day(now - 2 * DAY), 2), (day(now), 1)]
+    assert store.trend("발표", days=7) == [(day(now - 2 * DAY), 1)]
+
+
+def test_unicode61_fallback_without_trigram(monkeypatch):
+    class _NoTrigram(sqlite3.Connection):
+        def execute(self, sql, *args):
+            if "tokenize='trigram'" in sql:
+                raise sqlite3.OperationalError("no such tokenizer: trigram")
+            return super().execute(sql, *args)
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(archive.sqlite3, "connect", lambda *a, **k: connect(*a, factory=_NoTrigram, **k))
+    store = NewsArchive(":memory:")
+    assert store.tokenizer == "unicode61"
+    store.store_run([_item("클로드 출시"), _item("클로드가 코딩"), _item("AI 도입")])
+    assert not store._use_like("AI") # Word-level index serves short terms itself
+    assert _titles(store.search("AI")) == ["AI 도입"]
+    assert _titles(store.search("클로드")) == ["클로드 출시"] # Whole words only
+    store.close()
+
+
+def test_prune_drops_old_rows_and_their_index_entries(store):
+    now = time.time()
+    old, fresh = _item("오래된 클로드 기사"), _item("새 클로드 기사")
+    store.store_run([old], delivered=[old], now=now - 40 * DAY)
+    store.mark_delivered([old], now=now - 40 * DAY, profile="dev")
+    store.store_run([fresh], now=now)
+    assert store.prune(retention_days=30) == 1
+    assert store.count() == 1 and _titles(store.search("클로드")) == ["새 클로드 기사"]
+    assert store.conn.execute("SELECT COUNT(*) FROM deliveries").fetchone()[0] == 0
+
+
+def test_old_database_gets_the_new_column(tmp_path):
+    path = str(tmp_path / "archive.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, link TEXT NOT NULL UNIQUE, norm_title TEXT NOT NULL, "
+                 "title TEXT NOT NULL, summary TEXT, source TEXT, category TEXT, published TEXT, score REAL, "
+                 "agent_score REAL, agent_reason TEXT, processed_summary TEXT, first_seen REAL NOT NULL, "
+                 "last_seen REAL NOT NULL, delivered_at REAL)")
+    conn.execute("INSERT INTO articles (link, norm_title, title, agent_score, agent_reason, first_seen, last_seen) "
+                 "VALUES ('https://ex.com/a', 'a', 'a', 8, 'LLM 평가', 1, 1)")
+    conn.commit()
+    conn.close()
+
+    store = NewsArchive(path)
+    columns = {row[1] for row in store.conn.execute("PRAGMA table_info(articles)")}
+    assert "agent_source" in columns
+    store.store_run([_item("b", agent_score=9.0, agent_source="llm")])
+    assert sorted(title for title, _, _ in store.labeled()) == ["a", "b"] # Pre-migration rows still count
+    store.close()
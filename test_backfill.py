@@ -0,0 +1,84 @@
+import datetime
+from email.utils import format_datetime
+
+from archive import NewsArchive
+from backfill import Backfill, Checkpoint, NAVER_MAX_START, NAVER_PAGE, format_report, parse_published, plan_shards
+from models import NewsItem
+from scrapers.api_scraper import NaverNewsScraper
+
+SEPT_1, SEPT_2 = datetime.date(2026, 9, 1), datetime.date(2026, 9, 2)
+
+
+def _pub(day: int, hour: int = 12, month: int = 9) -> str:
+    return format_datetime(datetime.datetime(2026, month, day, hour).astimezone())
+
+
+def _backfill(tmp_path) -> Backfill:
+    return Backfill(SEPT_1, SEPT_2, archive=NewsArchive(str(tmp_path / "a.db")),
+                    checkpoint=Checkpoint(str(tmp_path / "cp.json")))
+
+
+def test_plan_has_stable_ids_per_day():
+    shards = plan_shards(SEPT_1, SEPT_2, profiles=[], naver=False)
+    ids = [s["id"] for s in shards]
+    assert len(ids) == len(set(ids))
+    assert "gnews:2026-09-01" in ids and "gnews:2026-09-02" in ids
+    assert ids == [s["id"] for s in plan_shards(SEPT_1, SEPT_2, profiles=[], naver=False)]
+
+
+def test_ingest_keeps_range_and_dedups_titles(tmp_path):
+    bf = _backfill(tmp_path)
+    items = [NewsItem(title="오픈AI 새 모델 공개", link="a", source="s", published=_pub(1)),
+             NewsItem(title="오픈AI 새모델  공개", link="b", source="s", published=_pub(1)), # Same title
+             NewsItem(title="범위 밖의 AI 기사", link="c", source="s", published=_pub(30, month=8))]
+    assert bf.ingest(items, "naver") == 1
+    assert bf.ingest(items[:1], "naver") == 0 # Seen already
+    first_seen = bf.archive.conn.execute("SELECT first_seen FROM articles WHERE link = 'a'").fetchone()[0]
+    assert first_seen == parse_published(_pub(1))
+
+
+def test_naver_shard_stops_past_range_and_resumes_from_cursor(tmp_path, monkeypatch):
+    # Newest first: page 1 is after the range, page 2 inside it, page 3 reaches back before it
+    pages = {1: [_pub(3)] * NAVER_PAGE, 101: [_pub(2)] * NAVER_PAGE, 201: [_pub(1, 1)] + [_pub(28, month=8)] * 99}
+    calls = []
+
+    def search_page(self, query, start=1, display=100, excludes=None):
+        calls.append(start)
+        if len(calls) == 2 and fail_once:
+            raise RuntimeError("network down")
+        return [{"title": f"인공지능 {start}-{k}", "link": f"{start}/{k}", "pubDate": p, "description": ""}
+                for k, p in enumerate(pages[start])]
+
+    monkeypatch.setattr(NaverNewsScraper, "search_page", search_page)
+    shard = {"id": "naver:인공지능", "kind": "naver", "query": "인공지능", "excludes": None}
+
+    fail_once = True
+    bf = _backfill(tmp_path)
+    try:
+        bf.run_naver(shard)
+    except RuntimeError:
+        pass
+    assert bf.checkpoint.get(shard["id"]) == {"done": False, "items": 0, "cursor": 101, "truncated": False}
+
+    fail_once = False
+    calls.clear()
+    bf = _backfill(tmp_path) # Fresh process: state comes from the checkpoint file
+    bf.run_naver(shard)
+    assert calls == [101, 201]
+    state = bf.checkpoint.get(shard["id"])
+    assert state["done"] and state["items"] == NAVER_PAGE + 1
+
+
+def test_naver_shard_that_hits_the_cap_is_truncated(tmp_path, monkeypatch):
+    # A busy query: every page up to the API's last one is still newer than the range
+    monkeypatch.setattr(NaverNewsScraper, "search_page", lambda self, query, start=1, display=100, excludes=None: [
+        {"title": f"인공지능 {start}-{k}", "link": f"{start}/{k}", "pubDate": _pub(5), "description": ""}
+        for k in range(NAVER_PAGE)])
+    shard = {"id": "naver:인공지능", "kind": "naver", "query": "인공지능", "excludes": None}
+    bf = _backfill(tmp_path)
+    bf.run_naver(shard)
+    state = bf.checkpoint.get(shard["id"])
+    assert state["done"] and state["truncated"] and state["items"] == 0 and state["cursor"] > NAVER_MAX_START
+    report = {"shards": 1, "ran": 1, "failed": 0, "pages": 10, "fetched": {"naver": 1000}, "stored": {},
+              "seconds": 1.0, "truncated": [shard["id"]]}
+    assert "1 Naver shard(s) hit the API's" in format_report(report)
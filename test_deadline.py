@@ -0,0 +1,74 @@
+import threading
+
+import deadline
+from deadline import NOTIFY_RESERVE_SECONDS, Deadline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stages_wind_down_in_reserve_order():
+    clock = _Clock()
+    dl = Deadline(1000, clock=clock)
+    assert all(dl.allows(stage) for stage in deadline.STAGE_RESERVES)
+    clock.now += 600 # 400s left: below full_content's 45%, above feeds' 35%
+    assert not dl.allows("full_content") and dl.allows("feeds")
+    clock.now += 200 # 200s left
+    assert [dl.allows(s) for s in ("feeds", "llm_score", "llm_summary")] == [False, False, True]
+    clock.now += 250 # Past the deadline: the brief still goes out
+    assert dl.expired() and not dl.allows("llm_summary") and dl.allows("notify")
+
+
+def test_short_deadlines_keep_the_notify_reserve():
+    clock = _Clock()
+    dl = Deadline(100, clock=clock) # 12% of 100s is less than the fixed notify reserve
+    clock.now += 100 - NOTIFY_RESERVE_SECONDS - 1
+    assert dl.allows("llm_summary")
+    clock.now += 2
+    assert not dl.allows("llm_summary")
+
+
+def test_budget_and_timeout_shrink_with_the_clock():
+    clock = _Clock()
+    dl = Deadline(1000, clock=clock)
+    assert dl.budget("llm_score") == 750 and dl.timeout(15) == 15
+    clock.now += 960
+    assert dl.budget("llm_score") == 1.0 and dl.timeout(15) == 10 # 40s left - 30s reserve
+    clock.now += 20
+    assert dl.timeout(15) == 1.0 # Floor: never a zero / negative timeout
+    unlimited = Deadline(None, clock=clock)
+    assert unlimited.budget("feeds") is None and unlimited.timeout(15) == 15 and unlimited.allows("full_content")
+
+
+def test_sleep_refuses_when_the_stage_would_run_out():
+    clock = _Clock()
+    dl = Deadline(1000, clock=clock)
+    clock.now += 800 # 200s left, llm_score needs 250 in reserve
+    assert dl.sleep(60, stage="llm_score") is False
+    assert dl.sleep(0.01, stage="llm_summary") is True # 200 - 0.01 > 120
+    assert dl.sleep(90, stage="llm_summary") is False
+
+
+def test_current_falls_back_to_the_latest_started_deadline(monkeypatch):
+    monkeypatch.setattr(deadline, "_local", threading.local())
+    monkeypatch.setattr(deadline, "_latest", None)
+    assert deadline.current().seconds is None # Nothing started: unlimited
+    poll = deadline.start(600)
+    seen = {}
+
+    def digest_thread():
+        seen["before"] = deadline.current() # Helper thread without its own: the latest one
+        seen["own"] = deadline.start(1200)
+        seen["after"] = deadline.current()
+
+    thread = threading.Thread(target=digest_thread)
+    thread.start()
+    thread.join()
+    assert seen["before"] is poll and seen["after"] is seen["own"]
+    assert deadline.current() is poll # This thread keeps its own deadline
+    assert deadline.start(30, elapsed=10).remaining() <= 20
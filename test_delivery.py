@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from telegram.error import ChatMigrated, Forbidden, TelegramError
+
+from delivery import DeliveryQueue, split_message
+
+
+def test_split_keeps_blocks_whole_and_header_on_first_message():
+    blocks = [f"{k}. " + "x" * 40 + "\n\n" for k in range(10)]
+    chunks = split_message("HEADER\n\n", blocks, limit=100)
+    assert chunks[0].startswith("HEADER") and all(len(c) <= 100 for c in chunks)
+    assert "".join(chunks).count("x" * 40) == 10
+    assert all(c.lstrip("0123456789").startswith(".") for c in chunks[1:]) # Cut at block boundaries only
+
+
+def test_oversized_block_is_cut_at_line_breaks():
+    block = "".join(f"line {k}\n" for k in range(50))
+    chunks = split_message("H\n", [block], limit=60)
+    assert all(len(c) <= 60 for c in chunks) and all(c.endswith(tuple("0123456789")) for c in chunks)
+    assert "".join(c + "\n" for c in chunks).replace("H\n", "", 1) == block
+
+
+class _Bot:
+    def __init__(self, errors):
+        self.errors, self.sent = errors, []
+
+    async def send_message(self, chat_id, text):
+        if chat_id in self.errors:
+            raise self.errors[chat_id]
+        self.sent.append((chat_id, text))
+
+
+def test_failing_chats_do_not_block_the_others():
+    bot = _Bot({"2": ChatMigrated(-100), "3": Forbidden("bot was blocked"), "4": TelegramError("conflict")})
+    queue = asyncio.run(DeliveryQueue(bot, concurrency=2).deliver(["1", "2", "3", "4", "5"], ["brief"]))
+    assert sorted(chat for chat, _ in bot.sent) == ["1", "5"]
+    assert (queue.sent, queue.failed, queue.retries) == (2, 3, 0)
+    assert "ChatMigrated" in queue.failures["2"] and set(queue.failures) == {"2", "3", "4"}
+
+
+def test_sends_from_two_event_loops_take_turns_on_the_bot():
+    import threading
+
+    from notifier import TelegramNotifier
+
+    class _SharedBot(_Bot):
+        def __init__(self):
+            super().__init__({})
+            self.open, self.overlaps = 0, 0
+
+        async def __aenter__(self):
+            self.open += 1
+            self.overlaps += self.open > 1
+            return self
+
+        async def __aexit__(self, *exc):
+            await asyncio.sleep(0.02) # Shutting down the HTTP client
+            self.open -= 1
+
+        async def send_message(self, chat_id, text):
+            await asyncio.sleep(0.01)
+            await super().send_message(chat_id, text)
+
+    notifier = TelegramNotifier()
+    notifier._bot = bot = _SharedBot()
+    # Daemon: a poll's breaking alert and the digest, each in its own thread + asyncio.run
+    threads = [threading.Thread(target=lambda c=chat: asyncio.run(notifier.deliver([f"msg {c}"], [c])))
+               for chat in ("alert", "digest")]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    assert bot.overlaps == 0 and sorted(chat for chat, _ in bot.sent) == ["alert", "digest"]
+
+
+def test_cancelled_wait_for_the_bot_does_not_keep_it_locked():
+    from notifier import TelegramNotifier
+
+    class _ContextBot(_Bot):
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    notifier = TelegramNotifier()
+    notifier._bot = _ContextBot({})
+
+    async def cancelled_while_waiting():
+        task = asyncio.create_task(notifier.deliver(["msg"], ["a"]))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    notifier._send_lock.acquire() # Another loop is sending
+    asyncio.run(cancelled_while_waiting())
+    notifier._send_lock.release()
+    time.sleep(0.1)
+    assert notifier._send_lock.acquire(blocking=False) # Nobody took it behind our back
+    notifier._send_lock.release()
+    asyncio.run(notifier.deliver(["msg"], ["a"]))
+    assert notifier._bot.sent == [("a", "msg")]
@@ -0,0 +1,26 @@
+from scrapers.domestic_scoring import score_domestic
+
+
+def test_particles_and_spacing():
+    # 클로드가 / 클로드는 and 생성형AI / 생성형 AI score the same
+    assert score_domestic("클로드가 코딩 에이전트 시장 흔든다") == score_domestic("클로드는 코딩 에이전트 시장 흔든다")
+    assert score_domestic("생성형AI 도입") == score_domestic("생성형 AI 도입") > 0
+
+
+def test_latin_terms_need_latin_boundaries():
+    assert score_domestic("챗GPT로 보고서 작성") >= 10
+    assert score_domestic("RAG를 붙인 검색") >= 10
+    assert score_domestic("STORAGE 가격 인상") == 0
+
+
+def test_title_outweighs_description_and_excludes_reject():
+    assert score_domestic("클로드 업데이트") > score_domestic("업데이트 소식", "클로드 업데이트")
+    assert score_domestic("AI 웹툰 플랫폼 출시", "생성형 AI") == -99
+
+
+def test_excludes_match_whole_words_only():
+    relevant = score_domestic("오픈AI GPT-5 출시, 생성형 AI 판도 바꿔")
+    assert relevant > 0
+    assert score_domestic("오픈AI GPT-5 출시, 생성형 AI 업계의 게임체인저") >= relevant
+    assert score_domestic("생성형 AI로 게임 업계 지각변동") == -99
+    assert score_domestic("생성형 AI가 게임을 만든다") == -99
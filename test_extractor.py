@@ -0,0 +1,111 @@
+from extractor import extract_html
+
+BODY = "<p>" + "인공지능 도입 사례가 늘고 있다. " * 40 + "</p>"
+
+
+def test_article_first():
+    html = "<html><body><div class='view_con'>짧은 글</div><article>본문<script>x()</script></article></body></html>"
+    text, selector = extract_html(html.encode("utf-8"), "utf-8")
+    assert selector == "article"
+    assert text == "본문"
+
+
+def test_class_match_and_encoding():
+    html = f"<html><head><meta charset='euc-kr'></head><body><div class='wrap news_body'>{BODY}</div></body></html>"
+    text, selector = extract_html(html.encode("euc-kr"), "euc-kr")
+    assert selector == "div.news_body"
+    assert text.startswith("인공지능 도입 사례가")
+
+
+def test_meta_fallback():
+    html = "<html><head><meta property='og:description' content='요약'></head><body><p>x</p></body></html>"
+    assert extract_html(html.encode("utf-8")) == ("[Meta] 요약", "meta")
+
+
+def test_stops_after_content():
+    # Everything after the content node is never parsed (a broken tail would otherwise still be read)
+    html = f"<html><body><div class='article-body'>{BODY}</div>".encode("utf-8") + b"<div>" * 200000
+    text, selector = extract_html(html, "utf-8")
+    assert selector == "div.article-body"
+
+
+def test_hint_wins_over_discovery():
+    html = f"<html><body><article>{BODY}</article><div id='articleBody'>{BODY}</div></body></html>"
+    text, selector = extract_html(html.encode("utf-8"), "utf-8", hint="div#articleBody")
+    assert selector == "div#articleBody"
+
+
+def test_rule_learned_and_replaced():
+    from domain_rules import DomainRuleStore
+    rules = DomainRuleStore(min_trials=3)
+    rules.record("news.example.kr", None, "div.view_con", good=True)
+    assert rules.hint("news.example.kr") == "div.view_con"
+    for _ in range(3):
+        rules.record("news.example.kr", "div.view_con", "article", good=True)
+    # Stale rule dropped, the selector that actually worked is learned instead
+    assert rules.hint("news.example.kr") == "article"
+    assert rules.run_stats["dropped"] == 1
+
+
+def test_encoding_from_header_meta_or_prefix():
+    from extractor import header_charset, sniff_encoding
+    assert header_charset("text/html; charset=ks_c_5601-1987") == "cp949"
+    assert header_charset("text/html") is None
+    assert sniff_encoding(b"<html><head><meta charset='EUC-KR'>") == "cp949"
+    assert sniff_encoding(f"<p>{BODY}</p>".encode("utf-8")) == "utf-8"
+
+
+def test_incremental_feed_reports_done():
+    from extractor import ArticleExtractor
+    extractor = ArticleExtractor(hint="div.view_con")
+    head = f"<html><head><meta charset='euc-kr'></head><body><div class='view_con'>{BODY}</div>".encode("euc-kr")
+    assert extractor.feed(head)
+    text, selector = extractor.result()
+    assert selector == "div.view_con" and text.startswith("인공지능")
+
+
+def _serve(pages):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body, sized = pages[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if sized:
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for k in range(0, len(body), 8192):
+                piece = body[k:k + 8192]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_cut_only_when_the_page_had_more_to_send():
+    from extractor import fetch_and_extract
+    page = f"<html><body><div class='article-body'>{BODY}</div></body></html>".encode("utf-8")
+    tail = b"<div>" + b"x" * 200_000 + b"</div>"
+    server, base = _serve({"/small": (page, True), "/long": (page + tail, True), "/chunked": (page + tail, False)})
+    try:
+        small = fetch_and_extract(base + "/small", 5)
+        assert small["selector"] == "div.article-body" and not small["cut"] and small["bytes_saved"] == 0
+        long = fetch_and_extract(base + "/long", 5)
+        assert long["cut"] and long["bytes_saved"] > 100_000
+        chunked = fetch_and_extract(base + "/chunked", 5)
+        assert chunked["cut"] and chunked["bytes_saved"] is None # No Content-Length: unknown, not 0
+    finally:
+        server.shutdown()
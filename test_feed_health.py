@@ -0,0 +1,65 @@
+from feed_health import FeedHealthTracker
+
+URL = "https://example.com/rss"
+HOUR = 3600
+
+
+def test_quarantine_after_threshold_with_doubling_backoff():
+    health = FeedHealthTracker(quarantine_after=3, base_backoff=HOUR, max_backoff=5 * HOUR)
+    now = 1_000_000.0
+    for _ in range(2):
+        health.record_failure(URL, 1.0, "HTTP 503", now=now)
+    assert health.should_poll(URL, now=now) == (True, "")
+
+    until = []
+    for _ in range(4):
+        health.record_failure(URL, 1.0, "HTTP 503", now=now)
+        until.append(health.feeds[URL]["quarantined_until"] - now)
+    assert until == [HOUR, 2 * HOUR, 4 * HOUR, 5 * HOUR] # Doubles per extra failure, capped
+    polled, reason = health.should_poll(URL, now=now + HOUR)
+    assert not polled and "quarantined" in reason and "HTTP 503" in reason
+    assert health.skipped() == [(URL, reason)]
+
+
+def test_success_lifts_the_quarantine():
+    health = FeedHealthTracker(quarantine_after=1, base_backoff=HOUR)
+    now = 1_000_000.0
+    health.record_failure(URL, 1.0, "timeout", now=now)
+    assert not health.should_poll(URL, now=now + 1)[0]
+    health.record_success(URL, 0.5, new_items=5, now=now + 2)
+    rec = health.feeds[URL]
+    assert rec["consecutive_failures"] == 0 and rec["quarantined_until"] == 0
+    assert health.should_poll(URL, now=now + 3) == (True, "")
+    health.record_failure(URL, 1.0, "timeout", now=now + 4) # Counting starts over: base backoff again
+    assert rec["quarantined_until"] == now + 4 + HOUR
+
+
+def test_quiet_feeds_are_polled_less_often_up_to_max_interval():
+    health = FeedHealthTracker(min_interval=600, max_interval=6 * HOUR)
+    now = 1_000_000.0
+    health.record_success(URL, 0.2, new_items=3, now=now)
+    assert health.feeds[URL]["next_poll_at"] == 0 # Busy feed: every run
+
+    health.record_success(URL, 0.2, new_items=0, now=now) # EWMA 0.7 * 3 = 2.1
+    health.record_success(URL, 0.2, new_items=0, now=now) # 1.47
+    assert health.feeds[URL]["next_poll_at"] == 0
+    health.record_success(URL, 0.2, new_items=0, now=now) # 1.03
+    health.record_success(URL, 0.2, new_items=0, now=now) # 0.72: fewer than one new item per poll
+    avg = health.feeds[URL]["new_items_avg"]
+    assert abs(avg - 3 * 0.7 ** 4) < 1e-9
+    assert health.feeds[URL]["next_poll_at"] == now + 600 / avg
+    polled, reason = health.should_poll(URL, now=now + 60)
+    assert not polled and "slow feed" in reason
+
+    for _ in range(30):
+        health.record_success(URL, 0.2, new_items=0, now=now)
+    assert health.feeds[URL]["next_poll_at"] == now + 6 * HOUR
+    assert health.should_poll(URL, now=now + 6 * HOUR + 1) == (True, "")
+
+
+def test_state_survives_a_restart(tmp_path):
+    path = str(tmp_path / "feed_health.json")
+    health = FeedHealthTracker(path, quarantine_after=1)
+    health.record_failure(URL, 1.0, "HTTP 500", now=1_000_000.0)
+    health.save()
+    assert FeedHealthTracker(path).feeds[URL]["quarantined_until"] == 1_000_000.0 + 3600
@@ -0,0 +1,116 @@
+import time
+
+from hedging import EFFECTIVE, PRIMARY, HedgePolicy
+from llm_budget import LlmBudget
+from metrics import percentile
+from processor import ContentProcessor
+from prompts import SCORING, TRANSLATION
+
+
+def _processor(monkeypatch, gemini_delays, pct=90, max_rate=0.2):
+    processor = ContentProcessor()
+    processor._model = processor._openai_client = object() # Only their presence is checked
+    processor.hedges = {task: HedgePolicy(pct, max_rate=max_rate, min_samples=10, name=task) for task in processor.hedges}
+    processor._budget = LlmBudget(":memory:", 0, 0, 0, 0) # Unlimited
+    delays = iter(gemini_delays)
+
+    def gemini(prompt, stop=None):
+        time.sleep(next(delays))
+        return "gemini", None
+
+    def openai(prompt, stop=None):
+        time.sleep(0.02)
+        return "openai", None
+
+    monkeypatch.setattr(processor, "_gemini_text", gemini)
+    monkeypatch.setattr(processor, "_openai_text", openai)
+    return processor
+
+
+def test_no_hedging_until_enough_samples():
+    policy = HedgePolicy(90, min_samples=3)
+    for seconds in (1.0, 2.0):
+        policy.record(PRIMARY, seconds)
+    assert policy.delay() is None
+    policy.record(PRIMARY, 3.0)
+    assert policy.delay() == 3.0
+
+
+def test_hedge_rate_is_capped():
+    policy = HedgePolicy(90, max_rate=0.1)
+    claimed = 0
+    for _ in range(50):
+        policy.delay()
+        claimed += policy.take_hedge()
+    assert claimed == 5
+
+
+def test_slow_primary_is_hedged_and_tail_drops(monkeypatch):
+    # Every 5th Gemini call stalls: the effective tail should be close to the fallback's latency
+    delays = [0.3 if k % 5 == 4 else 0.01 for k in range(40)]
+    processor = _processor(monkeypatch, delays, pct=50, max_rate=0.3)
+    answers = [processor._call_gemini("prompt") for _ in delays]
+    hedge = processor.hedges[SCORING.name]
+    assert answers.count("openai") == hedge.secondary_wins > 0
+    assert hedge.hedges <= 0.3 * hedge.calls
+    effective = hedge.values(EFFECTIVE)
+    assert percentile(effective[10:], 95) < 0.2 # Learned delay (p50 ~ 0.01s) + OpenAI (0.02s)
+
+
+def test_off_by_default(monkeypatch):
+    processor = _processor(monkeypatch, [0.01] * 20, pct=0)
+    assert {processor._call_gemini("prompt") for _ in range(20)} == {"gemini"}
+    assert processor.hedges[SCORING.name].hedges == 0
+
+
+def test_scoring_and_translation_learn_separate_delays(monkeypatch):
+    # Scoring replies stop right after 'score'; translations take several times longer, every time
+    processor = _processor(monkeypatch, [0.01] * 12 + [0.08] * 10, pct=90, max_rate=0.5)
+    for _ in range(12):
+        processor._call_gemini("score prompt", task=SCORING.name)
+    for _ in range(10):
+        processor._call_gemini("translate prompt", task=TRANSLATION.name)
+    scoring, translation = processor.hedges[SCORING.name], processor.hedges[TRANSLATION.name]
+    assert scoring.delay() < 0.05 and translation.delay() >= 0.08
+    assert translation.hedges == 0 # A normal translation is never "slow" by the scoring calls' standard
+    assert translation.report().startswith(TRANSLATION.name)
+
+
+def test_invalid_fast_answer_does_not_beat_a_valid_one():
+    from concurrent.futures import ThreadPoolExecutor
+    from hedging import first_valid
+
+    def reply(text, seconds):
+        time.sleep(seconds)
+        return text
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(reply, '{"score": 8.0, "reason": "ok"}', 0.1), pool.submit(reply, "", 0.01)]
+        assert first_valid(futures, 2, ContentProcessor._valid_score) == (0, '{"score": 8.0, "reason": "ok"}')
+        futures = [pool.submit(reply, "Sorry, I can't help", 0.01), pool.submit(reply, "", 0.02)]
+        assert first_valid(futures, 2, ContentProcessor._valid_score) == (0, "Sorry, I can't help")
+
+
+def test_hung_gemini_call_does_not_block_exit():
+    import subprocess
+    import sys
+
+    script = """
+import time
+from concurrent.futures import TimeoutError
+from config import Config
+from llm_budget import LlmBudget
+from processor import ContentProcessor
+Config.LLM_TIMEOUT = 0.2
+processor = ContentProcessor()
+processor._model, processor._openai_client = object(), None
+processor._budget = LlmBudget(":memory:", 0, 0, 0, 0)
+processor._gemini_text = lambda prompt, stop=None: time.sleep(60) # SDK socket that never answers
+try:
+    processor._call_gemini("prompt")
+except TimeoutError:
+    print("gave up")
+"""
+    start = time.monotonic()
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+    assert "gave up" in out.stdout and time.monotonic() - start < 20
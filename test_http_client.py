@@ -0,0 +1,73 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import http_client
+from http_client import HttpClient, install_dns_cache, uninstall_dns_cache
+
+BODY = b"x" * 200_000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_port
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_body_is_capped_and_flagged(server):
+    client = HttpClient(max_bytes=150_000)
+    url = f"http://127.0.0.1:{server}/page"
+    full = client.get(url, max_bytes=500_000)
+    assert full.content == BODY and not full.truncated
+    cut = client.get(url)
+    assert len(cut.content) == 150_000 and cut.truncated
+    assert client.truncated == 1 and client.requests_by_host["127.0.0.1"] == 2
+    assert "1 response(s) truncated at 146KB" in client.report()
+
+
+def test_dns_cache_honours_ttl_and_can_be_removed(server, monkeypatch):
+    calls = []
+    real = socket.getaddrinfo
+
+    def counting(host, *args, **kwargs):
+        calls.append(host)
+        return real(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting)
+    monkeypatch.setattr(http_client, "_dns_original", None) # Whatever another test installed
+    install_dns_cache(ttl=0.2)
+    install_dns_cache(ttl=0.2) # Once per process: no cache wrapped around the cache
+    assert socket.getaddrinfo is not counting
+
+    url = f"http://localhost:{server}/page"
+    for _ in range(3):
+        HttpClient().get(url) # New pool each time: every request resolves the host
+    assert calls.count("localhost") == 1
+    time.sleep(0.25)
+    HttpClient().get(url)
+    assert calls.count("localhost") == 2 # Expired: resolved again
+
+    uninstall_dns_cache()
+    assert socket.getaddrinfo is counting
+    HttpClient().get(url)
+    assert calls.count("localhost") == 3
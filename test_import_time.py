@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+
+# Heavy SDKs / parsers that must NOT be imported just by loading the app
+HEAVY_MODULES = ["google.generativeai", "openai", "telegram", "bs4", "feedparser"]
+
+# Cold import budget for `import main` (seconds). GitHub Actions runners are slow, keep headroom.
+IMPORT_BUDGET = float(os.getenv("IMPORT_BUDGET", "1.0"))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import():
+    # Fresh interpreter so nothing is already cached in sys.modules
+    root = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_import_time():
+    result = measure_import()
+    print(f"import main: {result['elapsed']:.3f}s (budget {IMPORT_BUDGET}s)")
+    assert not result["heavy"], f"Heavy modules imported at load time: {result['heavy']}"
+    assert result["elapsed"] < IMPORT_BUDGET, f"import main took {result['elapsed']:.3f}s"
+
+
+if __name__ == "__main__":
+    test_import_time()
@@ -0,0 +1,43 @@
+from incremental import CandidatePool
+from models import NewsItem
+
+
+def _item(title: str, link: str = None, score: float = 10) -> NewsItem:
+    return NewsItem(title=title, link=link or f"https://ex.com/{abs(hash(title))}", source="s", score=score)
+
+
+def test_add_returns_only_unseen_items():
+    pool = CandidatePool()
+    first = pool.add([_item("Claude 4 출시"), _item("GPT-5 공개")], "international")
+    assert len(first) == 2
+    # Same title in another case / spacing, and a repeat: nothing new
+    assert pool.add([_item("claude 4  출시"), _item("GPT-5 공개")], "international") == []
+    assert [i.title for i in pool.pending("international")] == ["Claude 4 출시", "GPT-5 공개"]
+
+
+def test_delivered_items_are_never_pooled_again():
+    pool = CandidatePool()
+    item = _item("Claude 4 출시", "https://ex.com/claude")
+    pool.add([item], "international")
+    pool.mark_processed([item], [item])
+    assert pool.accepted("international") == [item]
+    pool.mark_delivered([item])
+    assert pool.snapshot() == []
+    assert pool.add([_item("Claude 4 출시")], "international") == [] # Same title
+    assert pool.add([_item("다른 제목", "https://ex.com/claude")], "international") == [] # Same link
+
+
+def test_pool_survives_a_restart(tmp_path):
+    path = str(tmp_path / "pool.json")
+    pool = CandidatePool(path)
+    kept, sent = _item("Claude 4 출시", score=20), _item("GPT-5 공개")
+    pool.add([kept, sent], "international")
+    pool.mark_processed([kept], [kept])
+    pool.mark_delivered([sent])
+    assert pool.needs_alert(kept) and not pool.needs_alert(kept)
+    pool.save()
+
+    restored = CandidatePool(path)
+    assert [(i.title, i.pool_state) for i in restored.accepted("international")] == [("Claude 4 출시", "accepted")]
+    assert restored.add([_item("GPT-5 공개")], "international") == []
+    assert not restored.needs_alert(kept)
@@ -0,0 +1,21 @@
+from language import KOREAN, OTHER, detect_lang, tidy_korean_title
+from models import NewsItem
+
+
+def test_detect_lang():
+    assert detect_lang("오픈AI, GPT-5 공개… 에이전트 기능 강화") == KOREAN
+    assert detect_lang("OpenAI ships GPT-5 with agent mode") == OTHER
+    # Too few letters in the title: the summary decides
+    assert detect_lang("GPT-5", "오픈AI가 새 모델을 공개했다") == KOREAN
+
+
+def test_news_item_lang_set_at_ingestion():
+    assert NewsItem(title="앤트로픽, 클로드 신모델 출시", link="https://example.com/1", source="Naver News").lang == KOREAN
+    assert NewsItem(title="Anthropic releases a new model", link="https://example.com/2", source="TechCrunch").lang == OTHER
+
+
+def test_tidy_korean_title():
+    assert tidy_korean_title("삼성전자 &quot;AI 에이전트&quot;  도입 - 전자신문", strip_outlet=True) == '삼성전자 "AI 에이전트" 도입'
+    # Without an aggregator suffix the dash is part of the headline
+    assert tidy_korean_title("AI 에이전트 시대 개막 - 기업들 대응 분주") == "AI 에이전트 시대 개막 - 기업들 대응 분주"
+    assert len(tidy_korean_title("가" * 200)) == 80
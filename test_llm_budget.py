@@ -0,0 +1,85 @@
+import pytest
+
+from config import Config
+from llm_budget import BudgetExhausted, LlmBudget
+from models import NewsItem
+from processor import ContentProcessor
+
+
+def _spend(budget: LlmBudget, calls: int, provider: str = "gemini"):
+    for _ in range(calls):
+        budget.record(budget.reserve(provider, "prompt"), usage=(100, 10))
+
+
+def test_degrades_in_order_then_refuses(tmp_path):
+    budget = LlmBudget(str(tmp_path / "spend.db"), run_calls=10, run_tokens=0, day_calls=0, day_tokens=0)
+    budget.start_run("run-1")
+    _spend(budget, 6)
+    assert budget.allows("llm_score")
+    _spend(budget, 1)
+    assert not budget.allows("llm_score") and budget.allows("llm_summary")
+    _spend(budget, 2)
+    assert not budget.allows("llm_summary") and budget.allows("llm")
+    _spend(budget, 1)
+    with pytest.raises(BudgetExhausted):
+        budget.reserve("gemini", "prompt")
+    assert budget.totals()["run_tokens"] == 10 * 110
+
+
+def test_run_shared_across_processes_and_day_across_runs(tmp_path):
+    path = str(tmp_path / "spend.db")
+    coordinator, worker = (LlmBudget(path, 0, 0, day_calls=100, day_tokens=0) for _ in range(2))
+    coordinator.start_run("run-1")
+    worker.start_run("run-1")
+    _spend(coordinator, 2)
+    _spend(worker, 3, provider="openai")
+    assert coordinator.totals()["run_calls"] == 5
+    coordinator.start_run("run-2")
+    _spend(coordinator, 1)
+    assert coordinator.totals() == {"run_calls": 1, "run_tokens": 110, "day_calls": 6, "day_tokens": 660}
+    assert "openai   3 calls" in coordinator.report("run-1")
+
+
+def test_spent_budget_means_fallback_scores_and_titles_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "GOOGLE_API_KEY", "test")
+    processor = ContentProcessor()
+    processor._budget = LlmBudget(str(tmp_path / "spend.db"), run_calls=1, run_tokens=0, day_calls=0, day_tokens=0)
+    processor._budget.start_run("run-1")
+    _spend(processor._budget, 1)
+    monkeypatch.setattr(processor, "_generate_content_robust", lambda prompt, **kw: pytest.fail("LLM called"))
+    monkeypatch.setattr("deadline.Deadline.sleep", lambda self, seconds, stage="llm_summary": True)
+
+    item = NewsItem(title="Claude agent ships to enterprises", link="x", source="s", summary="workflow automation")
+    [kept] = processor.process_news([item])
+    assert kept.agent_source == "heuristic"
+    assert kept.processed_summary.startswith(item.title) and "AI 점수" not in kept.processed_summary
+
+
+def test_concurrent_reservations_cannot_overshoot(tmp_path):
+    import threading
+
+    path = str(tmp_path / "spend.db")
+    # Two processes' budgets (coordinator + queue worker) on one run, calls racing from many threads
+    budgets = [LlmBudget(path, run_calls=5, run_tokens=0, day_calls=0, day_tokens=0) for _ in range(2)]
+    for budget in budgets:
+        budget.start_run("run-1")
+    tickets, refused = [], []
+    barrier = threading.Barrier(20)
+
+    def call(budget):
+        budget.start_run("run-1")
+        barrier.wait()
+        try:
+            tickets.append(budget.reserve("gemini", "prompt")) # Nobody has recorded yet
+        except BudgetExhausted:
+            refused.append(1)
+
+    threads = [threading.Thread(target=call, args=(budgets[k % 2],)) for k in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (len(tickets), len(refused)) == (5, 15)
+    for ticket in tickets:
+        budgets[0].record(ticket, usage=(100, 10)) # Settled: the booked estimate is replaced by the actual usage
+    assert budgets[0].totals() == {"run_calls": 5, "run_tokens": 550, "day_calls": 5, "day_tokens": 550}
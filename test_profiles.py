@@ -0,0 +1,80 @@
+from archive import NewsArchive
+from models import NewsItem
+from profiles import REJECT_SCORE, ProfileMatrix, TopicProfile, shared_naver_queries
+
+
+def _item(title, score=0, summary=""):
+    return NewsItem(title=title, link=f"https://example.com/{abs(hash(title))}", source="t", summary=summary, score=score)
+
+
+PROFILES = [
+    TopicProfile("default"),
+    TopicProfile("dev", keywords={"cursor": 10, "코딩": 5}, exclude=["채용"], naver_queries=['"AI 코딩"']),
+    TopicProfile("sales", keywords={"도입 사례": 10, "cursor": 2}, reject_patterns=[r"webinar"],
+                 naver_queries=['"AI 코딩"', '"도입 사례"']),
+]
+
+
+def test_scores_every_profile_in_one_matrix():
+    items = [
+        _item("Cursor adds agent mode", score=15),
+        _item("AI 코딩 도입 사례 공개", score=-99), # Rejected by the built-in tiers only
+        _item("Cursor webinar 채용", score=15),
+    ]
+    matrix = ProfileMatrix(PROFILES)
+    scores = matrix.score(items)
+    assert scores.shape == (3, 3)
+    assert list(scores[:, 0]) == [15, REJECT_SCORE, 15] # Built-in profile: the scraper score
+    assert list(scores[:, 1]) == [10, 5, REJECT_SCORE]
+    assert list(scores[:, 2]) == [2, 10, REJECT_SCORE]
+    ranked = matrix.ranked(items, scores)
+    assert [i.title for i in ranked["sales"]] == ["AI 코딩 도입 사례 공개", "Cursor adds agent mode"]
+    assert [i.title for i in ranked["default"]] == ["Cursor adds agent mode", "Cursor webinar 채용"]
+
+
+def test_terms_match_on_word_boundaries():
+    profiles = [TopicProfile("ai", keywords={"ai": 3, "cursor": 5, "cursor ai": 10, "도입": 1})]
+    items = [
+        _item("He said it again"), # 'ai' inside words: no hit
+        _item("Cursor AI 도입한 기업"), # Nested terms all count; Korean endings after a term are fine
+        _item("AI가 바꾼 도입부", summary="재도입"), # Short Hangul term must start a word
+    ]
+    scores = ProfileMatrix(profiles).score(items)
+    assert list(scores[:, 0]) == [0, 19, 4]
+
+
+def test_shared_naver_pass_runs_each_query_once():
+    queries, excludes = shared_naver_queries(PROFILES)
+    assert queries == ['"AI 코딩"', '"도입 사례"']
+    assert excludes == [] # No exclude term all three profiles share
+
+
+def test_delivery_history_is_per_profile():
+    archive = NewsArchive(":memory:")
+    sent, other = _item("Cursor adds agent mode"), _item("Claude Code 업데이트")
+    archive.store_run([sent, other], delivered=[sent], profile="dev")
+    assert archive.filter_undelivered([sent, other], 7, profile="dev") == [other]
+    assert archive.filter_undelivered([sent, other], 7, profile="sales") == [sent, other]
+    assert archive.filter_undelivered([sent, other], 7) == [sent, other] # Global history: the no-profiles brief only
+
+
+def test_default_profile_is_not_hidden_by_another_profile(tmp_path):
+    import json
+    from types import SimpleNamespace
+
+    from main import archive_run
+    from profiles import load_profiles
+
+    assert load_profiles(str(tmp_path / "missing.json"))[0].archive_key is None # No file: global history
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": [{"name": "default"}, {"name": "dev", "keywords": {"cursor": 10}}]}))
+    default, dev = load_profiles(str(path))
+    assert (default.archive_key, dev.archive_key) == ("default", "dev")
+
+    runtime = SimpleNamespace(archive=NewsArchive(":memory:"))
+    sent, other = _item("Cursor adds agent mode"), _item("Claude Code 업데이트")
+    archive_run(runtime, [sent, other], delivered=[], by_profile={dev.archive_key: [sent]})
+    assert runtime.archive.filter_undelivered([sent, other], 7, default.archive_key) == [sent, other]
+    assert runtime.archive.filter_undelivered([sent, other], 7, dev.archive_key) == [other]
+    archive_run(runtime, [], by_profile={default.archive_key: [other]})
+    assert runtime.archive.filter_undelivered([sent, other], 7, default.archive_key) == [sent]
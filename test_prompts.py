@@ -0,0 +1,38 @@
+from llm_budget import estimate_tokens
+from prompts import SCORING, TRANSLATION, PromptBuilder, PromptTemplate, fit_content
+
+TITLE = "OpenAI launches agents for enterprise workflows"
+FILLER = [f"Paragraph {k} is general market commentary without specifics." for k in range(60)]
+
+
+def test_template_renders_slots_and_keeps_json_braces():
+    template = PromptTemplate("t", 'Title: {title}\nContent: {content}\n{\n  "score": 8.5\n}', 100)
+    assert template.render(title="T", content="C") == 'Title: T\nContent: C\n{\n  "score": 8.5\n}'
+    for built_in in (SCORING, TRANSLATION):
+        prompt = built_in.render(title="T", content="C")
+        assert "Title: T" in prompt and "{title}" not in prompt and not prompt.startswith(" ")
+
+
+def test_short_content_is_untouched():
+    assert fit_content("  Short article.  ", 100, TITLE) == "Short article."
+
+
+def test_long_content_keeps_lead_and_keyword_sentences_within_budget():
+    key = "Early adopters report 40% time saved with the new workflow."
+    content = " ".join(FILLER[:30] + [key] + FILLER[30:])
+    fitted = fit_content(content, 120, TITLE)
+    assert estimate_tokens(fitted) <= 120
+    assert fitted.startswith(FILLER[0]) and key in fitted and "…" in fitted
+    assert FILLER[45] not in fitted
+
+
+def test_blob_without_sentence_breaks_is_truncated():
+    assert estimate_tokens(fit_content("x" * 5000, 50)) <= 51
+
+
+def test_builder_counts_prompt_tokens():
+    builder = PromptBuilder()
+    prompt = builder.build(SCORING, TITLE, " ".join(FILLER))
+    prompts, tokens, trimmed, content_in, content_kept = builder.stats["score"]
+    assert (prompts, trimmed) == (1, 1) and tokens == estimate_tokens(prompt)
+    assert content_kept <= SCORING.content_tokens < content_in
@@ -0,0 +1,48 @@
+import random
+
+from relevance_model import RelevanceModel
+
+GOOD = ["클로드 코드", "AI 에이전트", "기업 도입 사례", "Cursor", "업무 자동화", "workflow automation"]
+BAD = ["주가 급등", "채용 공고", "게임 출시", "컨퍼런스 개최", "stock rally", "hiring spree"]
+FILLER = "오늘 시장 관련 기술 서비스 발표 news today update".split()
+
+
+def _dataset(n=600, seed=7):
+    rng = random.Random(seed)
+    docs, scores = [], []
+    for _ in range(n):
+        relevant = rng.random() < 0.4
+        words = rng.sample(GOOD if relevant else BAD, 2) + rng.sample(FILLER, 4)
+        docs.append((" ".join(words[:3]), " ".join(words[3:])))
+        scores.append(rng.uniform(7, 10) if relevant else rng.uniform(0, 6.5))
+    return docs, scores
+
+
+def test_learns_and_reports_held_out_accuracy():
+    docs, scores = _dataset()
+    model = RelevanceModel(n_features=2 ** 14)
+    metrics = model.fit(docs, scores)
+    assert metrics["n_test"] > 0 and metrics["accuracy"] > 0.9
+    prob, predicted = model.predict([("클로드 코드로 업무 자동화", ""), ("게임 출시 소식", "주가 급등")])
+    assert prob[0] > 0.5 > prob[1]
+    assert predicted[0] > predicted[1]
+
+
+def test_save_load_roundtrip(tmp_path):
+    docs, scores = _dataset(200)
+    model = RelevanceModel(n_features=2 ** 12)
+    model.fit(docs, scores)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = RelevanceModel.load(path)
+    assert loaded.metrics == model.metrics
+    assert (loaded.predict(docs[:5])[0] == model.predict(docs[:5])[0]).all()
+
+
+def test_not_usable_on_a_handful_of_confident_held_out_items():
+    docs, scores = _dataset()
+    model = RelevanceModel(n_features=2 ** 14)
+    model.fit(docs, scores)
+    assert model.metrics["confident_n"] >= 30 and model.usable()
+    model.metrics.update(confident_n=2, confident_accuracy=1.0)
+    assert not model.usable()
@@ -0,0 +1,79 @@
+import asyncio
+import datetime
+import time
+
+from scheduler import AsyncScheduler, ScheduledJob
+
+
+def _at(day: datetime.date, hour: int, minute: int = 0) -> float:
+    return datetime.datetime.combine(day, datetime.time(hour, minute)).timestamp()
+
+
+TODAY = datetime.date(2026, 10, 19)
+YESTERDAY, TOMORROW = TODAY - datetime.timedelta(days=1), TODAY + datetime.timedelta(days=1)
+
+
+def test_daily_slot_is_computed_across_midnight():
+    job = ScheduledJob("digest", print, at="00:30")
+    job.schedule_next(_at(TODAY, 23, 50))
+    assert job.next_run == _at(TOMORROW, 0, 30)
+    job.schedule_next(_at(TODAY, 0, 10))
+    assert job.next_run == _at(TODAY, 0, 30)
+    job.schedule_next(_at(TODAY, 0, 30)) # Exactly on the slot: that one is taken, next is tomorrow
+    assert job.next_run == _at(TOMORROW, 0, 30)
+
+
+def test_missed_daily_slot_is_caught_up_within_the_window():
+    job = ScheduledJob("digest", print, at="08:00", catch_up=3 * 3600)
+    job.last_run = _at(YESTERDAY, 8)
+    job.schedule_first(_at(TODAY, 9, 30)) # Down over the 08:00 slot, back 1.5h later
+    assert job.next_run == _at(TODAY, 9, 30)
+    job.schedule_first(_at(TODAY, 12)) # 4h late: too stale, wait for tomorrow
+    assert job.next_run == _at(TOMORROW, 8)
+    job.last_run = _at(TODAY, 8, 1) # Today's slot already ran
+    job.schedule_first(_at(TODAY, 9, 30))
+    assert job.next_run == _at(TOMORROW, 8)
+
+
+def test_interval_job_runs_at_once_only_when_overdue():
+    job = ScheduledJob("poll", print, interval=600)
+    job.schedule_first(1000.0)
+    assert job.next_run == 1000.0 # Never ran
+    job.last_run = 900.0
+    job.schedule_first(1000.0)
+    assert job.next_run == 1500.0
+    job.schedule_first(1600.0)
+    assert job.next_run == 1600.0
+
+
+def test_jitter_only_delays():
+    job = ScheduledJob("poll", print, interval=600, jitter=30)
+    for _ in range(20):
+        job.schedule_next(1000.0)
+        assert 1600.0 <= job.next_run <= 1630.0
+
+
+def test_due_slot_is_skipped_while_the_previous_run_is_busy(tmp_path):
+    state = str(tmp_path / "scheduler.json")
+
+    async def scenario():
+        scheduler = AsyncScheduler(state_path=state)
+        job = scheduler.every(60, "poll", time.sleep, 0.2)
+        job.next_run = time.time()
+        scheduler._dispatch_due(time.time())
+        await asyncio.sleep(0.05) # The run has started in its thread
+        job.next_run = time.time()
+        scheduler._dispatch_due(time.time())
+        await scheduler._tasks["poll"]
+        return job
+
+    job = asyncio.run(scenario())
+    assert (job.runs, job.skipped_overlaps, job.running) == (1, 1, False)
+    assert job.next_run > time.time() + 50 # Next slot counted from the dispatch, not stacked up
+
+    restarted = AsyncScheduler(state_path=state)
+    again = restarted.every(60, "poll", time.sleep, 0.2)
+    restarted._load_state()
+    assert again.last_run == job.last_run
+    again.schedule_first(job.last_run + 10) # Restart right after: no immediate rerun
+    assert again.next_run == job.last_run + 60
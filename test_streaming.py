@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+from llm_budget import LlmBudget
+from processor import ContentProcessor
+from streaming import JsonFieldStream, read_stream
+
+REPLY = '```json\n{\n  "score": 8.5,\n  "reason": "새 모델\n출시",\n  "action_item": "검토",\n  "decision": "ACCEPT"\n}\n```'
+
+
+def test_fields_complete_as_the_reply_streams():
+    parser = JsonFieldStream()
+    seen = []
+    for ch in REPLY:
+        for key, value in parser.feed(ch).items():
+            seen.append((key, value, parser.buf.count("\n")))
+    assert [k for k, _, _ in seen] == ["score", "reason", "action_item", "decision"]
+    assert seen[0][1] == 8.5 # Not 8: the number only counts once the comma arrived
+    assert parser.fields["reason"] == "새 모델\n출시" and parser.closed
+
+
+def test_read_stream_stops_at_the_condition():
+    pieces = iter(['{"score": 2', '.0, "rea', 'son": "long explanation..."}'])
+    text, stopped = read_stream(pieces, stop=lambda fields: fields.get("score", 10) < 5)
+    assert stopped and text == '{"score": 2.0, "rea'
+    assert next(pieces) # The rest was never read
+
+
+class _Stream:
+    """Streamed Gemini response: iterate for chunks; feedback / usage once it is done."""
+    prompt_feedback = usage_metadata = None
+
+    def __init__(self, reply: str, streamed: list):
+        self.reply, self.streamed = reply, streamed
+        self.cancelled = False
+        self._iterator = self # The SDK keeps the transport's stream here
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __iter__(self):
+        for k in range(0, len(self.reply), 8):
+            self.streamed.append(k)
+            yield SimpleNamespace(text=self.reply[k:k + 8])
+
+
+def _processor(reply: str, streamed: list):
+    processor = ContentProcessor()
+    processor._model = SimpleNamespace(generate_content=lambda prompt, stream=False: _Stream(reply, streamed))
+    processor._budget = LlmBudget(":memory:", 0, 0, 0, 0)
+    return processor
+
+
+def test_low_score_ends_the_call_early():
+    streamed = []
+    reply = '{"score": 1.5, "reason": "' + "광고성 기사 " * 50 + '", "decision": "REJECT"}'
+    processor = _processor(reply, streamed)
+    score, reason, _, source = processor._evaluate_relevance("Title", "Content")
+    assert (score, source) == (1.5, "llm") and "조기 판정" in reason
+    assert len(streamed) < 5 and processor.early_rejects == 1
+
+
+def test_early_stop_books_estimated_usage_and_cancels_the_stream():
+    reply = '{"score": 1.5, "reason": "' + "광고성 기사 " * 50 + '", "decision": "REJECT"}'
+    processor = _processor(reply, [])
+    response = _Stream(reply, [])
+    processor._model = SimpleNamespace(generate_content=lambda prompt, stream=False: response)
+    text, usage = processor._gemini_text("prompt " * 40, stop=processor._early_reject)
+    assert len(text) < len(reply) and response.cancelled
+    assert usage[0] > 0 and usage[1] > 0 # Estimated, not "0 output tokens"
+
+
+def test_accepted_and_borderline_items_get_the_full_result():
+    for score in (8.5, 6.0):
+        streamed = []
+        reply = '{"score": %s, "reason": "업무 자동화 사례", "action_item": "팀 공유"}' % score
+        processor = _processor(reply, streamed)
+        assert processor._evaluate_relevance("Title", "Content") == (score, "업무 자동화 사례", "팀 공유", "llm")
+        assert processor.early_rejects == 0
+
+
+def test_openai_stream_runs_on_the_pinned_sdk():
+    # The real openai client (requirements.txt pin) against a stubbed HTTP transport
+    import json
+
+    import httpx
+    from openai import OpenAI
+
+    reply = '{"score": 2.0, "reason": "' + "광고성 기사 " * 30 + '"}'
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        events = "".join("data: " + json.dumps({
+            "id": "c1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": {"content": reply[k:k + 8]}, "finish_reason": None}]}) + "\n\n"
+            for k in range(0, len(reply), 8))
+        return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                              content=(events + "data: [DONE]\n\n").encode())
+
+    processor = ContentProcessor()
+    processor._openai_client = OpenAI(api_key="test", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    text, usage = processor._openai_text("prompt", stop=processor._early_reject)
+    assert text.startswith('{"score": 2.0,') and len(text) < len(reply)
+    assert requests[0]["stream"] is True and "stream_options" not in requests[0]
+    assert usage[0] > 0 and usage[1] > 0 # Estimated: this SDK reports no usage on streams
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import traffic
+from config import Config
+from http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        _Handler.hits += 1
+        body = f"<rss>{self.path} #{_Handler.hits}</rss>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mode(tmp_path, monkeypatch):
+    """Switch traffic mode for the test; the archive is reopened for each mode."""
+    def switch(name):
+        monkeypatch.setattr(Config, "TRAFFIC_MODE", name)
+        monkeypatch.setattr(Config, "TRAFFIC_PATH", str(tmp_path / "traffic.db"))
+        monkeypatch.setattr(traffic, "_archive", None)
+    yield switch
+    monkeypatch.setattr(traffic, "_archive", None)
+
+
+def test_http_exchanges_replay_in_order_without_network(mode):
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/feed"
+    mode("record")
+    client = HttpClient()
+    assert [client.get(url).text for _ in range(2)] == ["<rss>/feed #1</rss>", "<rss>/feed #2</rss>"]
+    server.shutdown()
+    server.server_close()
+
+    mode("replay")
+    client = HttpClient()
+    first = client.get(url)
+    assert first.text == "<rss>/feed #1</rss>" and first.headers["Content-Type"].startswith("application/rss")
+    with client.stream(url) as resp:
+        assert b"".join(resp.iter_content(4)) == b"<rss>/feed #2</rss>"
+    assert client.get(url).text == "<rss>/feed #2</rss>" # Past the recording: last answer again
+    with pytest.raises(requests.ConnectionError):
+        client.get(url + "?page=2")
+    assert _Handler.hits == 2
+
+
+def test_llm_replay_cuts_the_stream_at_the_same_field(mode):
+    reply = '{"score": 2.0, "reason": "' + "광고 " * 40 + '"}'
+    mode("record")
+    assert traffic.llm_call("gemini", "prompt", None, lambda: (reply, (10, 5))) == (reply, (10, 5))
+
+    mode("replay")
+    stop = lambda fields: fields.get("score", 10) < 5
+    text, _ = traffic.llm_call("gemini", "prompt", stop, lambda: pytest.fail("provider called"))
+    assert reply.startswith(text) and len(text) < len(reply) # Same early reject as the live stream
+    with pytest.raises(Exception, match="no recorded openai reply"):
+        traffic.llm_call("openai", "prompt", None, lambda: pytest.fail("provider called"))
+
+
+def test_replayed_brief_is_compared_not_sent(mode, capsys):
+    class _Bot:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def send_message(self, chat_id, text):
+            return text
+
+    async def send(bot, texts):
+        async with bot:
+            for text in texts:
+                await bot.send_message(chat_id="42", text=text)
+
+    mode("record")
+    asyncio.run(send(traffic.RecordingBot(_Bot()), ["brief part 1", "brief part 2"]))
+    mode("replay")
+    asyncio.run(send(traffic.ReplayBot(), ["brief part 1", "brief part 2 (changed)"]))
+    out = capsys.readouterr().out
+    assert "same as recorded" in out and "differs (12 -> 22 chars)" in out
+
+
+def test_query_string_keys_are_not_stored_and_replay_with_placeholders(mode):
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v2/everything"
+    mode("record")
+    recorded = HttpClient().get(url, params={"q": "AI", "apiKey": "s3cr3t-key"}).text
+    server.shutdown()
+    server.server_close()
+    with pytest.raises(requests.ConnectionError):
+        HttpClient().get("http://127.0.0.1:9/down", params={"apiKey": "s3cr3t-key"}, timeout=1)
+    rows = traffic.archive().conn.execute("SELECT key, request, error FROM exchanges").fetchall()
+    stored = " ".join(f"{key} {zlib.decompress(request).decode()} {error}" for key, request, error in rows)
+    assert len(rows) == 2 and "apiKey=***" in stored and "s3cr3t-key" not in stored
+
+    mode("replay")
+    assert HttpClient().get(url, params={"q": "AI", "apiKey": "replay"}).text == recorded
+
+
+def test_replay_restores_recorded_state_into_a_scratch_dir(tmp_path, monkeypatch):
+    from archive import NewsArchive
+    from llm_budget import LlmBudget
+    from models import NewsItem
+
+    prod = tmp_path / "state"
+    paths = {"STATE_DIR": str(prod), "ARCHIVE_PATH": str(prod / "archive.db"), "QUEUE_PATH": str(prod / "queue.db"),
+             "LLM_BUDGET_PATH": str(prod / "llm_spend.db"), "LOCAL_MODEL_PATH": str(prod / "relevance_model.npz"),
+             "PROFILES_PATH": str(tmp_path / "profiles.json"), "TRAFFIC_MODE": None, "TRAFFIC_PATH": None}
+    for name, value in paths.items():
+        monkeypatch.setattr(Config, name, value)
+        monkeypatch.setenv(name, value or "")
+    monkeypatch.setattr(traffic, "_archive", None)
+    day = 86400
+    recorded_ts = time.time()
+    old, late = (NewsItem(title=t, link=f"https://ex.com/{t}", source="s", published="") for t in ("old", "late"))
+    live = NewsArchive(Config.ARCHIVE_PATH)
+    live.store_run([old], delivered=[old], now=recorded_ts - 3 * day)
+    budget = LlmBudget(Config.LLM_BUDGET_PATH, 0, 0, 0, 0)
+    budget.start_run("recorded")
+    budget.record(budget.reserve("gemini", "prompt"), usage=(100, 10))
+    with budget.conn: # Spent on the recording day
+        budget.conn.execute("UPDATE llm_spend SET day = ?",
+                            (time.strftime("%Y-%m-%d", time.localtime(recorded_ts - 2 * day)),))
+    (prod / "feed_health.json").write_text(json.dumps({"https://ex.com/rss": {"next_poll_at": recorded_ts + 600}}))
+
+    traffic.enable("record", str(tmp_path / "traffic.db"))
+    traffic.archive().save_settings({"recorded_ts": repr(recorded_ts - 2 * day)}) # Replayed two days later
+    live.store_run([late], delivered=[late]) # After the recording started: not part of its state
+    monkeypatch.setattr(traffic, "_archive", None)
+    traffic.enable("replay", str(tmp_path / "traffic.db"))
+
+    scratch = Config.STATE_DIR
+    assert scratch != str(prod) and os.environ["STATE_DIR"] == scratch
+    assert all(os.path.dirname(getattr(Config, name)) == scratch and os.environ[name] == getattr(Config, name)
+               for name in ("ARCHIVE_PATH", "QUEUE_PATH", "LLM_BUDGET_PATH", "LOCAL_MODEL_PATH", "PROFILES_PATH"))
+    assert not os.path.exists(Config.LOCAL_MODEL_PATH) and not os.path.exists(Config.PROFILES_PATH)
+    replayed = NewsArchive(Config.ARCHIVE_PATH)
+    assert replayed.filter_undelivered([old, late], days=7) == [late] # Seen as the recorded run saw it
+    delivered_at = replayed.conn.execute("SELECT delivered_at FROM articles").fetchone()[0]
+    assert abs(delivered_at - (recorded_ts - day)) < 5 # Shifted with the clock: still 3 days before the run
+    health = json.loads(open(os.path.join(scratch, "feed_health.json")).read())
+    assert abs(health["https://ex.com/rss"]["next_poll_at"] - (recorded_ts + 600 + 2 * day)) < 5
+
+    spend = LlmBudget(Config.LLM_BUDGET_PATH, 0, 0, 0, 0)
+    spend.start_run("replayed")
+    assert spend.totals()["day_calls"] == 1 # The recorded day's spend, moved to today
+    spend.record(spend.reserve("gemini", "prompt"), usage=(100, 10))
+    replayed.store_run([late], delivered=[late])
+    assert budget.conn.execute("SELECT SUM(calls) FROM llm_spend").fetchone()[0] == 1 # Live state untouched
+    assert live.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+    for store in (live, replayed):
+        store.close()
@@ -0,0 +1,96 @@
+import time
+
+from workqueue import DONE, FAILED, PENDING, WorkQueue
+
+
+def test_idempotent_enqueue_and_reused_results(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"))
+    assert queue.enqueue("run", [("feed", "feed:a", {"url": "a"}), ("feed", "feed:b", {"url": "b"})]) == 2
+    task = queue.lease("w1")
+    assert queue.complete(task, "w1", {"items": [1]})
+    # Same run, same key: no second task, the finished result stays
+    assert queue.enqueue("run", [("feed", "feed:a", {"url": "a"})]) == 0
+    assert queue.results("run", ["feed:a"])["feed:a"] == (DONE, {"items": [1]}, "")
+
+
+def test_expired_lease_is_requeued_and_fenced(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"), lease_seconds=0.05)
+    queue.enqueue("run", [("process", "process:x", {})])
+    first = queue.lease("dead-worker")
+    time.sleep(0.1)
+    second = queue.lease("w2") # The dead worker's lease ran out
+    assert second.id == first.id and second.attempts == 2
+    assert not queue.complete(first, "dead-worker", {"late": True}) # Fenced off
+    assert queue.complete(second, "w2", {"ok": True})
+    assert queue.results("run")["process:x"][1] == {"ok": True}
+
+
+def test_retries_with_backoff_then_fails(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"), max_attempts=2, retry_backoff=0.05)
+    queue.enqueue("run", [("extract", "extract:u", {})])
+    assert queue.fail(queue.lease("w1"), "w1", "timeout") == PENDING
+    assert queue.lease("w1") is None # Backing off
+    time.sleep(0.06)
+    assert queue.fail(queue.lease("w1"), "w1", "timeout again") == FAILED
+    assert queue.wait("run", ["extract:u"], timeout=1)["extract:u"][:1] == (FAILED,)
+
+
+def test_workers_send_rule_observations_to_the_coordinator(tmp_path):
+    from domain_rules import DomainRuleStore
+    from extractor import ExtractionPool
+    from workers import RulesRecorder, replay_rules
+
+    path = str(tmp_path / "domain_rules.json")
+    page = {"status": 200, "bytes": 10, "bytes_saved": 0, "cut": 0, "hint": None, "parse_seconds": 0.01,
+            "selector": "div.article-body", "text": "본문 " * 400}
+    workers = [RulesRecorder(DomainRuleStore(path)) for _ in range(2)]
+    for k, recorder in enumerate(workers):
+        pool = ExtractionPool(workers=0, rules=recorder)
+        pool._run = lambda urls, timeout, budget, hints: {url: dict(page) for url in urls}
+        pool.fetch_many([f"https://news{k}.example/a"], timeout=5)
+    assert all(len(r.events) == 1 for r in workers) and not (tmp_path / "domain_rules.json").exists()
+
+    coordinator = DomainRuleStore(path)
+    for recorder in workers:
+        replay_rules(coordinator, recorder.events)
+    coordinator.save()
+    assert set(DomainRuleStore(path).rules) == {"news0.example", "news1.example"}
+
+
+def test_rerun_of_the_same_run_reuses_done_tasks(tmp_path):
+    path = str(tmp_path / "q.db")
+    queue = WorkQueue(path, max_attempts=1)
+    queue.open_run("run-1")
+    tasks = [("feed", f"feed:{k}", {"url": k, "deadline": [1200, 1000.0]}) for k in "abc"]
+    assert queue.enqueue("run-1", tasks) == 3
+    assert queue.complete(queue.lease("w1"), "w1", {"items": ["a"]})
+    assert queue.fail(queue.lease("w1"), "w1", "timeout") == FAILED
+    queue.lease("w1") # Leased when the coordinator died: run-1 never closed
+    queue.close()
+
+    queue = WorkQueue(path, max_attempts=1, lease_seconds=0.05)
+    assert queue.latest_open_run() == "run-1"
+    queue.open_run("run-1")
+    rerun = [(kind, key, dict(payload, deadline=[1200, 2000.0])) for kind, key, payload in tasks]
+    assert queue.enqueue("run-1", rerun) == 0 # Same idempotency keys: nothing new
+    assert queue.results("run-1", ["feed:a"])["feed:a"] == (DONE, {"items": ["a"]}, "")
+    retried = queue.lease("w2") # The failed task got a fresh attempt, with the new deadline
+    assert retried.key == "feed:b" and retried.payload["deadline"] == [1200, 2000.0]
+    queue.close_run("run-1")
+    assert queue.latest_open_run() is None
+
+
+def test_crashed_coordinator_leaves_the_run_open_for_resume(tmp_path, monkeypatch):
+    import pytest
+    from config import Config
+    from workers import run_job
+
+    class _Runtime:
+        @property
+        def profiles(self):
+            raise RuntimeError("profiles.json unreadable")
+
+    monkeypatch.setattr(Config, "QUEUE_PATH", str(tmp_path / "q.db"))
+    with pytest.raises(RuntimeError):
+        run_job(_Runtime(), workers=0, run_id="run-1")
+    assert WorkQueue(str(tmp_path / "q.db")).latest_open_run() == "run-1"
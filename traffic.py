@@ -0,0 +1,472 @@
+"""
+Record / replay of a run's outbound traffic, to reproduce a slow day or a bad brief later.
+
+    python main.py --once --record traffic/2026-10-19.db    # production run, everything written down
+    python main.py --once --replay traffic/2026-10-19.db
+    python traffic.py show traffic/2026-10-19.db [n]         # what was slow, what was big
+
+Recorded: every HTTP exchange of the shared client (feeds, Naver, articles), every LLM reply
+(per provider and prompt) and every Telegram message. Bodies are zlib-compressed in one SQLite
+file, indexed by (kind, key, seq): the nth identical request gets the nth recorded answer.
+Replay serves all of it from the file: no network, no waits (deadline sleeps are skipped).
+The state the run started from (STATE_FILES: archive dedup, spend, model, rules, ...) is snapshotted
+on record; replay restores it into a scratch STATE_DIR, shifted to the replay's clock, so the same
+candidates and prompts come up and the real state is never written.
+The mode travels in the environment, so queue workers and extraction processes join in.
+"""
+import atexit
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+RECORD, REPLAY = "record", "replay"
+HTTP, LLM, TELEGRAM = "http", "llm", "telegram"
+ERROR = -1
+# Recorded so a replay (usually without secrets) takes the same code paths; only presence is stored
+KEY_SETTINGS = ("GOOGLE_API_KEY", "OPENAI_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET", "NEWSAPI_KEY",
+                "TELEGRAM_BOT_TOKEN")
+
+# State a run reads, snapshotted on record and restored on replay: file -> Config path attribute
+# (None: a file in STATE_DIR). Everything else under STATE_DIR starts fresh in the scratch directory.
+STATE_FILES = {
+    "archive.db": "ARCHIVE_PATH", # Cross-day dedup, delivered history
+    "llm_spend.db": "LLM_BUDGET_PATH", # Today's spend: budget wind-down
+    "relevance_model.npz": "LOCAL_MODEL_PATH",
+    "profiles.json": "PROFILES_PATH",
+    "feed_health.json": None, # Which feeds are due / quarantined
+    "domain_rules.json": None,
+}
+SCRATCH_FILES = {"queue.db": "QUEUE_PATH"} # Per-run state, never restored
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    request BLOB,
+    status INTEGER NOT NULL,
+    meta TEXT,
+    body BLOB,
+    error TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    elapsed REAL NOT NULL,
+    started REAL NOT NULL,
+    pid INTEGER NOT NULL,
+    UNIQUE (kind, key, seq)
+);
+CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+-- body NULL: the file did not exist when recording started
+CREATE TABLE IF NOT EXISTS state_files (name TEXT PRIMARY KEY, body BLOB, size INTEGER NOT NULL DEFAULT 0);
+"""
+
+# Query parameters that carry credentials (NewsAPI's apiKey, ...): dropped from keys and stored URLs
+SECRET_PARAMS = {"apikey", "api_key", "key", "token", "access_token", "client_secret"}
+
+# ... and their values (plus provider key shapes) scrubbed from recorded error messages
+_SECRET_TEXT = re.compile(r"((?:%s)=)[^&\s'\")]+|\b(?:sk-|AIza)[\w-]{8,}" % "|".join(SECRET_PARAMS), re.IGNORECASE)
+
+_archive = None
+_archive_lock = threading.Lock()
+_report_registered = False
+
+
+class TrafficArchive:
+    """One SQLite file of request -> response exchanges, shared by every process of a recorded run."""
+
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self.pid = os.getpid()
+        if mode == RECORD:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        elif not os.path.exists(path):
+            raise FileNotFoundError(f"No traffic archive at {path}")
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._cursors = defaultdict(int) # (kind, key) -> next seq to replay in this process
+        self.counts = defaultdict(int) # recorded / served / missing
+
+    def record(self, kind: str, key: str, request: str, status: int, body: bytes = b"", meta: Dict = None,
+               error: str = None, elapsed: float = 0.0):
+        body = body or b""
+        error = _SECRET_TEXT.sub(lambda m: (m.group(1) or "") + "***", error) if error else error
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE") # seq must be unique across processes
+            try:
+                seq = self.conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM exchanges WHERE kind = ? AND key = ?",
+                                        (kind, key)).fetchone()[0]
+                self.conn.execute(
+                    "INSERT INTO exchanges (kind, key, seq, request, status, meta, body, error, size, elapsed, started, pid) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, key, seq, zlib.compress(request.encode("utf-8")), status,
+                     json.dumps(meta, ensure_ascii=False) if meta else None, zlib.compress(body), error,
+                     len(body), elapsed, time.time() - elapsed, os.getpid()))
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            self.counts["recorded"] += 1
+
+    def lookup(self, kind: str, key: str):
+        """Next recorded answer for this request: (status, body, meta, error). Past the last one, the last one again."""
+        with self._lock:
+            seq = self._cursors[(kind, key)]
+            self._cursors[(kind, key)] += 1
+            row = self.conn.execute("SELECT status, body, meta, error FROM exchanges WHERE kind = ? AND key = ? "
+                                    "AND seq <= ? ORDER BY seq DESC LIMIT 1", (kind, key, seq)).fetchone()
+            self.counts["served" if row else "missing"] += 1
+        if row is None:
+            return None
+        status, body, meta, error = row
+        return status, zlib.decompress(body) if body else b"", json.loads(meta) if meta else {}, error
+
+    def save_settings(self, settings: Dict[str, str]):
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)", settings.items())
+
+    def settings(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT name, value FROM settings").fetchall())
+
+    def save_state(self, name: str, data: Optional[bytes]):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO state_files (name, body, size) VALUES (?, ?, ?)",
+                              (name, None if data is None else zlib.compress(data), len(data or b"")))
+
+    def state(self) -> Dict[str, Optional[bytes]]:
+        with self._lock:
+            rows = self.conn.execute("SELECT name, body FROM state_files").fetchall()
+        return {name: None if body is None else zlib.decompress(body) for name, body in rows}
+
+
+def enable(mode: str, path: str):
+    """Turn recording / replay on for this process and (through the environment) every child process."""
+    os.environ["TRAFFIC_MODE"], os.environ["TRAFFIC_PATH"] = mode, path
+    Config.TRAFFIC_MODE, Config.TRAFFIC_PATH = mode, path
+    if mode == RECORD:
+        settings = {name: "1" for name in KEY_SETTINGS if getattr(Config, name)}
+        settings.update({"recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), "recorded_ts": repr(time.time()),
+                         "argv": " ".join(sys.argv), "chat_ids": ",".join(Config.telegram_chat_ids())})
+        archive().save_settings(settings)
+        for name in STATE_FILES:
+            archive().save_state(name, _read_state(_state_path(name)))
+    else:
+        # Same code paths as the recorded run: placeholder keys (never sent anywhere) and its chats
+        settings = archive().settings()
+        for name in KEY_SETTINGS:
+            if settings.get(name) and not getattr(Config, name):
+                setattr(Config, name, "replay")
+        if settings.get("chat_ids"):
+            Config.TELEGRAM_CHAT_ID, Config.TELEGRAM_CHAT_IDS = None, settings["chat_ids"]
+        scratch = restore_state(archive().state(), float(settings.get("recorded_ts") or time.time()))
+        print(f"[Traffic] Replaying run recorded {settings.get('recorded_at', '?')} ({settings.get('argv', '')}), "
+              f"state in {scratch}")
+
+
+def _state_path(name: str) -> str:
+    attr = STATE_FILES[name]
+    return getattr(Config, attr) if attr else os.path.join(Config.STATE_DIR, name)
+
+
+def _read_state(path: str) -> Optional[bytes]:
+    """File contents; SQLite databases through the backup API (consistent even mid-write, WAL included)."""
+    if not os.path.exists(path):
+        return None
+    if not path.endswith(".db"):
+        with open(path, "rb") as f:
+            return f.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "copy.db")
+        src, dst = sqlite3.connect(path, timeout=30), sqlite3.connect(copy)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+        with open(copy, "rb") as f:
+            return f.read()
+
+
+def restore_state(state: Dict[str, Optional[bytes]], recorded_ts: float) -> str:
+    """
+    Point this process (and, through the environment, its children) at a scratch STATE_DIR holding the
+    recorded state, removed at exit. Timestamps move forward by the time since recording, so the dedup
+    window, today's spend and feed schedules line up as they did for the recorded run.
+    """
+    scratch = tempfile.mkdtemp(prefix="replay-state-")
+    atexit.register(shutil.rmtree, scratch, True)
+    Config.STATE_DIR = os.environ["STATE_DIR"] = scratch
+    for name, attr in {**STATE_FILES, **SCRATCH_FILES}.items():
+        if attr:
+            setattr(Config, attr, os.path.join(scratch, name))
+            os.environ[attr] = getattr(Config, attr)
+    for name, data in state.items():
+        if data is not None and name in STATE_FILES:
+            with open(_state_path(name), "wb") as f:
+                f.write(data)
+            _shift_state(name, _state_path(name), recorded_ts)
+    return scratch
+
+
+def _shift_state(name: str, path: str, recorded_ts: float):
+    import datetime
+    offset = time.time() - recorded_ts
+    days = (datetime.date.today() - datetime.date.fromtimestamp(recorded_ts)).days
+    if name == "archive.db":
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("UPDATE articles SET first_seen = first_seen + ?1, last_seen = last_seen + ?1, "
+                         "delivered_at = delivered_at + ?1", (offset,))
+            conn.execute("UPDATE deliveries SET delivered_at = delivered_at + ?", (offset,))
+        conn.close()
+    elif name == "llm_spend.db" and days:
+        conn = sqlite3.connect(path)
+        with conn:
+            # Two steps: (day, run_id, provider) stays unique while the days move
+            conn.execute("UPDATE llm_spend SET day = '~' || date(day, ?)", (f"{days:+d} days",))
+            conn.execute("UPDATE llm_spend SET day = substr(day, 2)")
+        conn.close()
+    elif name in ("feed_health.json", "domain_rules.json"):
+        fields = ("last_success", "quarantined_until", "next_poll_at", "learned_at", "confirmed_at")
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        for record in records.values():
+            for field in fields:
+                if record.get(field):
+                    record[field] += offset
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+
+def archive() -> Optional[TrafficArchive]:
+    """This process's archive (None when neither recording nor replaying)."""
+    global _archive, _report_registered
+    if Config.TRAFFIC_MODE and (_archive is None or _archive.pid != os.getpid()):
+        with _archive_lock: # Forked children open their own connection
+            if _archive is None or _archive.pid != os.getpid():
+                _archive = TrafficArchive(Config.TRAFFIC_PATH, Config.TRAFFIC_MODE)
+                if not _report_registered:
+                    atexit.register(_report) # Once per process, whatever archive is open at exit
+                    _report_registered = True
+    return _archive
+
+
+def _report():
+    a = _archive
+    if a and a.counts and a.pid == os.getpid():
+        print(f"[Traffic] {a.mode} ({a.pid}): " + ", ".join(f"{v} {k}" for k, v in sorted(a.counts.items())))
+
+
+# --- HTTP (requests transport adapters, mounted by http_client.HttpClient) ---
+
+def redact(url: str) -> str:
+    """URL without credential query parameters: never written to disk, and replay (placeholder keys) still matches."""
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _http_key(request) -> str:
+    return f"{request.method} {redact(request.url)}" # Headers (Naver keys) are never stored either
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Real requests; each response body is read (up to HTTP_MAX_BYTES, decoded) and written down."""
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        start = time.monotonic()
+        key = _http_key(request)
+        try:
+            resp = super().send(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            chunks, size = [], 0
+            for chunk in resp.iter_content(64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= Config.HTTP_MAX_BYTES:
+                    break
+        except Exception as e:
+            archive().record(HTTP, key, redact(request.url), ERROR, error=f"{type(e).__name__}: {e}",
+                             elapsed=time.monotonic() - start)
+            raise
+        resp._content = b"".join(chunks)
+        resp._content_consumed = True
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in ("content-encoding", "set-cookie")}
+        archive().record(HTTP, key, redact(request.url), resp.status_code, resp._content, {"headers": headers},
+                         elapsed=time.monotonic() - start)
+        return resp
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answers from the archive; anything not recorded fails like an unreachable host."""
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import datetime
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        key = _http_key(request)
+        found = archive().lookup(HTTP, key)
+        if found is None:
+            raise requests.ConnectionError(f"[Replay] not recorded: {key}", request=request)
+        status, body, meta, error = found
+        if status == ERROR:
+            cls = requests.Timeout if "Timeout" in (error or "") else requests.ConnectionError
+            raise cls(f"[Replay] {error}", request=request)
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url, resp.request, resp.connection, resp.reason = request.url, request, self, "Replayed"
+        resp.elapsed = datetime.timedelta(0)
+        resp._content, resp._content_consumed = body, True
+        resp.raw = io.BytesIO(body)
+        resp.raw.seek(0, io.SEEK_END) # Counts as fully read (HttpClient tallies bytes with raw.tell())
+        return resp
+
+
+def http_adapter(**kwargs) -> HTTPAdapter:
+    return (RecordingAdapter if Config.TRAFFIC_MODE == RECORD else ReplayAdapter)(**kwargs)
+
+
+# --- LLM replies ---
+
+def llm_call(provider: str, prompt: str, stop, call):
+    """
+    call() -> (text, usage), recorded; or the recorded reply for this provider + prompt.
+    A replayed reply is streamed through `stop` again, so early rejects cut at the same field.
+    """
+    from streaming import read_stream
+
+    key = f"{provider}:{hashlib.sha1(prompt.encode('utf-8')).hexdigest()}"
+    if Config.TRAFFIC_MODE == REPLAY:
+        found = archive().lookup(LLM, key)
+        if found is None:
+            raise Exception(f"[Replay] no recorded {provider} reply for this prompt")
+        status, body, meta, error = found
+        if status == ERROR:
+            raise Exception(error)
+        text = body.decode("utf-8")
+        if stop is not None:
+            text, _ = read_stream((text[k:k + 16] for k in range(0, len(text), 16)), stop)
+        usage = meta.get("usage")
+        return text, tuple(usage) if usage else None
+    start = time.monotonic()
+    try:
+        text, usage = call()
+    except Exception as e:
+        archive().record(LLM, key, prompt, ERROR, error=str(e), elapsed=time.monotonic() - start)
+        raise
+    archive().record(LLM, key, prompt, 0, text.encode("utf-8"), {"usage": usage}, elapsed=time.monotonic() - start)
+    return text, usage
+
+
+# --- Telegram ---
+
+class RecordingBot:
+    """The real bot; every send_message is written down (with its outcome)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def __aenter__(self):
+        await self.bot.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self.bot.__aexit__(*exc)
+
+    async def send_message(self, chat_id, text: str, **kwargs):
+        start = time.monotonic()
+        try:
+            result = await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except Exception as e:
+            archive().record(TELEGRAM, str(chat_id), text, ERROR, error=f"{type(e).__name__}: {e}",
+                             elapsed=time.monotonic() - start)
+            raise
+        archive().record(TELEGRAM, str(chat_id), text, 0, elapsed=time.monotonic() - start)
+        return result
+
+
+class ReplayBot:
+    """Sends nothing: compares each message with what the recorded run sent to that chat."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send_message(self, chat_id, text: str, **kwargs):
+        self.sent.append((str(chat_id), text))
+        before = recorded_message(str(chat_id), len([c for c, _ in self.sent if c == str(chat_id)]) - 1)
+        verdict = "not in recording" if before is None else ("same as recorded" if before == text else
+                                                               f"differs ({len(before)} -> {len(text)} chars)")
+        print(f"[Replay] message to {chat_id} ({len(text)} chars): {verdict}")
+
+
+def recorded_message(chat_id: str, seq: int) -> Optional[str]:
+    a = archive()
+    with a._lock:
+        row = a.conn.execute("SELECT request FROM exchanges WHERE kind = ? AND key = ? AND seq = ?",
+                             (TELEGRAM, chat_id, seq)).fetchone()
+    return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+
+# --- Inspection ---
+
+def show(path: str, top: int = 15) -> str:
+    conn = sqlite3.connect(path)
+    lines = [f"Traffic archive {path} ({os.path.getsize(path) / 1024:.0f} KB on disk)"]
+    for name, value in conn.execute("SELECT name, value FROM settings WHERE name IN ('recorded_at', 'argv')"):
+        lines.append(f"  {name}: {value}")
+    try:
+        state = conn.execute("SELECT name, size FROM state_files WHERE body IS NOT NULL ORDER BY name").fetchall()
+    except sqlite3.OperationalError: # Recorded before state snapshots
+        state = []
+    if state:
+        lines.append("  state: " + ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in state))
+    lines.append(f"{'kind':9} {'n':>5} {'errors':>6} {'KB':>9} {'total s':>8} {'max s':>7}")
+    for kind, n, errors, size, total, slowest in conn.execute(
+            "SELECT kind, COUNT(*), SUM(status = -1), SUM(size), SUM(elapsed), MAX(elapsed) FROM exchanges "
+            "GROUP BY kind ORDER BY kind"):
+        lines.append(f"{kind:9} {n:>5} {errors:>6} {size / 1024:>9.1f} {total:>8.1f} {slowest:>7.2f}")
+    lines.append(f"Slowest {top}:")
+    for kind, key, status, elapsed, size, error in conn.execute(
+            "SELECT kind, key, status, elapsed, size, error FROM exchanges ORDER BY elapsed DESC LIMIT ?", (top,)):
+        outcome = error[:60] if status == ERROR else f"{status}, {size / 1024:.1f} KB"
+        lines.append(f"  {elapsed:7.2f}s {kind:8} {key[:80]} ({outcome})")
+    conn.close()
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "show":
+        print(show(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 15))
+    else:
+        print("Usage: python traffic.py show ARCHIVE [n]")
+        sys.exit(1)
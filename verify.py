@@ -11,14 +11,14 @@ def test_fetch():
     items = rss.fetch_news()
     print(f"Fetched {len(items)} items from OpenAI.")
     if items:
-        print(f"Sample: {items[0]['title']}")
+        print(f"Sample: {items[0].title}")
 
     print("\nTesting HN Fetch...")
     hn = HackerNewsScraper()
     items = hn.fetch_news()
     print(f"Fetched {len(items)} items from HN.")
     if items:
-        print(f"Sample: {items[0]['title']}")
+        print(f"Sample: {items[0].title}")
 
     return items[:1] if items else []
 
@@ -30,7 +30,7 @@ def test_process(item):
         return item
     
     processed = processor.process_news([item])
-    print(f"Processed summary: {processed[0].get('processed_summary')}")
+    print(f"Processed summary: {processed[0].processed_summary}")
     return processed[0]
 
 async def test_notify(item):
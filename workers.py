@@ -0,0 +1,440 @@
+"""
+Queue mode: the daily job split into tasks that any number of worker processes consume.
+
+    python main.py --once --workers 4          # coordinator + 4 local worker processes
+    python main.py --once --workers 4 --resume # rerun the newest unfinished run (or --run-id ID), reusing done tasks
+    python workers.py worker [kinds]           # extra worker (e.g. on another host, same QUEUE_PATH)
+    python workers.py status [run_id]          # task states per run
+    python workers.py bench [tasks] [1,2,4]    # throughput vs worker count on synthetic fixtures
+"""
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from config import Config
+from workqueue import DONE, Task, WorkQueue
+import deadline
+
+# Lower runs first: extraction unblocks feed tasks that wait on it, LLM calls before new fetches
+PRIORITY = {"extract": 0, "process": 1, "bench": 1, "naver": 2, "feed": 2}
+IDLE_POLL = 0.1
+
+# Article counters a feed task reports back (added to the coordinator's extractor report)
+EXTRACT_COUNTERS = ("pages", "bytes", "bytes_saved", "cut", "cut_unsized", "seconds")
+
+
+def open_queue(path: str = None) -> WorkQueue:
+    return WorkQueue(path or Config.QUEUE_PATH, lease_seconds=Config.QUEUE_LEASE_SECONDS,
+                     max_attempts=Config.QUEUE_MAX_ATTEMPTS)
+
+
+class HealthRecorder:
+    """FeedHealthTracker stand-in inside a worker: the coordinator owns the real tracker and replays these."""
+
+    def __init__(self):
+        self.events = []
+        self._links = {}
+
+    def should_poll(self, url: str):
+        return True, "" # The coordinator already decided
+
+    def new_entry_count(self, url: str, links: List[str]) -> int:
+        self._links[url] = links
+        return 0
+
+    def record_success(self, url: str, latency: float, new_items: int):
+        self.events.append(["success", url, latency, self._links.get(url, [])])
+
+    def record_failure(self, url: str, latency: float, error: str, bozo: bool = False):
+        self.events.append(["failure", url, latency, str(error), bozo])
+
+
+def replay_health(tracker, events):
+    for event in events:
+        if event[0] == "success":
+            _, url, latency, links = event
+            tracker.record_success(url, latency, tracker.new_entry_count(url, links))
+        else:
+            _, url, latency, error, bozo = event
+            tracker.record_failure(url, latency, error, bozo=bozo)
+
+
+class RulesRecorder:
+    """DomainRuleStore stand-in inside a worker: hints from the store loaded at startup, observations
+    sent back in the task result. Only the coordinator records and saves (one writer for domain_rules.json)."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.events = []
+
+    def begin_run(self):
+        pass
+
+    def hint(self, host: str):
+        return self.rules.hint(host) if self.rules else None
+
+    def record(self, host: str, hint, selector: str, good: bool):
+        self.events.append([host, hint, selector, good])
+
+    def save(self):
+        pass
+
+
+def replay_rules(rules, events):
+    if not rules or not events:
+        return
+    for host, hint, selector, good in events:
+        rules.record(host, hint, selector, good)
+
+
+def _make_queue_extractor(worker: "Worker", task: Task):
+    from extractor import ExtractionPool
+
+    class QueueExtractor(ExtractionPool):
+        """ExtractionPool whose pages are queue tasks: any worker may take them, this one helps while waiting."""
+
+        def _run(self, urls, timeout, budget, hints):
+            keys = {f"extract:{url}": url for url in urls}
+            worker.queue.enqueue(task.run_id, [("extract", key, {"url": url, "timeout": timeout, "hint": hints.get(url)})
+                                               for key, url in keys.items()], priority=PRIORITY["extract"])
+            results = worker.queue.wait(task.run_id, list(keys), timeout=budget,
+                                        helper=lambda: worker.run_one(["extract"], task.run_id))
+            return {keys[key]: result for key, (state, result, _) in results.items() if state == DONE}
+
+    return QueueExtractor(workers=0, rules=RulesRecorder(worker.runtime.extractor.rules))
+
+
+# --- Task handlers: (worker, task) -> JSON-able result. Raising = retry. ---
+
+def handle_feed(worker: "Worker", task: Task) -> Dict:
+    from scrapers.rss_scraper import RSSScraper
+    p = task.payload
+    health = HealthRecorder()
+    extractor = _make_queue_extractor(worker, task)
+    scraper = RSSScraper([p["url"]], category=p["category"], session=worker.runtime.session,
+                         content_cache=worker.runtime.content_cache, health=health, extractor=extractor,
+                         keep_rejected=p.get("keep_rejected", False))
+    items = scraper.fetch_news()
+    return {"items": [i.to_dict() for i in items], "health": health.events, "rules": extractor.rules.events,
+            "extract": {name: getattr(extractor, name) for name in EXTRACT_COUNTERS}}
+
+
+def handle_naver(worker: "Worker", task: Task) -> Dict:
+    p = task.payload
+    if p.get("queries"):
+        from scrapers.api_scraper import NaverNewsScraper
+        scraper = NaverNewsScraper(session=worker.runtime.session, keep_rejected=True)
+        items = scraper.fetch_queries(p["queries"], p.get("excludes", []))
+    else:
+        from scrapers.simple_naver import SimpleNaverScraper
+        scraper = SimpleNaverScraper(keep_rejected=p.get("keep_rejected", False))
+        items = scraper.fetch_news()
+    return {"items": [i.to_dict() for i in items], "error": scraper.last_error}
+
+
+def handle_extract(worker: "Worker", task: Task) -> Dict:
+    from extractor import fetch_and_extract
+    p = task.payload
+    return fetch_and_extract(p["url"], p["timeout"], p.get("hint"))
+
+
+def handle_process(worker: "Worker", task: Task) -> Dict:
+    from models import NewsItem
+    item = NewsItem.from_dict(task.payload["item"])
+    worker.runtime.processor.budget.start_run(task.run_id) # Shared with the run's other processes
+    kept = worker.runtime.processor.process_news([item], safety_net=False)
+    return {"agent_score": item.agent_score, "agent_reason": item.agent_reason, "agent_action": item.agent_action,
+            "agent_source": item.agent_source, "processed_summary": item.processed_summary, "survived": bool(kept)}
+
+
+def _bench_page(paragraphs: int) -> bytes:
+    body = "".join(f"<p>{'AI 에이전트 도입 사례와 업무 자동화 성과. ' * 6}{k}</p>" for k in range(paragraphs))
+    nav = "".join(f"<li><a href='/s/{k}'>섹션 {k}</a></li>" for k in range(200))
+    return (f"<html><head><meta charset='utf-8'><title>bench</title></head><body><ul>{nav}</ul>"
+            f"<div class='article-body'>{body}</div><footer>ⓒ bench</footer></body></html>").encode("utf-8")
+
+
+def handle_bench(worker: "Worker", task: Task) -> Dict:
+    """Fixture task: a network wait plus a real parse of a synthetic article page."""
+    from extractor import extract_html
+    time.sleep(task.payload["io"])
+    text, selector = extract_html(_bench_page(task.payload["paragraphs"]), "utf-8")
+    return {"chars": len(text), "selector": selector}
+
+
+HANDLERS = {"feed": handle_feed, "naver": handle_naver, "extract": handle_extract,
+            "process": handle_process, "bench": handle_bench}
+
+
+class _Heartbeat:
+    """Keeps a task's lease alive while its handler runs (long LLM calls, feed tasks waiting on pages)."""
+
+    def __init__(self, queue: WorkQueue, task: Task, worker: str):
+        self.queue, self.task, self.worker = queue, task, worker
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(self.queue.lease_seconds / 3):
+            if not self.queue.extend(self.task, self.worker):
+                print(f"[Worker {self.worker}] Lost the lease on {self.task.key}")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+
+
+class Worker:
+    """Leases tasks and runs them with a warm Runtime (HTTP pool, LLM clients, caches) of its own."""
+
+    def __init__(self, queue: WorkQueue, name: str = None, kinds: List[str] = None, run_id: str = None, runtime=None):
+        self.queue = queue
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = kinds
+        self.run_id = run_id
+        self._runtime = runtime
+        self.done = 0
+        self.failed = 0
+
+    @property
+    def runtime(self):
+        if self._runtime is None:
+            from runtime import Runtime
+            self._runtime = Runtime()
+        return self._runtime
+
+    def run_one(self, kinds: List[str] = None, run_id: str = None) -> bool:
+        """Lease and run one task. False = nothing ready."""
+        task = self.queue.lease(self.name, kinds or self.kinds, run_id or self.run_id)
+        if task is None:
+            return False
+        if task.payload.get("deadline"):
+            # Join the coordinator's job budget so stages wind down at the same time everywhere
+            seconds, started_at = task.payload["deadline"]
+            deadline.start(seconds, elapsed=time.time() - started_at)
+        try:
+            with _Heartbeat(self.queue, task, self.name):
+                result = HANDLERS[task.kind](self, task)
+        except Exception as e:
+            self.failed += 1
+            state = self.queue.fail(task, self.name, f"{type(e).__name__}: {e}")
+            print(f"[Worker {self.name}] {task.key} failed (attempt {task.attempts}): {e} -> {state}")
+            return True
+        self.queue.complete(task, self.name, result)
+        self.done += 1
+        return True
+
+    def run(self, idle_exit: float = None):
+        """Work until the bound run is closed (or `idle_exit` seconds without a task); forever otherwise."""
+        idle_since = time.monotonic()
+        while True:
+            if self.run_one():
+                idle_since = time.monotonic()
+                continue
+            if self.run_id and self.queue.is_closed(self.run_id):
+                break
+            if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                break
+            time.sleep(IDLE_POLL)
+
+
+def run_worker(queue_path: str, run_id: str = None, kinds: List[str] = None, idle_exit: float = None):
+    """Process entry point (local worker processes and `python workers.py worker`)."""
+    queue = open_queue(queue_path)
+    worker = Worker(queue, kinds=kinds, run_id=run_id)
+    try:
+        worker.run(idle_exit)
+    finally:
+        queue.close()
+    print(f"[Worker {worker.name}] Done: {worker.done} task(s), {worker.failed} failure(s)")
+
+
+def start_workers(count: int, queue_path: str, run_id: str) -> List:
+    # spawn: safe next to threads, and the same start method on every platform
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=run_worker, args=(queue_path, run_id), daemon=True) for _ in range(count)]
+    for proc in procs:
+        proc.start()
+    return procs
+
+
+def stop_workers(procs: List, timeout: float = 10):
+    end = time.monotonic() + timeout
+    for proc in procs:
+        proc.join(max(0.1, end - time.monotonic()))
+        if proc.is_alive():
+            proc.terminate()
+
+
+def _items(result) -> List:
+    from models import NewsItem
+    return [NewsItem.from_dict(d) for d in (result or {}).get("items", [])]
+
+
+def run_job(runtime, workers: int, run_id: str = None):
+    """
+    Coordinator: enqueue fetch tasks, then one agent task per candidate, and assemble + send the briefs.
+    Selection, delivery and archiving are the same code as the in-process job (main.py). The coordinator
+    works on tasks itself while it waits, so it also completes on its own (workers=0).
+    """
+    from main import (INTL_FEEDS, DOMESTIC_FEEDS, dedup_by_title, select_candidates, agent_batches,
+                      deliver_briefs, finish_run)
+    from profiles import shared_naver_queries
+
+    queue = open_queue()
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    queue.open_run(run_id)
+    me = Worker(queue, name=f"{socket.gethostname()}:{os.getpid()}:coordinator", run_id=run_id, runtime=runtime)
+    procs = start_workers(workers, queue.path, run_id)
+    dl = deadline.current()
+    budget = [dl.seconds, dl.started_at]
+    print(f"[Queue] Run {run_id}: {workers} local worker process(es) + coordinator, queue {queue.path}")
+    try:
+        profiles = runtime.profiles
+        custom = any(p.keywords is not None for p in profiles)
+
+        # 1. Fetch tasks: one per feed (quarantine / slow-feed decisions stay here), one per Naver pass
+        feeds = []
+        for category, urls in (('international', INTL_FEEDS), ('domestic', DOMESTIC_FEEDS)):
+            for url in urls:
+                should_poll, reason = runtime.feed_health.should_poll(url)
+                if should_poll:
+                    feeds.append((category, url))
+                else:
+                    print(f"Feed: {url} - Skipped ({reason})")
+        tasks = [("feed", f"feed:{url}", {"url": url, "category": category, "keep_rejected": custom, "deadline": budget})
+                 for category, url in feeds]
+        tasks.append(("naver", "naver:simple", {"keep_rejected": custom, "deadline": budget}))
+        queries, excludes = shared_naver_queries(profiles)
+        if queries:
+            tasks.append(("naver", "naver:profiles", {"queries": queries, "excludes": excludes, "deadline": budget}))
+        queue.enqueue(run_id, tasks, priority=PRIORITY["feed"])
+        keys = [key for _, key, _ in tasks]
+        results = queue.wait(run_id, keys, timeout=dl.budget("llm_score"), helper=me.run_one)
+
+        intl_items, dom_rss_items, dom_api_items = [], [], []
+        for (category, url), key in zip(feeds, keys):
+            state, result, error = results.get(key, ("missing", None, ""))
+            if state != DONE:
+                print(f"Feed: {url} - {state} {error}")
+                continue
+            replay_health(runtime.feed_health, result["health"])
+            replay_rules(runtime.extractor.rules, result.get("rules"))
+            for name in EXTRACT_COUNTERS:
+                setattr(runtime.extractor, name, getattr(runtime.extractor, name) + result["extract"][name])
+            (intl_items if category == 'international' else dom_rss_items).extend(_items(result))
+        if runtime.extractor.rules:
+            runtime.extractor.rules.save() # Once, with every worker's observations
+        for key in keys[len(feeds):]:
+            state, result, error = results.get(key, ("missing", None, ""))
+            if state == DONE and result.get("error"):
+                runtime.naver_last_error = result["error"]
+            elif state != DONE:
+                runtime.naver_last_error = f"{state} {error}"
+            dom_api_items.extend(_items(result))
+        print(f"  - Intl Items: {len(intl_items)}, RSS Items: {len(dom_rss_items)}, Naver Items: {len(dom_api_items)}")
+        unique_dom = dedup_by_title(dom_rss_items + dom_api_items)
+        candidates = select_candidates(runtime, profiles, intl_items, unique_dom)
+
+        # 2. Agent tasks: one per unique candidate (idempotent per run: a rerun reuses finished scores)
+        batches = agent_batches(profiles, candidates)
+        by_key = {}
+        for batch in batches.values():
+            for item in batch:
+                data = item.to_dict()
+                data.pop("full_text", None) # The agent reads the summary
+                by_key[f"process:{item.link or item.title}"] = (item, data)
+        queue.enqueue(run_id, [("process", key, {"item": data, "deadline": budget}) for key, (_, data) in by_key.items()],
+                      priority=PRIORITY["process"])
+        print(f"Agent evaluating {len(by_key)} item(s) on the queue...")
+        results = queue.wait(run_id, list(by_key), timeout=dl.budget("notify"), helper=me.run_one)
+
+        survived = set()
+        for key, (item, _) in by_key.items():
+            state, result, error = results.get(key, ("missing", None, ""))
+            if state != DONE:
+                print(f"  [Queue] {item.title[:30]}... not scored ({state} {error})")
+                continue
+            for name in ("agent_score", "agent_reason", "agent_action", "agent_source", "processed_summary"):
+                setattr(item, name, result[name])
+            if result["survived"]:
+                survived.add(id(item))
+        survivors = {category: {id(i) for i in batch if id(i) in survived} for category, batch in batches.items()}
+
+        # 3. Briefs + archive, exactly as in the in-process job
+        delivered, by_profile = deliver_briefs(runtime, profiles, candidates, survivors,
+                                               len(dom_api_items), len(unique_dom))
+        print(report(queue, run_id))
+        finish_run(runtime, intl_items + unique_dom, delivered, by_profile)
+        queue.close_run(run_id) # Only a finished run is closed: a crashed one stays open for --resume
+    finally:
+        stop_workers(procs)
+        queue.prune()
+        queue.close()
+
+
+def report(queue: WorkQueue, run_id: str) -> str:
+    counts = queue.counts(run_id)
+    lines = [f"=== Work Queue ({run_id}) ===",
+             "  " + ", ".join(f"{state} {n}" for state, n in sorted(counts.items()))]
+    for worker, kind, n, attempts in queue.worker_stats(run_id):
+        lines.append(f"  {worker:<40} {kind:<8} {n:>4} task(s)" + (f" ({attempts - n} retries)" if attempts > n else ""))
+    return "\n".join(lines)
+
+
+def bench(tasks: int = 200, worker_counts=(1, 2, 4), io: float = 0.05, paragraphs: int = 60):
+    """Tasks/sec with 1..N worker processes on the fixture tasks (queue overhead included)."""
+    import tempfile
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in worker_counts:
+            path = os.path.join(tmp, f"bench-{count}.db")
+            queue = open_queue(path)
+            run_id = f"bench-{count}"
+            queue.open_run(run_id)
+            procs = start_workers(count, path, run_id)
+            time.sleep(2) # Let the workers finish importing before the clock starts
+            start = time.perf_counter()
+            queue.enqueue(run_id, [("bench", f"bench:{k}", {"io": io, "paragraphs": paragraphs}) for k in range(tasks)],
+                          priority=PRIORITY["bench"])
+            results = queue.wait(run_id, [f"bench:{k}" for k in range(tasks)], poll=0.05)
+            elapsed = time.perf_counter() - start
+            queue.close_run(run_id)
+            stop_workers(procs)
+            queue.close()
+            done = sum(1 for state, _, _ in results.values() if state == DONE)
+            rate = done / elapsed
+            base = base or rate / count
+            print(f"{count:>2} worker(s): {rate:>7.1f} tasks/s  ({done}/{tasks} done in {elapsed:.2f}s, "
+                  f"{rate / (base * count):.0%} of linear)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    command = args[0] if args else ""
+    if command == "worker":
+        kinds = args[1].split(",") if len(args) > 1 else None
+        print(f"Worker on {Config.QUEUE_PATH} ({','.join(kinds) if kinds else 'all kinds'})")
+        run_worker(Config.QUEUE_PATH, kinds=kinds)
+    elif command == "status":
+        queue = open_queue()
+        if len(args) > 1:
+            print(report(queue, args[1]))
+        else:
+            for run_id, closed in queue.runs():
+                print(f"{run_id} {'closed' if closed else 'open'}: {queue.counts(run_id)}")
+    elif command == "bench":
+        n = int(args[1]) if len(args) > 1 else 200
+        counts = [int(c) for c in args[2].split(",")] if len(args) > 2 else [1, 2, 4]
+        bench(n, counts)
+    else:
+        print(__doc__)
+        sys.exit(1)
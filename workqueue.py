@@ -0,0 +1,246 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    finished REAL,
+    UNIQUE (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks(state, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(lease_until) WHERE state = 'leased';
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    closed REAL
+);
+"""
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+@dataclass
+class Task:
+    id: int
+    run_id: str
+    kind: str
+    key: str
+    payload: Dict
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable task queue in one SQLite file, shared by the coordinator and any number of worker processes.
+    - idempotency: one task per (run, key); enqueueing it again is a no-op, and a finished result is reused
+    - leases: a leased task that isn't completed or extended in time goes back to the queue (worker died)
+    - retries: failures come back after an exponential backoff, up to max_attempts, then 'failed'
+    - fencing: only the current lease holder can complete / fail a task
+    Workers on other hosts need the file on a shared volume with working POSIX locks.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 120, max_attempts: int = 3, retry_backoff: float = 2.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Autocommit mode: every write below runs in an explicit BEGIN IMMEDIATE (one writer at a time)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, fn):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self.conn)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+
+    # --- Coordinator side ---
+
+    def open_run(self, run_id: str):
+        """Start a run, or reopen an existing one (resume): its failed tasks get a fresh set of attempts."""
+        now = time.time()
+
+        def upsert(conn):
+            conn.execute("INSERT INTO runs (run_id, created) VALUES (?, ?) ON CONFLICT(run_id) DO UPDATE SET closed = NULL",
+                         (run_id, now))
+            conn.execute("UPDATE tasks SET state = ?, attempts = 0, available_at = ?, error = NULL, finished = NULL "
+                         "WHERE run_id = ? AND state = ?", (PENDING, now, run_id, FAILED))
+        self._write(upsert)
+
+    def close_run(self, run_id: str):
+        """Workers bound to this run exit once they find no more work for it."""
+        self._write(lambda c: c.execute("UPDATE runs SET closed = ? WHERE run_id = ?", (time.time(), run_id)))
+
+    def is_closed(self, run_id: str) -> bool:
+        with self._lock:
+            row = self.conn.execute("SELECT closed FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return bool(row and row[0])
+
+    def enqueue(self, run_id: str, tasks: Iterable[Tuple[str, str, Dict]], priority: int = 0,
+                max_attempts: int = None) -> int:
+        """
+        Add (kind, key, payload) tasks in one transaction. Returns how many were new.
+        A key already in the run keeps its state and result; if unfinished it takes the new payload
+        (a resumed run's tasks join the new deadline).
+        """
+        now = time.time()
+        rows = [(run_id, kind, key, json.dumps(payload, ensure_ascii=False), priority,
+                 max_attempts or self.max_attempts, now, now) for kind, key, payload in tasks]
+
+        def insert(conn):
+            count = "SELECT COUNT(*) FROM tasks WHERE run_id = ?"
+            before = conn.execute(count, (run_id,)).fetchone()[0]
+            conn.executemany("INSERT INTO tasks (run_id, kind, key, payload, priority, max_attempts, available_at, created) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(run_id, key) DO UPDATE SET "
+                             f"payload = excluded.payload WHERE tasks.state != '{DONE}'", rows)
+            return conn.execute(count, (run_id,)).fetchone()[0] - before
+        return self._write(insert)
+
+    def results(self, run_id: str, keys: List[str] = None) -> Dict[str, Tuple[str, Optional[Dict], str]]:
+        """key -> (state, result, error) for the run's tasks (or just `keys`)."""
+        with self._lock:
+            rows = self.conn.execute("SELECT key, state, result, error FROM tasks WHERE run_id = ?", (run_id,)).fetchall()
+        wanted = set(keys) if keys is not None else None
+        return {key: (state, json.loads(result) if result else None, error or "")
+                for key, state, result, error in rows if wanted is None or key in wanted}
+
+    def counts(self, run_id: str = None) -> Dict[str, int]:
+        where, args = ("WHERE run_id = ?", (run_id,)) if run_id else ("", ())
+        with self._lock:
+            return dict(self.conn.execute(f"SELECT state, COUNT(*) FROM tasks {where} GROUP BY state", args).fetchall())
+
+    def worker_stats(self, run_id: str) -> List[Tuple[str, str, int, int]]:
+        """(worker, kind, tasks done, attempts spent) for a run."""
+        with self._lock:
+            return self.conn.execute("SELECT worker, kind, COUNT(*), SUM(attempts) FROM tasks WHERE run_id = ? AND state = ? "
+                                     "GROUP BY worker, kind ORDER BY worker, kind", (run_id, DONE)).fetchall()
+
+    def latest_open_run(self) -> Optional[str]:
+        """Newest run that was never closed (its coordinator died mid-run), if any."""
+        with self._lock:
+            row = self.conn.execute("SELECT run_id FROM runs WHERE closed IS NULL ORDER BY created DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def runs(self, limit: int = 10) -> List[Tuple[str, bool]]:
+        """(run_id, closed) newest first."""
+        with self._lock:
+            rows = self.conn.execute("SELECT run_id, closed FROM runs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        return [(run_id, bool(closed)) for run_id, closed in rows]
+
+    def wait(self, run_id: str, keys: List[str], timeout: float = None, poll: float = 0.2,
+             helper=None) -> Dict[str, Tuple[str, Optional[Dict], str]]:
+        """
+        Block until every key is done or failed (or timeout). `helper()` is called between polls
+        (e.g. to work on tasks itself instead of idling); it returns True if it did something.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Poll states only; result payloads (feed items, page texts) are read once at the end
+            with self._lock:
+                states = dict(self.conn.execute("SELECT key, state FROM tasks WHERE run_id = ?", (run_id,)).fetchall())
+            if all(states.get(k) in (DONE, FAILED) for k in keys):
+                break
+            if end is not None and time.monotonic() >= end:
+                break
+            if not (helper and helper()):
+                time.sleep(poll)
+        return self.results(run_id, keys)
+
+    def prune(self, days: float = 3) -> int:
+        cutoff = time.time() - days * 24 * 3600
+
+        def delete(conn):
+            conn.execute("DELETE FROM runs WHERE created < ?", (cutoff,))
+            return conn.execute("DELETE FROM tasks WHERE created < ?", (cutoff,)).rowcount
+        return self._write(delete)
+
+    # --- Worker side ---
+
+    def lease(self, worker: str, kinds: List[str] = None, run_id: str = None) -> Optional[Task]:
+        """Claim the next ready task (lowest priority value first). None when there is nothing to do."""
+        now = time.time()
+        filters, args = ["state = ?", "available_at <= ?"], [PENDING, now]
+        if kinds:
+            filters.append(f"kind IN ({','.join('?' * len(kinds))})")
+            args.extend(kinds)
+        if run_id:
+            filters.append("run_id = ?")
+            args.append(run_id)
+
+        def claim(conn):
+            # Expired leases first: their worker is gone (or too slow), the attempt counts
+            conn.execute(f"UPDATE tasks SET state = CASE WHEN attempts >= max_attempts THEN '{FAILED}' ELSE '{PENDING}' END, "
+                         "error = 'lease expired (' || COALESCE(worker, '?') || ')', available_at = ? "
+                         "WHERE state = ? AND lease_until < ?", (now, LEASED, now))
+            row = conn.execute(f"SELECT id, run_id, kind, key, payload, attempts FROM tasks WHERE {' AND '.join(filters)} "
+                               "ORDER BY priority, id LIMIT 1", args).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE tasks SET state = ?, attempts = attempts + 1, lease_until = ?, worker = ? WHERE id = ?",
+                         (LEASED, now + self.lease_seconds, worker, row[0]))
+            return Task(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5] + 1)
+        return self._write(claim)
+
+    def extend(self, task: Task, worker: str) -> bool:
+        """Heartbeat: push the lease out again. False = the lease was lost to another worker."""
+        cur = self._write(lambda c: c.execute(
+            "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND state = ?",
+            (time.time() + self.lease_seconds, task.id, worker, LEASED)))
+        return cur.rowcount == 1
+
+    def complete(self, task: Task, worker: str, result) -> bool:
+        """Store the result. Ignored (False) if another worker holds the task now."""
+        cur = self._write(lambda c: c.execute(
+            "UPDATE tasks SET state = ?, result = ?, error = NULL, finished = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND state != ?",
+            (DONE, json.dumps(result, ensure_ascii=False), time.time(), task.id, worker, DONE)))
+        return cur.rowcount == 1
+
+    def fail(self, task: Task, worker: str, error: str) -> str:
+        """Retry later (exponential backoff) or give up after max_attempts. Returns the new state."""
+        now = time.time()
+
+        def update(conn):
+            row = conn.execute("SELECT attempts, max_attempts FROM tasks WHERE id = ? AND worker = ? AND state = ?",
+                               (task.id, worker, LEASED)).fetchone()
+            if row is None:
+                return None # Lease lost meanwhile: the new holder decides
+            state = FAILED if row[0] >= row[1] else PENDING
+            conn.execute("UPDATE tasks SET state = ?, error = ?, available_at = ?, lease_until = NULL, "
+                         "finished = CASE WHEN ? = 'failed' THEN ? ELSE NULL END WHERE id = ?",
+                         (state, str(error)[:500], now + self.retry_backoff * 2 ** (row[0] - 1), state, now, task.id))
+            return state
+        return self._write(update)